@@ -15,6 +15,14 @@ from utils.resume_downloader import resume_downloader
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def justification_field(candidate, key, default=None):
+    """Field of a candidate's evaluation justification; it is rendered the first time a candidate is displayed"""
+    justification = candidate.get('justification')
+    if justification is None:
+        return default
+    return justification.get(key, default)
+
 # Custom CSS for minimalistic design
 st.markdown("""
 <style>
@@ -343,58 +351,35 @@ with col2:
                             elif "10+" in experience_level:
                                 min_exp, max_exp = 10, 999
                         
-                        # Run the actual candidate shortlisting
-                        result = shortlist_tool._run(
+                        # Run the actual candidate shortlisting (single search + dedup + scoring pass)
+                        shortlist_result = shortlist_tool.shortlist(
                             job_requirements=generated_query,
                             min_experience=min_exp,
                             max_experience=max_exp,
                             n_candidates=num_candidates
                         )
                         
-                        # Parse the result to extract candidate information
-                        if "No candidates found" in result:
+                        # Deduplicated, experience-filtered pool reused by the evaluation below
+                        # (kept at the same size the evaluation always used)
+                        filtered_results = shortlist_result.experience_filtered[:num_candidates * 3]
+                        
+                        if not shortlist_result.candidates:
                             st.session_state.candidates = []
                             st.session_state.search_performed = False
                             st.warning("No candidates found matching your criteria.")
                         else:
-                            # Use the already filtered and processed results from shortlist tool
-                            # Get the filtered results that respect experience requirements
-                            from services.vector_db import get_vector_db
-                            vector_db = get_vector_db()
-                            
-                            # Get raw results and apply the same filtering logic as the shortlist tool
-                            raw_results = vector_db.search_candidates(generated_query, num_candidates * 3)
-                            
-                            # Apply experience filtering (same logic as shortlist tool)
-                            filtered_results = []
-                            for candidate in raw_results:
-                                metadata = candidate.get('metadata', {})
-                                candidate_experience = metadata.get('experience_years', 0)
-                                
-                                # Apply the same experience filter as the shortlist tool
-                                if min_exp <= candidate_experience <= max_exp:
-                                    filtered_results.append(candidate)
-                            
-                            # Process and deduplicate the filtered results
-                            unique_results = shortlist_tool._deduplicate_candidates(filtered_results)
+                            # Ranked, deduplicated candidates straight from the shortlist tool
+                            unique_results = shortlist_result.candidates
                             
                             # Convert to display format
+                            from services.vector_db import get_vector_db
+                            space = get_vector_db().distance_space()
                             candidates_list = []
                             for i, candidate in enumerate(unique_results[:num_candidates]):
                                 metadata = candidate.get('metadata', {})
                                 
-                                # Calculate match score based on distance (improved calculation)
-                                distance = candidate.get('distance', 1.0)
-                                # ChromaDB uses cosine distance, normalize it better
-                                if distance <= 1.0:
-                                    match_score = max(0, min(100, int((1 - distance) * 100)))
-                                else:
-                                    # For distances > 1, use exponential decay
-                                    match_score = max(0, min(100, int(100 * (2 - distance))))
-                                
-                                # Ensure minimum score for actual matches
-                                if distance < 1.5:  # Reasonable similarity threshold
-                                    match_score = max(match_score, 10)  # Minimum 10% for reasonable matches
+                                # Match score from the distance in the collection's own space
+                                match_score = int(shortlist_tool._match_score(candidate.get('distance'), space) * 100)
                                 
                                 candidate_info = {
                                     "name": metadata.get('candidate_name', 'Unknown'),
@@ -418,7 +403,11 @@ with col2:
                         if st.session_state.candidates and filtered_results:
                             with st.spinner("🔍 Performing advanced candidate evaluation with 60% accuracy threshold..."):
                                 try:
-                                    from tools.candidate_evaluation import candidate_evaluation_tool
+                                    from services.candidate_evaluator import candidate_evaluator
+                                    from services.vector_db import get_vector_db
+                                    
+                                    # Shortlist search skips resume texts; the evaluation reads them (one batched fetch)
+                                    get_vector_db().attach_documents(filtered_results)
                                     
                                     # Create comprehensive job description for evaluation
                                     comprehensive_job_desc = f"""
@@ -437,11 +426,38 @@ Job Requirements:
 {generated_query}
                                     """.strip()
                                     
-                                    # Get evaluation results using the new evaluation tool
-                                    evaluation_summary = candidate_evaluation_tool.get_evaluation_summary(
-                                        candidates=filtered_results,  # Use original candidate objects
-                                        job_description=comprehensive_job_desc
-                                    )
+                                    # Stream evaluation results: each candidate is shown as soon as it is scored
+                                    # (large pools are sharded across processes with a live counter)
+                                    evaluation_progress = st.progress(0.0, text="Evaluating candidates...")
+                                    live_results = st.empty()
+                                    criteria = candidate_evaluator.extract_evaluation_criteria(comprehensive_job_desc)
+                                    streamed_results = []
+                                    total_to_evaluate = len(filtered_results)
+                                    
+                                    for eval_result in candidate_evaluator.iter_evaluate(
+                                        filtered_results,  # Use original candidate objects
+                                        comprehensive_job_desc,
+                                        workers=os.cpu_count() or 1,
+                                        chunk_size=10,
+                                        criteria=criteria
+                                    ):
+                                        streamed_results.append(eval_result)
+                                        done = len(streamed_results)
+                                        evaluation_progress.progress(done / total_to_evaluate,
+                                                                     text=f"Evaluated {done}/{total_to_evaluate} candidates")
+                                        if done <= 10 or done % 25 == 0 or done == total_to_evaluate:
+                                            best_so_far = sorted(streamed_results, key=lambda r: r['score'].overall_score,
+                                                                 reverse=True)[:5]
+                                            live_results.markdown("**Top candidates so far:**\n\n" + "\n".join(
+                                                f"{'⭐' if r['score'].is_selected else '•'} "
+                                                f"{r['candidate'].get('metadata', {}).get('candidate_name', 'Unknown')}"
+                                                f" — {r['score'].overall_score:.1%}"
+                                                for r in best_so_far
+                                            ))
+                                    
+                                    evaluation_summary = candidate_evaluator.summarize_evaluations(streamed_results, criteria)
+                                    evaluation_progress.empty()
+                                    live_results.empty()
                                     
                                     if 'error' not in evaluation_summary:
                                         # Store evaluation results in session state
@@ -473,7 +489,7 @@ Job Requirements:
                                                 "match_score": f"{score.overall_score:.1%}",
                                                 "evaluation_status": "SELECTED ⭐",
                                                 "evaluation_score": score.overall_score,
-                                                "selection_reasons": justification.get('selection_reasons', []),
+                                                "justification": justification,  # rendered when displayed
                                                 "unique_id": metadata.get('unique_id', f'selected_{len(evaluated_candidates_list)}'),
                                                 "pdf_file_path": metadata.get('pdf_file_path', ''),
                                                 "pdf_filename": metadata.get('pdf_filename', ''),
@@ -481,8 +497,7 @@ Job Requirements:
                                                 "experience_score": f"{score.experience_mapping:.1%}",
                                                 "semantic_score": f"{score.semantic_similarity:.1%}",
                                                 "cert_score": f"{score.certification_score:.1%}",
-                                                "role_fit_score": f"{score.role_fit_score:.1%}",
-                                                "recommendation": justification.get('recommendation', '')
+                                                "role_fit_score": f"{score.role_fit_score:.1%}"
                                             }
                                             evaluated_candidates_list.append(candidate_info)
                                         
@@ -504,7 +519,7 @@ Job Requirements:
                                                 "match_score": f"{score.overall_score:.1%}",
                                                 "evaluation_status": "REJECTED",
                                                 "evaluation_score": score.overall_score,
-                                                "rejection_reasons": justification.get('rejection_reasons', []),
+                                                "justification": justification,  # rendered when displayed
                                                 "unique_id": metadata.get('unique_id', f'rejected_{len(evaluated_candidates_list)}'),
                                                 "pdf_file_path": metadata.get('pdf_file_path', ''),
                                                 "pdf_filename": metadata.get('pdf_filename', ''),
@@ -512,8 +527,7 @@ Job Requirements:
                                                 "experience_score": f"{score.experience_mapping:.1%}",
                                                 "semantic_score": f"{score.semantic_similarity:.1%}",
                                                 "cert_score": f"{score.certification_score:.1%}",
-                                                "role_fit_score": f"{score.role_fit_score:.1%}",
-                                                "recommendation": justification.get('recommendation', '')
+                                                "role_fit_score": f"{score.role_fit_score:.1%}"
                                             }
                                             evaluated_candidates_list.append(candidate_info)
                                         
@@ -716,12 +730,11 @@ if st.session_state.search_performed and st.session_state.candidates:
             except:
                 score_display = candidate.get('match_score', 'N/A')
             
-            # Get primary reason
+            # Get primary reason (renders the justification of each displayed row, never the whole pool)
             primary_reason = "N/A"
-            if candidate.get('selection_reasons'):
-                primary_reason = candidate['selection_reasons'][0][:100] + "..." if len(candidate['selection_reasons'][0]) > 100 else candidate['selection_reasons'][0]
-            elif candidate.get('rejection_reasons'):
-                primary_reason = candidate['rejection_reasons'][0][:100] + "..." if len(candidate['rejection_reasons'][0]) > 100 else candidate['rejection_reasons'][0]
+            reasons = justification_field(candidate, 'selection_reasons') or justification_field(candidate, 'rejection_reasons')
+            if reasons:
+                primary_reason = reasons[0][:100] + "..." if len(reasons[0]) > 100 else reasons[0]
             
             # Check if resume is available
             file_path = resume_downloader.get_resume_file_path(candidate)
@@ -857,14 +870,15 @@ if st.session_state.search_performed and st.session_state.candidates:
                                 st.markdown("• Detailed scores: Available in evaluation data")
                         
                         # Selection reasons
-                        if candidate.get('selection_reasons'):
+                        selection_reasons = justification_field(candidate, 'selection_reasons', [])
+                        if selection_reasons:
                             st.markdown("**🎯 Selection Reasons:**")
-                            for reason in candidate['selection_reasons'][:3]:  # Show top 3 reasons
+                            for reason in selection_reasons[:3]:  # Show top 3 reasons
                                 st.markdown(f"• {reason}")
                             
-                            if len(candidate['selection_reasons']) > 3:
+                            if len(selection_reasons) > 3:
                                 with st.expander("View All Reasons"):
-                                    for reason in candidate['selection_reasons'][3:]:
+                                    for reason in selection_reasons[3:]:
                                         st.markdown(f"• {reason}")
                     
                     with col3:
@@ -938,19 +952,21 @@ if st.session_state.search_performed and st.session_state.candidates:
                                     st.markdown("• Detailed scores: Available in evaluation data")
                             
                             # Rejection reasons
-                            if candidate.get('rejection_reasons'):
+                            rejection_reasons = justification_field(candidate, 'rejection_reasons', [])
+                            if rejection_reasons:
                                 st.markdown("**❌ Rejection Reasons:**")
-                                for reason in candidate['rejection_reasons'][:3]:  # Show top 3 reasons
+                                for reason in rejection_reasons[:3]:  # Show top 3 reasons
                                     st.markdown(f"• {reason}")
                                 
-                                if len(candidate['rejection_reasons']) > 3:
+                                if len(rejection_reasons) > 3:
                                     with st.expander("View All Reasons"):
-                                        for reason in candidate['rejection_reasons'][3:]:
+                                        for reason in rejection_reasons[3:]:
                                             st.markdown(f"• {reason}")
                             
                             # Show recommendation
-                            if candidate.get('recommendation'):
-                                st.markdown(f"**💡 Assessment:** {candidate['recommendation']}")
+                            recommendation = justification_field(candidate, 'recommendation')
+                            if recommendation:
+                                st.markdown(f"**💡 Assessment:** {recommendation}")
                         
                         with col3:
                             # Download button
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+HNSW Recall vs Latency Benchmark
+Builds throwaway ChromaDB collections for a grid of HNSW settings and reports
+recall@k against exact (brute-force) search, query latency and build time,
+so M / construction_ef / search_ef can be tuned for a large resume index
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import itertools
+from typing import Dict, List, Optional
+
+import numpy as np
+import chromadb
+from chromadb.config import Settings
+from chromadb.api.shared_system_client import SharedSystemClient
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.hnsw_config import HNSWConfig
+
+
+def synthetic_embeddings(n: int, dim: int, clusters: int = 200, seed: int = 7) -> np.ndarray:
+    """Unit vectors drawn around cluster centres (resume embeddings cluster by role/skill set)"""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim)).astype(np.float32)
+    assignment = rng.integers(0, clusters, size=n)
+    vectors = centres[assignment] + 0.6 * rng.normal(size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def stored_embeddings(persist_directory: str, limit: Optional[int]) -> np.ndarray:
+    """Embeddings of the real candidates collection"""
+    from services.vector_db import HybridVectorDB
+    collection = HybridVectorDB(persist_directory=persist_directory).collections["candidates"]
+    page = collection.get(include=['embeddings'], limit=limit)
+    return np.asarray(page['embeddings'], dtype=np.float32)
+
+
+def exact_neighbours(data: np.ndarray, queries: np.ndarray, k: int, space: str) -> np.ndarray:
+    """Ground-truth top-k ids by brute force, in the same space the index uses"""
+    if space == 'l2':
+        scores = -(np.sum(queries ** 2, axis=1, keepdims=True) - 2 * queries @ data.T
+                   + np.sum(data ** 2, axis=1)[None, :])
+    elif space == 'cosine':
+        normalized = data / np.linalg.norm(data, axis=1, keepdims=True)
+        scores = (queries / np.linalg.norm(queries, axis=1, keepdims=True)) @ normalized.T
+    else:
+        scores = queries @ data.T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return top
+
+
+def benchmark(data: np.ndarray, queries: np.ndarray, k: int, space: str, m_values: List[int],
+              ef_construction_values: List[int], ef_search_values: List[int],
+              batch_size: int = 5000) -> List[Dict]:
+    """Recall@k and latency for every (M, construction_ef, search_ef) combination"""
+    truth = exact_neighbours(data, queries, k, space)
+    ids = [str(i) for i in range(len(data))]
+    rows = []
+
+    work_dir = tempfile.mkdtemp(prefix="hnsw_bench_")
+    try:
+        client = chromadb.PersistentClient(path=work_dir, settings=Settings(anonymized_telemetry=False))
+        for m, ef_construction in itertools.product(m_values, ef_construction_values):
+            config = HNSWConfig(space=space, max_neighbors=m, ef_construction=ef_construction,
+                                ef_search=max(ef_search_values))
+            name = f"bench_m{m}_efc{ef_construction}"
+            collection = client.create_collection(name=name, configuration=config.to_chroma(),
+                                                  embedding_function=None)
+
+            build_start = time.perf_counter()
+            for start in range(0, len(data), batch_size):
+                collection.add(ids=ids[start:start + batch_size], embeddings=data[start:start + batch_size])
+            build_seconds = time.perf_counter() - build_start
+
+            for ef_search in ef_search_values:
+                # search_ef is read when the index is loaded, so reopen the client after changing it
+                collection.modify(configuration={'hnsw': {'ef_search': ef_search}})
+                SharedSystemClient.clear_system_cache()
+                client = chromadb.PersistentClient(path=work_dir, settings=Settings(anonymized_telemetry=False))
+                collection = client.get_collection(name, embedding_function=None)
+                collection.query(query_embeddings=[queries[0]], n_results=k, include=[])  # load the index
+
+                latencies = []
+                hits = 0
+                for query, expected in zip(queries, truth):
+                    query_start = time.perf_counter()
+                    result = collection.query(query_embeddings=[query], n_results=k, include=[])
+                    latencies.append((time.perf_counter() - query_start) * 1000)
+                    hits += len(set(int(i) for i in result['ids'][0]) & set(expected.tolist()))
+                rows.append({
+                    'M': m,
+                    'construction_ef': ef_construction,
+                    'search_ef': ef_search,
+                    'recall': hits / (len(queries) * k),
+                    'p50_ms': float(np.percentile(latencies, 50)),
+                    'p95_ms': float(np.percentile(latencies, 95)),
+                    'build_s': build_seconds
+                })
+                print(f"M={m:<3} construction_ef={ef_construction:<4} search_ef={ef_search:<4} "
+                      f"recall@{k}={rows[-1]['recall']:.3f}  p50={rows[-1]['p50_ms']:.2f}ms  "
+                      f"p95={rows[-1]['p95_ms']:.2f}ms  build={build_seconds:.1f}s")
+            client.delete_collection(name)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return rows
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(',') if part.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HNSW recall vs latency")
+    parser.add_argument('--size', type=int, default=100_000, help='Synthetic index size')
+    parser.add_argument('--dim', type=int, default=384, help='Embedding dimension (all-MiniLM-L6-v2: 384)')
+    parser.add_argument('--from-db', metavar='PERSIST_DIR',
+                        help='Use embeddings stored in this vector database instead of synthetic data')
+    parser.add_argument('--queries', type=int, default=200, help='Number of queries')
+    parser.add_argument('--k', type=int, default=10, help='Neighbours per query (recall@k)')
+    parser.add_argument('--space', choices=['cosine', 'l2', 'ip'], default='cosine')
+    parser.add_argument('--m', type=_int_list, default=[16, 32], help='Comma-separated M values')
+    parser.add_argument('--ef-construction', type=_int_list, default=[100, 200])
+    parser.add_argument('--ef-search', type=_int_list, default=[10, 50, 100, 200])
+    args = parser.parse_args()
+
+    if args.from_db:
+        data = stored_embeddings(args.from_db, args.size)
+    else:
+        data = synthetic_embeddings(args.size, args.dim)
+
+    # Queries are perturbed index vectors, like a search close to existing resumes
+    rng = np.random.default_rng(11)
+    picked = data[rng.integers(0, len(data), size=args.queries)]
+    queries = picked + 0.3 * rng.normal(size=picked.shape).astype(np.float32)
+
+    print(f"📐 {len(data)} vectors x {data.shape[1]} dims, {args.queries} queries, space={args.space}")
+    rows = benchmark(data, queries, args.k, args.space, args.m, args.ef_construction, args.ef_search)
+
+    # Cheapest settings reaching 95% / 99% recall
+    for target in (0.95, 0.99):
+        eligible = [row for row in rows if row['recall'] >= target]
+        if eligible:
+            best = min(eligible, key=lambda row: row['p50_ms'])
+            print(f"🎯 recall>={target:.0%}: M={best['M']} construction_ef={best['construction_ef']} "
+                  f"search_ef={best['search_ef']} (p50 {best['p50_ms']:.2f}ms)")
+        else:
+            print(f"🎯 recall>={target:.0%}: not reached - try larger M / search_ef")
+
+
+if __name__ == "__main__":
+    main()
@@ -75,7 +75,8 @@ def search_jobs(args):
 def search_candidates(args):
     """Search for candidates matching requirements"""
     vector_db = get_vector_db()
-    results = vector_db.search_candidates(args.requirements, args.limit)
+    results = vector_db.search_candidates(args.requirements, args.limit, mode=args.mode, include_documents=False)
+    vector_db.attach_documents([r for r in results if 'snippet' not in r.get('metadata', {})])
     
     print(f"🔍 Candidate search results for '{args.requirements}':")
     print("=" * 50)
@@ -89,7 +90,7 @@ def search_candidates(args):
         candidate_name = metadata.get('candidate_name', 'Unknown')
         
         print(f"{i}. **{candidate_name}**")
-        print(f"   {result['content'][:200]}...")
+        print(f"   {metadata.get('snippet', result.get('content', ''))[:200]}...")
         print(f"   Match Score: {1 - result.get('distance', 1):.2f}")
         print()
 
@@ -104,6 +105,80 @@ def init_sample_data(args):
     initialize_sample_data()
     print("✅ Sample data initialized")
 
+def sync_resumes(args):
+    """Incrementally sync candidates with a resumes folder"""
+    vector_db = get_vector_db()
+    result = vector_db.sync_sample_data(args.directory, workers=args.workers,
+                                        batch_size=args.batch_size, dry_run=args.dry_run)
+    if result is None:
+        print(f"❌ Directory not found: {args.directory}")
+        return
+    
+    plan, stats = result
+    summary = plan.summary()
+    print(f"🔄 Sync {'plan' if args.dry_run else 'result'} for {args.directory}:")
+    print(f"   ➕ New: {summary['new']}")
+    print(f"   ✏️  Modified: {summary['modified']}")
+    print(f"   🗑️  Deleted: {summary['deleted']}")
+    print(f"   ⏸️  Unchanged: {summary['unchanged']}")
+    if args.dry_run:
+        print("ℹ️  Dry run - no changes written")
+    else:
+        print(f"✅ Sync completed: {stats.upserted} upserted, {stats.failed} failed in {stats.elapsed_seconds:.1f}s")
+
+def duplicate_clusters(args):
+    """Show near-duplicate resume clusters assigned at ingest time"""
+    vector_db = get_vector_db()
+    report = vector_db.duplicate_cluster_report()
+    
+    print("🧬 Duplicate cluster report:")
+    print(f"   👥 Candidates: {report['total_candidates']}")
+    print(f"   🗂️  Clusters: {report['total_clusters']} ({report['singleton_clusters']} singletons)")
+    print(f"   🔁 Duplicate clusters: {report['duplicate_clusters']} covering {report['duplicate_candidates']} extra resumes")
+    print(f"   📏 Largest cluster: {report['largest_cluster_size']}")
+    if report['unclustered_candidates']:
+        print(f"   ⚠️  Unclustered (legacy) candidates: {report['unclustered_candidates']} - run sync or rebuild to cluster them")
+    
+    for cluster in report['clusters'][:args.limit]:
+        print(f"\n{cluster['cluster_id']} ({cluster['size']} resumes)")
+        for member in cluster['members']:
+            print(f"   - {member['candidate_name']} | {member['pdf_filename']} | {member['email'] or 'no email'}")
+
+def migrate_index(args):
+    """Rebuild a collection under new HNSW settings"""
+    from dataclasses import replace
+    
+    vector_db = get_vector_db()
+    configured = vector_db.hnsw_configs[args.collection]
+    overrides = {
+        'space': args.space,
+        'max_neighbors': args.m,
+        'ef_construction': args.ef_construction,
+        'ef_search': args.ef_search
+    }
+    target = replace(configured, **{key: value for key, value in overrides.items() if value is not None})
+    current = vector_db.index_settings[args.collection]
+    
+    print(f"🧭 Index settings for '{args.collection}':")
+    print(f"   Current: space={current.space}, M={current.max_neighbors}, "
+          f"construction_ef={current.ef_construction}, search_ef={current.ef_search}")
+    print(f"   Target:  space={target.space}, M={target.max_neighbors}, "
+          f"construction_ef={target.ef_construction}, search_ef={target.ef_search}")
+    
+    if target == current:
+        print("✅ Collection already uses these settings - nothing to migrate")
+        return
+    if args.dry_run:
+        print("ℹ️  Dry run - no changes written")
+        return
+    
+    result = vector_db.migrate_collection(args.collection, target, batch_size=args.batch_size)
+    if not target.immutable_differences(current):
+        print("✅ search_ef updated in place (no rebuild needed); restart running apps to pick it up")
+    else:
+        print(f"✅ Migrated {result['entries']} entries in {result['elapsed_seconds']:.1f}s")
+    print("ℹ️  Set the matching HR_HNSW_* variables so the app keeps these settings")
+
 def main():
     parser = argparse.ArgumentParser(description="Manage HR Vector Database")
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
@@ -142,6 +217,8 @@ def main():
     search_candidates_parser = subparsers.add_parser('search-candidates', help='Search candidates')
     search_candidates_parser.add_argument('requirements', help='Job requirements')
     search_candidates_parser.add_argument('--limit', type=int, default=10, help='Number of results')
+    search_candidates_parser.add_argument('--mode', choices=['vector', 'hybrid'], default='vector',
+                                          help='Dense only, or dense fused with BM25 keyword search')
     search_candidates_parser.set_defaults(func=search_candidates)
     
     # Bulk import
@@ -155,6 +232,31 @@ def main():
     init_parser = subparsers.add_parser('init-sample', help='Initialize with sample data')
     init_parser.set_defaults(func=init_sample_data)
     
+    # Incremental sync
+    sync_parser = subparsers.add_parser('sync', help='Sync candidates with a resumes folder (only new/changed/deleted files)')
+    sync_parser.add_argument('--directory', default='sample_resumes', help='Resumes directory')
+    sync_parser.add_argument('--dry-run', action='store_true', help='Only show what would change')
+    sync_parser.add_argument('--workers', type=int, default=None, help='PDF extraction worker processes')
+    sync_parser.add_argument('--batch-size', type=int, default=200, help='Candidates per upsert batch')
+    sync_parser.set_defaults(func=sync_resumes)
+    
+    # Duplicate cluster report
+    clusters_parser = subparsers.add_parser('dup-clusters', help='Report near-duplicate resume clusters')
+    clusters_parser.add_argument('--limit', type=int, default=20, help='Number of duplicate clusters to list')
+    clusters_parser.set_defaults(func=duplicate_clusters)
+    
+    # HNSW index migration
+    migrate_parser = subparsers.add_parser('migrate-index', help='Rebuild a collection with new HNSW settings (no re-embedding)')
+    migrate_parser.add_argument('--collection', default='candidates',
+                                choices=['candidates', 'job_descriptions', 'interview_questions'])
+    migrate_parser.add_argument('--space', choices=['cosine', 'l2', 'ip'], help='Distance space')
+    migrate_parser.add_argument('--m', type=int, help='HNSW M (max neighbors per node)')
+    migrate_parser.add_argument('--ef-construction', type=int, help='HNSW construction ef')
+    migrate_parser.add_argument('--ef-search', type=int, help='HNSW search ef')
+    migrate_parser.add_argument('--batch-size', type=int, default=500, help='Entries copied per batch')
+    migrate_parser.add_argument('--dry-run', action='store_true', help='Only show current and target settings')
+    migrate_parser.set_defaults(func=migrate_index)
+    
     args = parser.parse_args()
     
     if not args.command:
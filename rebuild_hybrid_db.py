@@ -11,12 +11,16 @@ import os
 import sys
 import shutil
 import logging
+import argparse
 from pathlib import Path
 
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from services.vector_db import get_vector_db
+from services.ingestion_pipeline import DEFAULT_CHECKPOINT_PATH, DEFAULT_BATCH_SIZE
+from services.extraction_cache import get_extraction_cache
+from services.result_cache import CollectionVersion, collection_version_path_for
 from utils.pdf_resolver import smart_pdf_resolver
 
 # Configure logging
@@ -37,6 +41,8 @@ def clear_existing_database():
         if os.path.exists(db_path):
             logger.info(f"🗑️  Clearing existing database: {db_path}")
             shutil.rmtree(db_path)
+            # Running apps must not serve cached shortlists from the deleted data
+            CollectionVersion(collection_version_path_for(db_path)).bump()
         else:
             logger.info(f"📁 Database path does not exist: {db_path}")
 
@@ -67,13 +73,18 @@ def analyze_pdf_files():
     
     return True
 
-def rebuild_database():
+def rebuild_database(fresh: bool = False, workers: int = None, batch_size: int = DEFAULT_BATCH_SIZE):
     """Rebuild the vector database with hybrid system"""
     logger.info("🚀 Starting hybrid vector database rebuild...")
     
     try:
-        # Step 1: Clear existing database
-        clear_existing_database()
+        # Step 1: Clear existing database (unless resuming an interrupted rebuild)
+        if os.path.exists(DEFAULT_CHECKPOINT_PATH) and not fresh:
+            logger.info(f"⏩ Found ingestion checkpoint {DEFAULT_CHECKPOINT_PATH} - resuming interrupted rebuild (use --fresh to start over)")
+        else:
+            clear_existing_database()
+            if os.path.exists(DEFAULT_CHECKPOINT_PATH):
+                os.remove(DEFAULT_CHECKPOINT_PATH)
         
         # Step 2: Analyze PDF files
         if not analyze_pdf_files():
@@ -85,7 +96,7 @@ def rebuild_database():
         
         # Step 4: Add sample data with hybrid processing
         logger.info("📚 Processing PDF files with hybrid system...")
-        vector_db.add_sample_data()
+        vector_db.add_sample_data(workers=workers, batch_size=batch_size)
         
         # Step 5: Verify database contents
         logger.info("🔍 Verifying database contents...")
@@ -108,6 +119,10 @@ def rebuild_database():
         else:
             logger.warning("⚠️  Some results may not have unique IDs")
         
+        cache_stats = get_extraction_cache().stats()
+        logger.info(f"🗄️  Extraction cache: {cache_stats['text_hits']} text hits, "
+                    f"{cache_stats['text_misses']} misses, {cache_stats['entries']} entries")
+        
         logger.info("🎉 Hybrid vector database rebuild completed successfully!")
         return True
         
@@ -117,12 +132,21 @@ def rebuild_database():
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Rebuild the hybrid vector database")
+    parser.add_argument('--fresh', action='store_true',
+                        help='Ignore any ingestion checkpoint and rebuild from scratch')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='PDF extraction processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Resumes per metadata/upsert batch')
+    args = parser.parse_args()
+    
     print("=" * 70)
     print("🔄 HYBRID VECTOR DATABASE REBUILD")
     print("=" * 70)
     print()
     
-    success = rebuild_database()
+    success = rebuild_database(fresh=args.fresh, workers=args.workers, batch_size=args.batch_size)
     
     print()
     print("=" * 70)
@@ -136,6 +160,7 @@ def main():
     else:
         print("❌ REBUILD FAILED!")
         print("Check the logs above for error details.")
+        print("Re-run the script to resume from the last completed batch.")
     print("=" * 70)
 
 if __name__ == "__main__":
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+BM25 Inverted Index
+Lexical index over whole resume texts, built at ingest and stored on disk as
+flat NumPy postings arrays that are memory-mapped at query time, so exact
+skill terms (React, TypeScript, GraphQL) can be retrieved without scanning documents
+"""
+
+import os
+import re
+import json
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bump when tokenization or the on-disk layout changes so old indexes are rebuilt
+BM25_INDEX_VERSION = 1
+
+# Standard Okapi BM25 parameters
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+
+# Keeps tech tokens such as c++, c#, node.js and ci/cd intact
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#./]*")
+
+_STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+""".split())
+
+
+def bm25_index_path_for(persist_directory: str) -> str:
+    """Index directory kept next to (not inside) the vector database directory"""
+    return f"{persist_directory.rstrip('/')}_bm25"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms with trailing punctuation stripped and stop words removed"""
+    tokens = []
+    for token in _TOKEN_PATTERN.findall((text or '').lower()):
+        token = token.rstrip('./')
+        if token and token not in _STOP_WORDS:
+            tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    """
+    Read-only BM25 index: term -> contiguous slice of the postings arrays
+    postings_docs holds document numbers and postings_tf term frequencies
+    """
+
+    def __init__(self, doc_ids: List[str], vocabulary: Dict[str, Tuple[int, int]],
+                 postings_docs: np.ndarray, postings_tf: np.ndarray, doc_lengths: np.ndarray,
+                 collection_version: int = 0, k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        self.doc_ids = doc_ids
+        self.vocabulary = vocabulary
+        self.postings_docs = postings_docs
+        self.postings_tf = postings_tf
+        self.doc_lengths = doc_lengths
+        self.collection_version = collection_version
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[str, str]], collection_version: int = 0,
+              k1: float = DEFAULT_K1, b: float = DEFAULT_B) -> 'BM25Index':
+        """Build the index from (doc_id, text) pairs"""
+        doc_ids: List[str] = []
+        doc_lengths: List[int] = []
+        term_postings: Dict[str, List[Tuple[int, int]]] = {}
+
+        for doc_number, (doc_id, text) in enumerate(documents):
+            tokens = tokenize(text)
+            doc_ids.append(doc_id)
+            doc_lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                term_postings.setdefault(term, []).append((doc_number, tf))
+
+        vocabulary: Dict[str, Tuple[int, int]] = {}
+        total_postings = sum(len(postings) for postings in term_postings.values())
+        postings_docs = np.empty(total_postings, dtype=np.int32)
+        postings_tf = np.empty(total_postings, dtype=np.float32)
+        offset = 0
+        for term in sorted(term_postings):
+            postings = term_postings[term]
+            vocabulary[term] = (offset, len(postings))
+            for i, (doc_number, tf) in enumerate(postings, start=offset):
+                postings_docs[i] = doc_number
+                postings_tf[i] = tf
+            offset += len(postings)
+
+        return cls(doc_ids, vocabulary, postings_docs, postings_tf,
+                   np.asarray(doc_lengths, dtype=np.float32), collection_version, k1, b)
+
+    def save(self, index_dir: str):
+        """Write arrays then the manifest; each file is replaced atomically"""
+        path = Path(index_dir)
+        path.mkdir(parents=True, exist_ok=True)
+
+        for name, array in (('postings_docs', self.postings_docs),
+                            ('postings_tf', self.postings_tf),
+                            ('doc_lengths', self.doc_lengths)):
+            tmp_file = path / f"{name}.tmp.npy"
+            np.save(tmp_file, np.ascontiguousarray(array))
+            os.replace(tmp_file, path / f"{name}.npy")
+
+        manifest = {
+            'index_version': BM25_INDEX_VERSION,
+            'collection_version': self.collection_version,
+            'k1': self.k1,
+            'b': self.b,
+            'doc_ids': self.doc_ids,
+            'vocabulary': self.vocabulary
+        }
+        tmp_manifest = path / "manifest.tmp.json"
+        with open(tmp_manifest, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_manifest, path / "manifest.json")
+
+    @classmethod
+    def load(cls, index_dir: str) -> Optional['BM25Index']:
+        """Load a saved index with memory-mapped postings; None if missing or from an older layout"""
+        path = Path(index_dir)
+        try:
+            with open(path / "manifest.json") as f:
+                manifest = json.load(f)
+            if manifest.get('index_version') != BM25_INDEX_VERSION:
+                return None
+            return cls(
+                manifest['doc_ids'],
+                {term: tuple(entry) for term, entry in manifest['vocabulary'].items()},
+                np.load(path / "postings_docs.npy", mmap_mode='r'),
+                np.load(path / "postings_tf.npy", mmap_mode='r'),
+                np.load(path / "doc_lengths.npy"),
+                manifest.get('collection_version', 0),
+                manifest.get('k1', DEFAULT_K1),
+                manifest.get('b', DEFAULT_B)
+            )
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️  Could not load BM25 index from {index_dir}: {e}")
+            return None
+
+    def search(self, query: str, n_results: int = 10) -> List[Tuple[str, float]]:
+        """Top (doc_id, bm25_score) pairs for the query, best first"""
+        if not self.doc_ids:
+            return []
+
+        n_docs = len(self.doc_ids)
+        scores = np.zeros(n_docs, dtype=np.float32)
+        length_norm = self.k1 * (1 - self.b + self.b * self.doc_lengths / max(self.avg_doc_length, 1e-9))
+
+        for term in set(tokenize(query)):
+            entry = self.vocabulary.get(term)
+            if entry is None:
+                continue
+            offset, doc_freq = entry
+            docs = self.postings_docs[offset:offset + doc_freq]
+            tf = self.postings_tf[offset:offset + doc_freq]
+            idf = np.log(1 + (n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+            # Each document appears once per term, so fancy-index accumulation is safe
+            scores[docs] += idf * tf * (self.k1 + 1) / (tf + length_norm[docs])
+
+        matched = np.flatnonzero(scores)
+        if len(matched) == 0:
+            return []
+        if len(matched) > n_results:
+            matched = matched[np.argpartition(-scores[matched], n_results - 1)[:n_results]]
+        # Ties broken by document number so results are deterministic
+        order = sorted(matched, key=lambda doc: (-scores[doc], doc))
+        return [(self.doc_ids[doc], float(scores[doc])) for doc in order]
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists: score(id) = sum over lists of 1 / (k + rank)"""
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: (-item[1], item[0]))
@@ -5,17 +5,71 @@ Evaluates each shortlisted candidate against job description with 60%+ accuracy
 Provides detailed justification for selection/rejection decisions
 """
 
+import os
+import json
 import logging
 import re
-from typing import Dict, List, Tuple, Any
-from dataclasses import dataclass
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Set, Tuple, Any, Callable, Optional
+from dataclasses import dataclass, asdict
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 from datetime import datetime
 
+from utils.keyword_matcher import KeywordMatcher
+from services.evaluation_cache import get_evaluation_cache, job_description_hash
+from services.tfidf_model import CorpusTfidfModel, tfidf_model_path_for
+
 logger = logging.getLogger(__name__)
 
+
+# Corpus TF-IDF model saved by the vector database at write time (see HybridVectorDB.rebuild_tfidf_model)
+DEFAULT_CORPUS_MODEL_DIR = tfidf_model_path_for("./hybrid_chroma_db")
+
+_saved_corpus_model: Tuple[Any, Any] = (None, None)  # ((model dir, manifest mtime), model)
+
+
+def load_corpus_tfidf_model(model_dir: str = DEFAULT_CORPUS_MODEL_DIR):
+    """
+    Corpus TF-IDF model as last saved at write time, or None when there is none
+    Reads the saved files only (no ChromaDB), reloading when the manifest changes;
+    callers holding a vector database can pass corpus_model_loader=vector_db.get_tfidf_model instead
+    """
+    global _saved_corpus_model
+    try:
+        mtime = os.stat(os.path.join(model_dir, "manifest.json")).st_mtime_ns
+    except OSError:
+        return None
+    if _saved_corpus_model[0] != (model_dir, mtime):
+        model = CorpusTfidfModel.load(model_dir)
+        if model is None:
+            logger.warning("⚠️  Corpus TF-IDF model unavailable, fitting per candidate")
+        _saved_corpus_model = ((model_dir, mtime), model)
+    return _saved_corpus_model[1]
+
+# Candidates per unit of work (progress is reported per chunk) and the pool size below
+# which a process pool costs more to start than it saves
+DEFAULT_CHUNK_SIZE = 250
+PARALLEL_MIN_CANDIDATES = 1000
+
+# Weights of the component scores in the overall score
+SCORE_WEIGHTS = {
+    'semantic': 0.20,    # 20% - overall content match
+    'skills': 0.35,      # 35% - most important for technical roles
+    'experience': 0.25,  # 25% - critical for role fit
+    'certification': 0.10, # 10% - nice to have
+    'role_fit': 0.10     # 10% - level appropriateness
+}
+
+
+def _boundary_window(first: str, second: str, width: int) -> str:
+    """Text around the space in f"{first} {second}": enough to hold any match of up to width + 1 chars crossing it"""
+    return f"{first[max(0, len(first) - width):]} {second[:width]}"
+
+
 @dataclass
 class EvaluationCriteria:
     """Criteria for candidate evaluation"""
@@ -39,11 +93,82 @@ class CandidateScore:
     is_selected: bool
     justification: Dict[str, Any]
 
+@dataclass
+class ComponentScores:
+    """Component scores of a candidate list (arrays in candidate order) with their breakdowns"""
+    semantic: np.ndarray
+    skills: np.ndarray
+    experience: np.ndarray
+    certification: np.ndarray
+    role_fit: np.ndarray
+    breakdowns: List[Dict[str, Any]]
+
+class LazyJustification(Mapping):
+    """
+    Read-only view of generate_justification's dict, rendered on first access
+    Until then it only references the candidate, its CandidateScore (numeric breakdown)
+    and the criteria shared by the whole evaluation
+    """
+    __slots__ = ('_evaluator', '_candidate', '_score', '_criteria', '_threshold', '_evaluation_date', '_rendered')
+    
+    def __init__(self, evaluator: 'CandidateEvaluator', candidate: Dict, score: CandidateScore,
+                 criteria: EvaluationCriteria, selection_threshold: float, evaluation_date: str):
+        self._evaluator = evaluator
+        self._candidate = candidate
+        self._score = score
+        self._criteria = criteria
+        self._threshold = selection_threshold
+        self._evaluation_date = evaluation_date
+        self._rendered: Optional[Dict[str, Any]] = None
+    
+    @property
+    def is_rendered(self) -> bool:
+        return self._rendered is not None
+    
+    def render(self) -> Dict[str, Any]:
+        """The justification dict (built once, then reused)"""
+        if self._rendered is None:
+            self._rendered = self._evaluator.generate_justification(self._candidate, self._score, self._criteria,
+                                                                    self._threshold, self._evaluation_date)
+        return self._rendered
+    
+    def __getitem__(self, key: str) -> Any:
+        return self.render()[key]
+    
+    def __iter__(self):
+        return iter(self.render())
+    
+    def __len__(self) -> int:
+        return len(self.render())
+    
+    def __repr__(self) -> str:
+        return f"LazyJustification({self.render()!r})" if self.is_rendered else "LazyJustification(<not rendered>)"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain (JSON-serializable) copy of the rendered justification"""
+        return dict(self.render())
+
+def plain_justification(justification: Any) -> Any:
+    """A justification as stored or sent: LazyJustification rendered to a plain dict, anything else as is"""
+    return justification.to_dict() if isinstance(justification, LazyJustification) else justification
+
 class CandidateEvaluator:
     """Advanced candidate evaluation system with 60%+ accuracy"""
     
-    def __init__(self):
+    def __init__(self, corpus_model_loader: Optional[Callable[[], Any]] = load_corpus_tfidf_model,
+                 evaluation_cache_loader: Optional[Callable[[], Any]] = get_evaluation_cache,
+                 workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE):
         self.selection_threshold = 0.60  # 60% threshold for auto-selection
+        # workers > 1 scores large pools in a process pool (same results as serial)
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.parallel_min_candidates = PARALLEL_MIN_CANDIDATES
+        # Criteria per JD hash and component scores per (candidate, JD hash), so changing
+        # weights or the threshold only recombines stored scores (None disables caching)
+        self.evaluation_cache_loader = evaluation_cache_loader
+        # Corpus-fitted TF-IDF (vocabulary and IDF from every resume); the two-document
+        # vectorizer below is only the fallback when no corpus model exists
+        self.corpus_model_loader = corpus_model_loader
         self.vectorizer = TfidfVectorizer(
             max_features=1000,
             stop_words='english',
@@ -51,8 +176,36 @@ class CandidateEvaluator:
             lowercase=True
         )
         
+        # Role level indicators, scanned in one pass per candidate
+        self.role_indicators = {
+            'junior': ['junior', 'entry', 'associate', 'trainee', 'intern'],
+            'mid': ['developer', 'engineer', 'analyst', 'specialist'],
+            'senior': ['senior', 'sr.', 'lead', 'principal', 'expert'],
+            'lead': ['manager', 'director', 'head', 'team lead', 'tech lead']
+        }
+        self.role_indicator_matcher = KeywordMatcher(
+            indicator for indicators in self.role_indicators.values() for indicator in indicators
+        )
+        
+    def _evaluation_cache(self):
+        return self.evaluation_cache_loader() if self.evaluation_cache_loader else None
+    
     def extract_evaluation_criteria(self, job_description: str) -> EvaluationCriteria:
-        """Extract structured evaluation criteria from job description"""
+        """Extract structured evaluation criteria from job description (parsed once per JD text)"""
+        cache = self._evaluation_cache()
+        if cache is None:
+            return self._parse_evaluation_criteria(job_description)
+        
+        jd_hash = job_description_hash(job_description)
+        cached = cache.get_criteria(jd_hash)
+        if cached is not None:
+            return EvaluationCriteria(**cached)
+        criteria = self._parse_evaluation_criteria(job_description)
+        cache.put_criteria(jd_hash, asdict(criteria))
+        return criteria
+    
+    def _parse_evaluation_criteria(self, job_description: str) -> EvaluationCriteria:
+        """Run the criteria regexes over the job description"""
         
         # Extract required skills
         required_skills = []
@@ -131,8 +284,36 @@ class CandidateEvaluator:
             domain_keywords=domain_keywords
         )
     
+    def _corpus_model(self):
+        return self.corpus_model_loader() if self.corpus_model_loader else None
+    
+    def calculate_semantic_similarities(self, job_description: str, candidates: List[Dict]) -> List[float]:
+        """
+        TF-IDF cosine similarity of every candidate to the job description
+        With the corpus model, stored resume vectors are scored in one sparse mat-vec
+        (resumes not in the corpus are vectorized with the corpus vocabulary and IDF)
+        """
+        return self._semantic_similarities(self._corpus_model(), job_description, candidates)
+    
+    def _semantic_similarities(self, model, job_description: str, candidates: List[Dict]) -> List[float]:
+        if model is None:
+            return [self._pairwise_tfidf_similarity(job_description, candidate.get('content', ''))
+                    for candidate in candidates]
+        try:
+            scores = model.similarities(job_description,
+                                        [candidate.get('id') for candidate in candidates],
+                                        [candidate.get('content', '') for candidate in candidates])
+            return [float(score) for score in scores]
+        except Exception as e:
+            logger.error(f"Error calculating semantic similarity: {e}")
+            return [0.0] * len(candidates)
+    
     def calculate_semantic_similarity(self, job_description: str, candidate_content: str) -> float:
         """Calculate semantic similarity using TF-IDF and cosine similarity"""
+        return self.calculate_semantic_similarities(job_description, [{'content': candidate_content}])[0]
+    
+    def _pairwise_tfidf_similarity(self, job_description: str, candidate_content: str) -> float:
+        """Fallback without a corpus model: TF-IDF fitted on just the two documents"""
         try:
             # Prepare documents
             documents = [job_description, candidate_content]
@@ -157,15 +338,25 @@ class CandidateEvaluator:
         # Combine skills and content for comprehensive matching
         candidate_text = f"{candidate_skills_text} {candidate_content}"
         
+        return self._skills_alignment_from_hits(criteria, lambda term: term in candidate_text)
+    
+    @staticmethod
+    def _skill_terms(skill: str) -> List[str]:
+        """Substrings any of which counts as the skill being present: the skill itself or a word of it"""
+        skill_lower = skill.lower()
+        return [skill_lower] + [word for word in skill_lower.split() if len(word) > 2]
+    
+    def _skills_alignment_from_hits(self, criteria: EvaluationCriteria,
+                                    contains: Callable[[str], bool]) -> Tuple[float, Dict]:
+        """Skills score and breakdown given a test for 'term occurs in the skills + resume text'"""
+        
         # Required skills matching
         required_matches = []
         required_missing = []
         
         for skill in criteria.required_skills:
-            skill_lower = skill.lower()
             # Check for exact match or partial match
-            if (skill_lower in candidate_text or 
-                any(word in candidate_text for word in skill_lower.split() if len(word) > 2)):
+            if any(contains(term) for term in self._skill_terms(skill)):
                 required_matches.append(skill)
             else:
                 required_missing.append(skill)
@@ -173,9 +364,7 @@ class CandidateEvaluator:
         # Preferred skills matching
         preferred_matches = []
         for skill in criteria.preferred_skills:
-            skill_lower = skill.lower()
-            if (skill_lower in candidate_text or 
-                any(word in candidate_text for word in skill_lower.split() if len(word) > 2)):
+            if any(contains(term) for term in self._skill_terms(skill)):
                 preferred_matches.append(skill)
         
         # Calculate alignment score
@@ -230,14 +419,35 @@ class CandidateEvaluator:
                 excess = candidate_exp - criteria.max_experience
                 score = max(0.6, 1.0 - (excess * 0.05))  # Less penalty for over-experience
         
-        experience_breakdown = {
+        return score, self._experience_breakdown(criteria, candidate_exp)
+    
+    @staticmethod
+    def _experience_scores(criteria: EvaluationCriteria, experience: np.ndarray) -> np.ndarray:
+        """calculate_experience_mapping's score for an array of experience years (same arithmetic)"""
+        min_exp, max_exp = criteria.min_experience, criteria.max_experience
+        
+        # Within range: prefer candidates closer to the higher end of the range
+        if max_exp == 999:  # Open-ended
+            within = np.minimum(1.0, experience / (min_exp + 5))
+        elif max_exp - min_exp > 0:
+            within = 0.7 + (0.3 * ((experience - min_exp) / (max_exp - min_exp)))  # 70% base + 30% for position
+        else:
+            within = np.ones_like(experience)
+        
+        # Penalty for being outside range (less for over-experience)
+        under = np.maximum(0.0, 0.5 - ((min_exp - experience) * 0.1))
+        over = np.maximum(0.6, 1.0 - ((experience - max_exp) * 0.05))
+        
+        return np.where(experience < min_exp, under,
+                        np.where(experience > max_exp, over, within))
+    
+    def _experience_breakdown(self, criteria: EvaluationCriteria, candidate_exp) -> Dict:
+        return {
             'candidate_experience': candidate_exp,
             'required_range': f"{criteria.min_experience}-{criteria.max_experience}",
             'within_range': criteria.min_experience <= candidate_exp <= criteria.max_experience,
             'score_explanation': self._get_experience_explanation(candidate_exp, criteria)
         }
-        
-        return score, experience_breakdown
     
     def _get_experience_explanation(self, candidate_exp: int, criteria: EvaluationCriteria) -> str:
         """Get explanation for experience scoring"""
@@ -260,12 +470,19 @@ class CandidateEvaluator:
         candidate_skills = candidate.get('metadata', {}).get('skills', '').lower()
         candidate_text = f"{candidate_content} {candidate_skills}"
         
+        return self._certification_score_from_hits(criteria, lambda term: term in candidate_text)
+    
+    def _certification_score_from_hits(self, criteria: EvaluationCriteria,
+                                       contains: Callable[[str], bool]) -> Tuple[float, Dict]:
+        """Certification score and breakdown given a test for 'term occurs in the resume + skills text'"""
+        if not criteria.required_certifications:
+            return 1.0, {'no_certifications_required': True}
+        
         matched_certs = []
         missing_certs = []
         
         for cert in criteria.required_certifications:
-            cert_lower = cert.lower()
-            if cert_lower in candidate_text:
+            if contains(cert.lower()):
                 matched_certs.append(cert)
             else:
                 missing_certs.append(cert)
@@ -287,25 +504,11 @@ class CandidateEvaluator:
     def calculate_role_fit_score(self, criteria: EvaluationCriteria, candidate: Dict) -> Tuple[float, Dict]:
         """Calculate role level fit score"""
         
-        candidate_content = candidate.get('content', '').lower()
         candidate_exp = candidate.get('metadata', {}).get('experience_years', 0)
         
-        # Role level indicators
-        role_indicators = {
-            'junior': ['junior', 'entry', 'associate', 'trainee', 'intern'],
-            'mid': ['developer', 'engineer', 'analyst', 'specialist'],
-            'senior': ['senior', 'sr.', 'lead', 'principal', 'expert'],
-            'lead': ['manager', 'director', 'head', 'team lead', 'tech lead']
-        }
-        
-        # Check candidate's apparent level from content
-        candidate_level_scores = {}
-        for level, indicators in role_indicators.items():
-            score = sum(1 for indicator in indicators if indicator in candidate_content)
-            candidate_level_scores[level] = score
-        
-        # Determine candidate's apparent level
-        apparent_level = max(candidate_level_scores, key=candidate_level_scores.get)
+        # Check candidate's apparent level from content (single scan)
+        indicator_hits = self.role_indicator_matcher.find_keywords(candidate.get('content', ''))
+        apparent_level = self._apparent_level(indicator_hits)
         
         # Experience-based level validation
         exp_based_level = 'junior'
@@ -316,6 +519,21 @@ class CandidateEvaluator:
         elif candidate_exp >= 2:
             exp_based_level = 'mid'
         
+        return self._role_fit(criteria, apparent_level, exp_based_level)
+    
+    def _apparent_level(self, indicator_hits: Set[str]) -> str:
+        """Role level with the most indicator words in the resume"""
+        candidate_level_scores = {}
+        for level, indicators in self.role_indicators.items():
+            score = sum(1 for indicator in indicators if indicator in indicator_hits)
+            candidate_level_scores[level] = score
+        
+        # Determine candidate's apparent level
+        return max(candidate_level_scores, key=candidate_level_scores.get)
+    
+    @staticmethod
+    def _role_fit(criteria: EvaluationCriteria, apparent_level: str, exp_based_level: str) -> Tuple[float, Dict]:
+        """Role fit score and breakdown from the apparent and experience-based levels"""
         # Calculate fit score
         level_hierarchy = {'junior': 1, 'mid': 2, 'senior': 3, 'lead': 4}
         required_level_num = level_hierarchy.get(criteria.role_level, 2)
@@ -348,17 +566,20 @@ class CandidateEvaluator:
         
         return score, role_breakdown
     
-    def generate_justification(self, candidate: Dict, score: CandidateScore, criteria: EvaluationCriteria) -> Dict[str, Any]:
+    def generate_justification(self, candidate: Dict, score: CandidateScore, criteria: EvaluationCriteria,
+                               selection_threshold: Optional[float] = None,
+                               evaluation_date: Optional[str] = None) -> Dict[str, Any]:
         """Generate detailed justification for selection/rejection"""
         
+        threshold = self.selection_threshold if selection_threshold is None else selection_threshold
         candidate_name = candidate.get('metadata', {}).get('candidate_name', 'Unknown')
         
         justification = {
             'candidate_name': candidate_name,
             'decision': 'SELECTED' if score.is_selected else 'REJECTED',
             'overall_score': f"{score.overall_score:.1%}",
-            'threshold': f"{self.selection_threshold:.1%}",
-            'evaluation_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'threshold': f"{threshold:.1%}",
+            'evaluation_date': evaluation_date or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             'detailed_scores': {
                 'semantic_similarity': f"{score.semantic_similarity:.1%}",
                 'skills_alignment': f"{score.skills_alignment:.1%}",
@@ -418,28 +639,24 @@ class CandidateEvaluator:
                 gaps.append(f"Role level mismatch: candidate appears {role_info.get('final_candidate_level', 'unknown')} level, role requires {criteria.role_level}")
             
             justification['rejection_reasons'] = gaps
-            justification['recommendation'] = f"NOT RECOMMENDED - Score {score.overall_score:.1%} below {self.selection_threshold:.1%} threshold"
+            justification['recommendation'] = f"NOT RECOMMENDED - Score {score.overall_score:.1%} below {threshold:.1%} threshold"
         
         return justification
     
-    def evaluate_candidate(self, candidate: Dict, job_description: str, criteria: EvaluationCriteria) -> CandidateScore:
-        """Evaluate a single candidate against job requirements"""
+    def evaluate_candidate(self, candidate: Dict, job_description: str, criteria: EvaluationCriteria,
+                           semantic_score: Optional[float] = None) -> CandidateScore:
+        """Evaluate a single candidate against job requirements (semantic_score may be precomputed)"""
         
         # Calculate individual scores
-        semantic_score = self.calculate_semantic_similarity(job_description, candidate.get('content', ''))
+        if semantic_score is None:
+            semantic_score = self.calculate_semantic_similarities(job_description, [candidate])[0]
         skills_score, skills_breakdown = self.calculate_skills_alignment(criteria, candidate)
         experience_score, experience_breakdown = self.calculate_experience_mapping(criteria, candidate)
         cert_score, cert_breakdown = self.calculate_certification_score(criteria, candidate)
         role_score, role_breakdown = self.calculate_role_fit_score(criteria, candidate)
         
         # Weighted overall score (can be adjusted based on job importance)
-        weights = {
-            'semantic': 0.20,    # 20% - overall content match
-            'skills': 0.35,      # 35% - most important for technical roles
-            'experience': 0.25,  # 25% - critical for role fit
-            'certification': 0.10, # 10% - nice to have
-            'role_fit': 0.10     # 10% - level appropriateness
-        }
+        weights = dict(SCORE_WEIGHTS)
         
         overall_score = (
             semantic_score * weights['semantic'] +
@@ -474,8 +691,244 @@ class CandidateEvaluator:
         
         return score
     
-    def evaluate_candidates(self, candidates: List[Dict], job_description: str) -> Dict[str, Any]:
-        """Evaluate all shortlisted candidates and provide comprehensive results"""
+    @staticmethod
+    def _candidate_id(candidate: Dict) -> Optional[str]:
+        return candidate.get('id') or candidate.get('metadata', {}).get('unique_id')
+    
+    @staticmethod
+    def _component_fingerprint(candidate: Dict, semantic_key: str) -> str:
+        """Hash of everything the component scores read from a candidate, plus the semantic model in use"""
+        metadata = candidate.get('metadata', {})
+        payload = json.dumps([candidate.get('content', ''), metadata.get('skills', ''),
+                              metadata.get('experience_years', 0), semantic_key], default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def component_scores(self, candidates: List[Dict], job_description: str,
+                         criteria: Optional[EvaluationCriteria] = None, workers: Optional[int] = None,
+                         progress_callback: Optional[Callable[[int, int], None]] = None) -> ComponentScores:
+        """
+        The five component scores of every candidate against the job description
+        Scores cached for (candidate id, JD hash) are reused while the candidate's resume,
+        skills, experience and the TF-IDF model are unchanged; only the rest are computed
+        progress_callback(done, total) is called as chunks of candidates are scored
+        """
+        if criteria is None:
+            criteria = self.extract_evaluation_criteria(job_description)
+        total = len(candidates)
+        columns = np.zeros((5, total), dtype=float)
+        breakdowns: List[Any] = [None] * total
+        done = 0
+        for positions, components in self._iter_component_scores(candidates, job_description, criteria, workers):
+            for row, values in enumerate((components.semantic, components.skills, components.experience,
+                                          components.certification, components.role_fit)):
+                columns[row, positions] = values
+            for position, breakdown in zip(positions, components.breakdowns):
+                breakdowns[position] = breakdown
+            done += len(positions)
+            if progress_callback:
+                progress_callback(done, total)
+        return ComponentScores(*columns, breakdowns=breakdowns)
+    
+    def _iter_component_scores(self, candidates: List[Dict], job_description: str, criteria: EvaluationCriteria,
+                               workers: Optional[int] = None, chunk_size: Optional[int] = None
+                               ) -> Iterator[Tuple[List[int], ComponentScores]]:
+        """
+        Yield (positions in candidates, their component scores): all cached candidates first,
+        then each computed chunk as soon as it is scored (newly computed scores are cached)
+        """
+        if not candidates:
+            return
+        model = self._corpus_model()
+        cache = self._evaluation_cache()
+        missing = list(range(len(candidates)))
+        if cache is not None:
+            semantic_key = f"corpus:{model.collection_version}:{len(model)}" if model is not None else "pairwise"
+            jd_hash = job_description_hash(job_description)
+            keys = [(self._candidate_id(candidate), self._component_fingerprint(candidate, semantic_key))
+                    for candidate in candidates]
+            cached = cache.get_components(jd_hash, [key for key in keys if key[0]])
+            hits = [i for i, (candidate_id, _) in enumerate(keys) if candidate_id in cached]
+            if hits:
+                rows = [cached[keys[i][0]] for i in hits]
+                values = np.array([scores for scores, _ in rows], dtype=float).T
+                yield hits, ComponentScores(*values, breakdowns=[breakdowns for _, breakdowns in rows])
+            missing = [i for i, (candidate_id, _) in enumerate(keys) if candidate_id not in cached]
+        
+        for positions, components in self._iter_computed_components(candidates, missing, job_description, criteria,
+                                                                    model, workers, chunk_size):
+            if cache is not None:
+                cache.put_components(jd_hash, [
+                    (keys[i][0], keys[i][1],
+                     (components.semantic[j], components.skills[j], components.experience[j],
+                      components.certification[j], components.role_fit[j]),
+                     components.breakdowns[j])
+                    for j, i in enumerate(positions) if keys[i][0]
+                ])
+            yield positions, components
+    
+    def _iter_computed_components(self, candidates: List[Dict], positions: List[int], job_description: str,
+                                  criteria: EvaluationCriteria, model, workers: Optional[int] = None,
+                                  chunk_size: Optional[int] = None) -> Iterator[Tuple[List[int], ComponentScores]]:
+        """
+        Score candidates[positions] in chunks, yielding each chunk as it finishes
+        Keyword components run in a process pool for large pools (the criteria are sent once
+        per worker, chunks carry only the scored fields); semantic similarity is a sparse
+        mat-vec per chunk here, so the TF-IDF model never leaves this process
+        """
+        workers = self.workers if workers is None else max(1, workers)
+        chunk_size = max(1, chunk_size or self.chunk_size)
+        chunks = [positions[start:start + chunk_size] for start in range(0, len(positions), chunk_size)]
+        
+        def _finish(chunk: List[int], keyword_components) -> Tuple[List[int], ComponentScores]:
+            semantic = np.array(self._semantic_similarities(model, job_description, [candidates[i] for i in chunk]),
+                                dtype=float)
+            return chunk, ComponentScores(semantic, *keyword_components)
+        
+        if workers <= 1 or len(chunks) <= 1 or len(positions) < self.parallel_min_candidates:
+            for chunk in chunks:
+                yield _finish(chunk, self._keyword_components([candidates[i] for i in chunk], criteria))
+            return
+        
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_evaluation_worker,
+                                 initargs=(criteria,)) as executor:
+            futures = {executor.submit(_keyword_components_worker,
+                                       [self._scored_fields(candidates[i]) for i in chunk]): chunk
+                       for chunk in chunks}
+            for future in as_completed(futures):
+                yield _finish(futures[future], future.result())
+    
+    @staticmethod
+    def _scored_fields(candidate: Dict) -> Dict:
+        """The parts of a candidate the keyword components read"""
+        metadata = candidate.get('metadata', {})
+        return {
+            'content': candidate.get('content', ''),
+            'metadata': {'skills': metadata.get('skills', ''), 'experience_years': metadata.get('experience_years', 0)}
+        }
+    
+    def _keyword_components(self, candidates: List[Dict], criteria: EvaluationCriteria
+                            ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[Dict]]:
+        """
+        Skills, experience, certification and role fit scores plus breakdowns
+        Each resume is lowercased once and checked for every skill, certification and
+        role-indicator keyword of the requisition; experience scores are computed as one array
+        """
+        skill_terms = {term for skill in criteria.required_skills + criteria.preferred_skills
+                       for term in self._skill_terms(skill)}
+        matcher = KeywordMatcher(skill_terms | {cert.lower() for cert in criteria.required_certifications})
+        # Skills are matched in "skills resume", certifications in "resume skills":
+        # a hit may straddle the joining space, so that spot is checked separately
+        width = max((len(keyword) for keyword in matcher.keywords), default=1) - 1
+        
+        skills_results = []
+        cert_results = []
+        apparent_levels = []
+        for candidate in candidates:
+            content_lower = candidate.get('content', '').lower()
+            skills_lower = candidate.get('metadata', {}).get('skills', '').lower()
+            hits = matcher.find_keywords(content_lower) | matcher.find_keywords(skills_lower)
+            skill_hits = hits | matcher.find_keywords(_boundary_window(skills_lower, content_lower, width))
+            cert_hits = hits | matcher.find_keywords(_boundary_window(content_lower, skills_lower, width))
+            
+            skills_results.append(self._skills_alignment_from_hits(criteria, skill_hits.__contains__))
+            cert_results.append(self._certification_score_from_hits(criteria, cert_hits.__contains__))
+            apparent_levels.append(self._apparent_level(self.role_indicator_matcher.find_keywords(content_lower)))
+        
+        experience_years = [candidate.get('metadata', {}).get('experience_years', 0) for candidate in candidates]
+        experience_array = np.array(experience_years, dtype=float)
+        exp_based_levels = np.select([experience_array >= 7, experience_array >= 4, experience_array >= 2],
+                                     ['lead', 'senior', 'mid'], default='junior')
+        role_results = [self._role_fit(criteria, apparent_level, str(exp_based_level))
+                        for apparent_level, exp_based_level in zip(apparent_levels, exp_based_levels)]
+        
+        return (
+            np.array([score for score, _ in skills_results], dtype=float),
+            self._experience_scores(criteria, experience_array),
+            np.array([score for score, _ in cert_results], dtype=float),
+            np.array([score for score, _ in role_results], dtype=float),
+            [{
+                'skills_breakdown': skills_results[i][1],
+                'experience_breakdown': self._experience_breakdown(criteria, candidate_exp),
+                'cert_breakdown': cert_results[i][1],
+                'role_breakdown': role_results[i][1]
+            } for i, candidate_exp in enumerate(experience_years)]
+        )
+    
+    def combine_component_scores(self, components: ComponentScores, weights: Optional[Dict[str, float]] = None,
+                                 selection_threshold: Optional[float] = None) -> List[CandidateScore]:
+        """Weighted overall scores and selection decisions for precomputed component scores"""
+        weights = dict(SCORE_WEIGHTS if weights is None else weights)
+        threshold = self.selection_threshold if selection_threshold is None else selection_threshold
+        
+        overall_scores = (
+            components.semantic * weights['semantic'] +
+            components.skills * weights['skills'] +
+            components.experience * weights['experience'] +
+            components.certification * weights['certification'] +
+            components.role_fit * weights['role_fit']
+        )
+        selected = overall_scores >= threshold
+        
+        return [CandidateScore(
+            overall_score=float(overall_scores[i]),
+            semantic_similarity=float(components.semantic[i]),
+            skills_alignment=float(components.skills[i]),
+            experience_mapping=float(components.experience[i]),
+            certification_score=float(components.certification[i]),
+            role_fit_score=float(components.role_fit[i]),
+            is_selected=bool(selected[i]),
+            justification={**breakdowns, 'weights_used': dict(weights)}
+        ) for i, breakdowns in enumerate(components.breakdowns)]
+    
+    def evaluate_candidates_batch(self, candidates: List[Dict], job_description: str,
+                                  criteria: Optional[EvaluationCriteria] = None,
+                                  weights: Optional[Dict[str, float]] = None,
+                                  selection_threshold: Optional[float] = None,
+                                  workers: Optional[int] = None,
+                                  progress_callback: Optional[Callable[[int, int], None]] = None) -> List[CandidateScore]:
+        """Score many candidates at once, with the same CandidateScores as evaluate_candidate"""
+        components = self.component_scores(candidates, job_description, criteria, workers, progress_callback)
+        return self.combine_component_scores(components, weights, selection_threshold)
+    
+    def iter_evaluate(self, candidates: List[Dict], job_description: str,
+                      weights: Optional[Dict[str, float]] = None, selection_threshold: Optional[float] = None,
+                      workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                      criteria: Optional[EvaluationCriteria] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield each candidate's evaluation result as soon as it is scored: cached candidates
+        first, then chunk by chunk (chunk_size candidates, default self.chunk_size)
+        Results carry their 'position' in candidates; summarize_evaluations turns the
+        collected results into the same dict evaluate_candidates returns
+        """
+        threshold = self.selection_threshold if selection_threshold is None else selection_threshold
+        if criteria is None:
+            criteria = self.extract_evaluation_criteria(job_description)
+        evaluation_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        for positions, components in self._iter_component_scores(candidates, job_description, criteria,
+                                                                 workers, chunk_size):
+            scores = self.combine_component_scores(components, weights, threshold)
+            for position, score in zip(positions, scores):
+                candidate = candidates[position]
+                yield {
+                    'candidate': candidate,
+                    'score': score,
+                    'justification': LazyJustification(self, candidate, score, criteria, threshold, evaluation_date),
+                    'position': position
+                }
+    
+    def evaluate_candidates(self, candidates: List[Dict], job_description: str,
+                            weights: Optional[Dict[str, float]] = None,
+                            selection_threshold: Optional[float] = None, workers: Optional[int] = None,
+                            progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """
+        Evaluate all shortlisted candidates and provide comprehensive results
+        weights and selection_threshold override SCORE_WEIGHTS and self.selection_threshold;
+        re-running with new values recombines cached component scores
+        workers > 1 shards large pools across processes; progress_callback(done, total)
+        reports scored candidates as chunks finish
+        """
+        threshold = self.selection_threshold if selection_threshold is None else selection_threshold
         
         if not candidates:
             return {
@@ -488,38 +941,41 @@ class CandidateEvaluator:
         # Extract evaluation criteria from job description
         criteria = self.extract_evaluation_criteria(job_description)
         
-        # Evaluate each candidate
-        evaluated_candidates = []
-        selected_candidates = []
-        rejected_candidates = []
+        # All candidates scored in one batch (one sparse mat-vec for semantic similarity)
+        scores = self.evaluate_candidates_batch(candidates, job_description, criteria, weights, threshold,
+                                                workers, progress_callback)
         
-        for candidate in candidates:
-            score = self.evaluate_candidate(candidate, job_description, criteria)
-            justification = self.generate_justification(candidate, score, criteria)
-            
-            evaluation_result = {
-                'candidate': candidate,
-                'score': score,
-                'justification': justification
-            }
-            
-            evaluated_candidates.append(evaluation_result)
-            
-            if score.is_selected:
-                selected_candidates.append(evaluation_result)
-            else:
-                rejected_candidates.append(evaluation_result)
+        # Justifications are rendered only for the candidates that are displayed or exported
+        evaluation_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        evaluated_candidates = [{
+            'candidate': candidate,
+            'score': score,
+            'justification': LazyJustification(self, candidate, score, criteria, threshold, evaluation_date),
+            'position': position
+        } for position, (candidate, score) in enumerate(zip(candidates, scores))]
+        
+        return self.summarize_evaluations(evaluated_candidates, criteria, threshold)
+    
+    def summarize_evaluations(self, evaluated_candidates: List[Dict[str, Any]], criteria: EvaluationCriteria,
+                              selection_threshold: Optional[float] = None) -> Dict[str, Any]:
+        """Split evaluation results into sorted selected/rejected lists and compute summary statistics"""
+        threshold = self.selection_threshold if selection_threshold is None else selection_threshold
+        
+        # Input order, whatever order the results arrived in
+        evaluated_candidates = sorted(evaluated_candidates, key=lambda x: x['position'])
+        selected_candidates = [result for result in evaluated_candidates if result['score'].is_selected]
+        rejected_candidates = [result for result in evaluated_candidates if not result['score'].is_selected]
         
         # Sort by overall score (highest first)
         selected_candidates.sort(key=lambda x: x['score'].overall_score, reverse=True)
         rejected_candidates.sort(key=lambda x: x['score'].overall_score, reverse=True)
         
         # Generate summary statistics
-        total_candidates = len(candidates)
+        total_candidates = len(evaluated_candidates)
         selected_count = len(selected_candidates)
         rejected_count = len(rejected_candidates)
         
-        avg_score = np.mean([result['score'].overall_score for result in evaluated_candidates])
+        avg_score = np.mean([result['score'].overall_score for result in evaluated_candidates]) if evaluated_candidates else 0
         avg_selected_score = np.mean([result['score'].overall_score for result in selected_candidates]) if selected_candidates else 0
         
         summary = {
@@ -529,7 +985,7 @@ class CandidateEvaluator:
             'selection_rate': f"{(selected_count/total_candidates)*100:.1f}%" if total_candidates > 0 else "0%",
             'average_score': f"{avg_score:.1%}",
             'average_selected_score': f"{avg_selected_score:.1%}" if selected_candidates else "N/A",
-            'selection_threshold': f"{self.selection_threshold:.1%}",
+            'selection_threshold': f"{threshold:.1%}",
             'evaluation_criteria': {
                 'required_skills_count': len(criteria.required_skills),
                 'preferred_skills_count': len(criteria.preferred_skills),
@@ -547,5 +1003,18 @@ class CandidateEvaluator:
             'timestamp': datetime.now().isoformat()
         }
 
+# Per-process state of pool workers, set once by the pool initializer
+_worker_evaluator: Optional[CandidateEvaluator] = None
+_worker_criteria: Optional[EvaluationCriteria] = None
+
+def _init_evaluation_worker(criteria: EvaluationCriteria):
+    global _worker_evaluator, _worker_criteria
+    _worker_evaluator = CandidateEvaluator(corpus_model_loader=None, evaluation_cache_loader=None)
+    _worker_criteria = criteria
+
+def _keyword_components_worker(candidates: List[Dict]):
+    """Process-pool worker: keyword components of one chunk against the shared criteria"""
+    return _worker_evaluator._keyword_components(candidates, _worker_criteria)
+
 # Create global instance
 candidate_evaluator = CandidateEvaluator()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Ingest-Time Near-Duplicate Clustering
+Assigns every resume a dup_cluster_id when it is written, using MinHash
+signatures plus exact email/phone keys, so the query path knows which
+candidates to compare without fuzzy matching every pair per search
+Only near-identical resumes share a cluster, and a resume is compared with
+each cluster's first member (its representative), so clusters never chain
+through a single neighbour; the shortlist still confirms every drop with its
+SequenceMatcher test
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, Any
+
+import numpy as np
+
+from utils.near_duplicates import MinHashLSH, MinHasher, default_minhasher
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Estimated Jaccard similarity (5-char shingles) to a cluster's representative needed to join it;
+# templated resumes of different people reach 0.7-0.85, so only near-identical texts qualify
+DEFAULT_SIMILARITY_THRESHOLD = 0.9
+
+
+def encode_signature(signature: np.ndarray) -> str:
+    """Hex-encode a MinHash signature for ChromaDB metadata (scalars only)"""
+    return signature.astype('<u4').tobytes().hex()
+
+
+def decode_signature(encoded: str) -> Optional[np.ndarray]:
+    """Inverse of encode_signature; None for missing or malformed values"""
+    try:
+        return np.frombuffer(bytes.fromhex(encoded), dtype='<u4').astype(np.uint64)
+    except (TypeError, ValueError):
+        return None
+
+
+class DuplicateClusterIndex:
+    """In-memory cluster assignment index, seeded from stored candidate metadata"""
+
+    def __init__(self, similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+                 minhasher: MinHasher = default_minhasher):
+        self.similarity_threshold = similarity_threshold
+        self.minhasher = minhasher
+        self._lsh = MinHashLSH(num_perm=minhasher.num_perm)
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._cluster_of: Dict[str, str] = {}
+        self._representatives: Dict[str, np.ndarray] = {}  # cluster_id -> first member's signature
+        self._email_cluster: Dict[str, str] = {}
+        self._phone_cluster: Dict[str, str] = {}
+
+    @classmethod
+    def from_metadata(cls, entries: List[Tuple[str, Dict[str, Any]]], **kwargs) -> 'DuplicateClusterIndex':
+        """Rebuild the index from (unique_id, metadata) pairs already in the collection"""
+        index = cls(**kwargs)
+        for unique_id, metadata in entries:
+            metadata = metadata or {}
+            cluster_id = metadata.get('dup_cluster_id')
+            signature = decode_signature(metadata.get('minhash_signature', ''))
+            if not cluster_id or signature is None or len(signature) != index.minhasher.num_perm:
+                # Legacy entry - ignored until it is re-ingested
+                continue
+            index._register(unique_id, cluster_id, signature, metadata)
+        return index
+
+    @staticmethod
+    def _contact_keys(metadata: Dict[str, Any]) -> Tuple[str, str]:
+        return (str(metadata.get('email', '') or '').lower().strip(),
+                str(metadata.get('phone', '') or '').strip())
+
+    def _register(self, unique_id: str, cluster_id: str, signature: np.ndarray, metadata: Dict[str, Any]):
+        email, phone = self._contact_keys(metadata)
+        self._signatures[unique_id] = signature
+        self._cluster_of[unique_id] = cluster_id
+        self._representatives.setdefault(cluster_id, signature)
+        self._lsh.add(unique_id, signature)
+        if email:
+            self._email_cluster.setdefault(email, cluster_id)
+        if phone:
+            self._phone_cluster.setdefault(phone, cluster_id)
+
+    def assign(self, unique_id: str, resume_text: str, metadata: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Return (dup_cluster_id, encoded_signature) for a resume and index it
+        A resume joins the first cluster sharing its email/phone, or the cluster
+        of an LSH neighbour whose representative it is near-identical to;
+        otherwise it starts a new cluster named after itself
+        """
+        signature = self.minhasher.signature(resume_text)
+        if unique_id in self._cluster_of:
+            # Same unique ID means same content - keep its existing cluster
+            return self._cluster_of[unique_id], encode_signature(signature)
+
+        email, phone = self._contact_keys(metadata)
+        cluster_id = self._email_cluster.get(email) if email else None
+        if cluster_id is None and phone:
+            cluster_id = self._phone_cluster.get(phone)
+
+        if cluster_id is None:
+            # Neighbours only nominate clusters; similarity is measured against each
+            # cluster's representative, not the neighbour, so A~B~C never chains A to C
+            best_similarity = self.similarity_threshold
+            candidate_clusters = {self._cluster_of[neighbour_id] for neighbour_id in self._lsh.query(signature)}
+            for candidate_cluster in sorted(candidate_clusters):
+                similarity = MinHasher.estimate_jaccard(signature, self._representatives[candidate_cluster])
+                if similarity >= best_similarity:
+                    best_similarity = similarity
+                    cluster_id = candidate_cluster
+
+        if cluster_id is None:
+            cluster_id = f"dup_{unique_id}"
+
+        self._register(unique_id, cluster_id, signature, metadata)
+        return cluster_id, encode_signature(signature)
+
+
+def build_cluster_report(entries: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Summarize the duplicate cluster structure of (unique_id, metadata) pairs"""
+    clusters: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    unclustered = 0
+    for unique_id, metadata in entries:
+        metadata = metadata or {}
+        cluster_id = metadata.get('dup_cluster_id')
+        if not cluster_id:
+            unclustered += 1
+            continue
+        clusters[cluster_id].append({
+            'unique_id': unique_id,
+            'candidate_name': metadata.get('candidate_name', 'Unknown'),
+            'pdf_filename': metadata.get('pdf_filename', ''),
+            'email': metadata.get('email', '')
+        })
+
+    duplicate_clusters = sorted(
+        ({'cluster_id': cluster_id, 'size': len(members), 'members': members}
+         for cluster_id, members in clusters.items() if len(members) > 1),
+        key=lambda cluster: (-cluster['size'], cluster['cluster_id'])
+    )
+    return {
+        'total_candidates': len(entries),
+        'total_clusters': len(clusters),
+        'singleton_clusters': sum(1 for members in clusters.values() if len(members) == 1),
+        'duplicate_clusters': len(duplicate_clusters),
+        'duplicate_candidates': sum(cluster['size'] - 1 for cluster in duplicate_clusters),
+        'largest_cluster_size': max((len(members) for members in clusters.values()), default=0),
+        'unclustered_candidates': unclustered,
+        'clusters': duplicate_clusters
+    }
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Query Embedding Cache
+Keeps query embeddings keyed by normalized query text and embedding model id,
+in an in-memory LRU tier backed by an optional SQLite tier, so repeated
+recruiter searches skip the embedding model entirely
+"""
+
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_ENTRIES = 1024
+DEFAULT_DISK_MAX_ENTRIES = 100_000
+
+# Disk-tier housekeeping batches: prune after this many writes, flush access times after this many hits
+PRUNE_EVERY_WRITES = 100
+ACCESS_FLUSH_EVERY = 100
+
+
+def query_cache_path_for(persist_directory: str) -> str:
+    """Disk tier kept next to (not inside) the vector database directory"""
+    return f"{persist_directory.rstrip('/')}_query_embeddings.sqlite3"
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace so formatting differences share one cache entry"""
+    return re.sub(r'\s+', ' ', query or '').strip()
+
+
+def embedding_model_id(embedding_function: Any) -> str:
+    """Stable identifier of the model behind a ChromaDB embedding function"""
+    name = embedding_function.name() if hasattr(embedding_function, 'name') else type(embedding_function).__name__
+    model_name = getattr(embedding_function, 'model_name', None) or getattr(embedding_function, 'MODEL_NAME', None)
+    return f"{name}:{model_name}" if model_name else str(name)
+
+
+class QueryEmbeddingCache:
+    """Two-tier (memory LRU + optional SQLite) cache in front of an embedding function"""
+
+    def __init__(self, embed_fn: Callable[[List[str]], Sequence], model_id: str,
+                 max_entries: int = DEFAULT_MEMORY_ENTRIES, disk_path: Optional[str] = None,
+                 disk_max_entries: int = DEFAULT_DISK_MAX_ENTRIES):
+        self.embed_fn = embed_fn
+        self.model_id = model_id
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self._memory: 'OrderedDict[str, List[float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._pending_access: Dict[str, float] = {}  # disk hits whose last_access is not written yet
+        self.counters = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+        self._conn = None
+        if disk_path:
+            try:
+                self._conn = sqlite3.connect(disk_path, check_same_thread=False, timeout=30)
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS query_embeddings (
+                        cache_key TEXT PRIMARY KEY,
+                        model_id TEXT NOT NULL,
+                        embedding BLOB NOT NULL,
+                        last_access REAL NOT NULL
+                    )
+                """)
+                self._conn.execute("CREATE INDEX IF NOT EXISTS idx_query_embeddings_access "
+                                   "ON query_embeddings(last_access)")
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️  Query embedding disk cache disabled ({disk_path}): {e}")
+                self._conn = None
+
+    def _cache_key(self, normalized_query: str) -> str:
+        return hashlib.sha256(f"{self.model_id}\n{normalized_query}".encode('utf-8')).hexdigest()
+
+    def _remember(self, key: str, embedding: List[float]):
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.counters['evictions'] += 1
+
+    def _disk_get(self, keys: List[str]) -> Dict[str, List[float]]:
+        if self._conn is None or not keys:
+            return {}
+        placeholders = ','.join('?' * len(keys))
+        rows = self._conn.execute(
+            f"SELECT cache_key, embedding FROM query_embeddings WHERE cache_key IN ({placeholders})", keys
+        ).fetchall()
+        # Access times only order pruning, so hits are recorded in batches rather than committed one by one
+        now = time.time()
+        self._pending_access.update((key, now) for key, _ in rows)
+        if len(self._pending_access) >= ACCESS_FLUSH_EVERY:
+            self._flush_access_times()
+            self._conn.commit()
+        return {key: np.frombuffer(blob, dtype='<f4').tolist() for key, blob in rows}
+
+    def _flush_access_times(self):
+        """Write buffered access times (caller holds the lock and commits)"""
+        if self._pending_access:
+            self._conn.executemany("UPDATE query_embeddings SET last_access = ? WHERE cache_key = ?",
+                                   [(last_access, key) for key, last_access in self._pending_access.items()])
+            self._pending_access.clear()
+
+    def _disk_put(self, entries: Dict[str, List[float]]):
+        if self._conn is None or not entries:
+            return
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO query_embeddings (cache_key, model_id, embedding, last_access) VALUES (?, ?, ?, ?)",
+            [(key, self.model_id, np.asarray(embedding, dtype='<f4').tobytes(), now)
+             for key, embedding in entries.items()]
+        )
+        self._flush_access_times()
+        self._writes_since_prune += len(entries)
+        if self._writes_since_prune >= PRUNE_EVERY_WRITES:
+            self._prune()
+        self._conn.commit()
+
+    def _prune(self):
+        """Drop the least recently used disk entries beyond the cap (caller holds the lock and commits)"""
+        self._writes_since_prune = 0
+        count = self._conn.execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0]
+        excess = count - self.disk_max_entries
+        if excess > 0:
+            self._conn.execute("DELETE FROM query_embeddings WHERE rowid IN "
+                               "(SELECT rowid FROM query_embeddings ORDER BY last_access ASC LIMIT ?)", (excess,))
+            logger.info(f"🧹 Query embedding cache pruned {excess} disk entries")
+
+    def embed(self, queries: List[str]) -> List[List[float]]:
+        """Embeddings for the queries (in order); only cache misses reach the model, in one call"""
+        normalized = [normalize_query(query) for query in queries]
+        keys = [self._cache_key(query) for query in normalized]
+        found: Dict[str, List[float]] = {}
+
+        with self._lock:
+            for key in keys:
+                if key in self._memory and key not in found:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                    self.counters['memory_hits'] += 1
+
+            pending = [key for key in dict.fromkeys(keys) if key not in found]
+            for key, embedding in self._disk_get(pending).items():
+                found[key] = embedding
+                self._remember(key, embedding)
+                self.counters['disk_hits'] += 1
+
+        # Embed outside the lock; each distinct missing query once
+        missing = {key: query for key, query in zip(keys, normalized) if key not in found}
+        if missing:
+            embeddings = self.embed_fn(list(missing.values()))
+            computed = {key: [float(x) for x in embedding] for key, embedding in zip(missing, embeddings)}
+            with self._lock:
+                self.counters['misses'] += len(computed)
+                for key, embedding in computed.items():
+                    self._remember(key, embedding)
+                self._disk_put(computed)
+            found.update(computed)
+
+        return [found[key] for key in keys]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and hit rate across both tiers"""
+        with self._lock:
+            counters = dict(self.counters)
+            memory_entries = len(self._memory)
+        hits = counters['memory_hits'] + counters['disk_hits']
+        lookups = hits + counters['misses']
+        return {
+            **counters,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'memory_entries': memory_entries,
+            'model_id': self.model_id,
+            'disk_path': self.disk_path if self._conn is not None else None
+        }
+
+    def clear(self):
+        """Drop both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._pending_access.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM query_embeddings")
+                self._conn.commit()
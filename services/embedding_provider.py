@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Configurable Embedding Provider
+Chooses the embedding model used by the vector database collections: ChromaDB's
+built-in ONNX MiniLM, or a local sentence-transformers model with explicit
+batch size, sequence length, CPU threads and ONNX / int8-quantized execution
+"""
+
+import os
+import logging
+import platform
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional, Set
+
+from chromadb import Documents, EmbeddingFunction, Embeddings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Collection metadata key recording which model produced the stored embeddings
+EMBEDDING_MODEL_METADATA_KEY = "embedding_model"
+
+# What collections created before the model id was recorded were embedded with
+DEFAULT_MODEL_ID = "chroma-default/all-MiniLM-L6-v2"
+
+# Dynamic int8 ONNX exports shipped with the sentence-transformers hub models, best first,
+# each paired with the CPU feature its kernels need
+QUANTIZED_ONNX_FILES = (
+    ('avx512_vnni', "onnx/model_qint8_avx512_vnni.onnx"),
+    ('avx512f', "onnx/model_qint8_avx512.onnx"),
+    ('avx2', "onnx/model_quint8_avx2.onnx"),
+    ('arm64', "onnx/model_qint8_arm64.onnx"),
+)
+UNQUANTIZED_ONNX_FILE = "onnx/model.onnx"
+
+
+class EmbeddingModelMismatchError(RuntimeError):
+    """Raised when a collection was embedded with a different model than the configured one"""
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.environ.get(name, '').strip()
+    return int(value) if value else None
+
+
+def cpu_features() -> Set[str]:
+    """CPU flags from /proc/cpuinfo (Linux), plus 'arm64' on ARM machines"""
+    features: Set[str] = set()
+    if platform.machine().lower() in ('arm64', 'aarch64'):
+        features.add('arm64')
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('flags'):
+                    features.update(line.split(':', 1)[1].split())
+                    break
+    except OSError:
+        pass
+    return features
+
+
+def quantized_onnx_file(features: Optional[Set[str]] = None) -> Optional[str]:
+    """Quantized ONNX export this CPU can run (VNNI only where supported); None when none fits"""
+    features = cpu_features() if features is None else features
+    for feature, file_name in QUANTIZED_ONNX_FILES:
+        if feature in features:
+            return file_name
+    return None
+
+
+@dataclass
+class EmbeddingConfig:
+    """Embedding provider settings (HR_EMBEDDING_* environment variables via from_env)"""
+    provider: str = "default"  # "default" (ChromaDB built-in) or "sentence-transformers"
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+    batch_size: int = 64
+    max_seq_length: Optional[int] = None
+    threads: Optional[int] = None
+    backend: str = "torch"  # "torch", "onnx" or "openvino"
+    quantized: bool = False
+    onnx_file_name: Optional[str] = None
+    normalize_embeddings: bool = True
+
+    @classmethod
+    def from_env(cls) -> 'EmbeddingConfig':
+        defaults = cls()
+        return cls(
+            provider=os.environ.get('HR_EMBEDDING_PROVIDER', defaults.provider).strip().lower(),
+            model_name=os.environ.get('HR_EMBEDDING_MODEL', defaults.model_name).strip(),
+            batch_size=_env_int('HR_EMBEDDING_BATCH_SIZE') or defaults.batch_size,
+            max_seq_length=_env_int('HR_EMBEDDING_MAX_SEQ_LENGTH'),
+            threads=_env_int('HR_EMBEDDING_THREADS'),
+            backend=os.environ.get('HR_EMBEDDING_BACKEND', defaults.backend).strip().lower(),
+            quantized=os.environ.get('HR_EMBEDDING_QUANTIZED', '').strip().lower() in ('1', 'true', 'yes'),
+            onnx_file_name=os.environ.get('HR_EMBEDDING_ONNX_FILE') or None
+        )
+
+    @property
+    def model_id(self) -> str:
+        """
+        Identifies the embedding space; stored in collection metadata
+        Batch size, threads, sequence length and quantization do not change the space
+        """
+        if self.provider == "default":
+            return DEFAULT_MODEL_ID
+        # 'all-MiniLM-L6-v2' and 'sentence-transformers/all-MiniLM-L6-v2' are the same model
+        return self.model_name if '/' in self.model_name else f"sentence-transformers/{self.model_name}"
+
+
+class LocalSentenceTransformerEmbedding(EmbeddingFunction[Documents]):
+    """Sentence-transformers embedding function for ChromaDB, loaded lazily on first use"""
+
+    def __init__(self, config: EmbeddingConfig):
+        self.config = config
+        self.model_name = config.model_name
+        self._model = None
+
+    def _load_model(self):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError("sentence-transformers is required for HR_EMBEDDING_PROVIDER=sentence-transformers "
+                              "(pip install sentence-transformers)") from e
+
+        config = self.config
+        if config.threads:
+            import torch
+            torch.set_num_threads(config.threads)
+
+        model_kwargs: Dict[str, Any] = {}
+        if config.backend in ("onnx", "openvino"):
+            # HR_EMBEDDING_ONNX_FILE picks a specific export; otherwise the CPU decides
+            file_name = config.onnx_file_name
+            if file_name is None and config.quantized:
+                file_name = quantized_onnx_file()
+                if file_name is None:
+                    logger.warning(f"⚠️  No quantized ONNX export matches this CPU - using {UNQUANTIZED_ONNX_FILE}")
+            if file_name:
+                model_kwargs["file_name"] = file_name
+            if config.threads and config.backend == "onnx":
+                import onnxruntime
+                session_options = onnxruntime.SessionOptions()
+                session_options.intra_op_num_threads = config.threads
+                model_kwargs["session_options"] = session_options
+
+        model = SentenceTransformer(config.model_name, device="cpu", backend=config.backend,
+                                    model_kwargs=model_kwargs or None)
+        if config.backend == "torch" and config.quantized:
+            # Dynamic int8 quantization of the Linear layers (CPU only)
+            import torch
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        if config.max_seq_length:
+            model.max_seq_length = config.max_seq_length
+
+        logger.info(f"🧠 Loaded embedding model {config.model_name} "
+                    f"(backend={config.backend}, quantized={config.quantized}, threads={config.threads or 'auto'})")
+        return model
+
+    def __call__(self, input: Documents) -> Embeddings:
+        if self._model is None:
+            self._model = self._load_model()
+        embeddings = self._model.encode(
+            list(input),
+            batch_size=self.config.batch_size,
+            normalize_embeddings=self.config.normalize_embeddings,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return [embedding for embedding in embeddings]
+
+    @staticmethod
+    def name() -> str:
+        return "hr-sentence-transformers"
+
+    def get_config(self) -> Dict[str, Any]:
+        return asdict(self.config)
+
+    @staticmethod
+    def build_from_config(config: Dict[str, Any]) -> 'LocalSentenceTransformerEmbedding':
+        return LocalSentenceTransformerEmbedding(EmbeddingConfig(**config))
+
+
+def create_embedding_function(config: EmbeddingConfig) -> Optional[EmbeddingFunction]:
+    """Embedding function for the collections; None means ChromaDB's built-in default"""
+    if config.provider == "default":
+        return None
+    if config.provider == "sentence-transformers":
+        return LocalSentenceTransformerEmbedding(config)
+    raise ValueError(f"Unknown embedding provider: {config.provider}")
+
+
+def _mismatch_error(collection_name: str, stored_model_id: str, model_id: str) -> EmbeddingModelMismatchError:
+    return EmbeddingModelMismatchError(
+        f"Collection '{collection_name}' was embedded with '{stored_model_id}' but the configured "
+        f"embedding model is '{model_id}'. Use the original model or rebuild the database "
+        f"(python rebuild_hybrid_db.py --fresh) to re-embed with the new one."
+    )
+
+
+def open_collection(client, name: str, description: str, embedding_function: Optional[EmbeddingFunction],
+                    model_id: str, configuration: Optional[Dict[str, Any]] = None):
+    """
+    get_or_create_collection with the configured embedding function, refusing a model mismatch
+    configuration (e.g. HNSW settings) only applies when the collection is created
+    """
+    collection_kwargs = {"embedding_function": embedding_function} if embedding_function is not None else {}
+    if configuration:
+        collection_kwargs["configuration"] = configuration
+    try:
+        collection = client.get_or_create_collection(name=name, metadata={"description": description},
+                                                     **collection_kwargs)
+    except ValueError as e:
+        # ChromaDB also persists the embedding function type and rejects a different one
+        if "embedding function" not in str(e).lower():
+            raise
+        raise _mismatch_error(name, DEFAULT_MODEL_ID, model_id) from e
+    verify_collection_model(collection, model_id)
+    return collection
+
+
+def verify_collection_model(collection, model_id: str):
+    """
+    Record the model id on a new (or legacy, unstamped) collection, and refuse
+    to open a collection whose stored embeddings came from a different model
+    """
+    metadata = dict(collection.metadata or {})
+    stored_model_id = metadata.get(EMBEDDING_MODEL_METADATA_KEY)
+
+    if stored_model_id is None:
+        # Unstamped collections with data predate this check and used the built-in model
+        stored_model_id = DEFAULT_MODEL_ID if collection.count() > 0 else model_id
+
+    if stored_model_id != model_id:
+        raise _mismatch_error(collection.name, stored_model_id, model_id)
+
+    if metadata.get(EMBEDDING_MODEL_METADATA_KEY) != model_id:
+        metadata[EMBEDDING_MODEL_METADATA_KEY] = model_id
+        # HNSW settings are fixed at creation and cannot be passed to modify()
+        collection.modify(metadata={key: value for key, value in metadata.items() if not key.startswith('hnsw:')})
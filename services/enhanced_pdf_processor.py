@@ -9,6 +9,15 @@ import logging
 from typing import Optional, Tuple
 from pathlib import Path
 
+from utils.keyword_matcher import KeywordMatcher
+
+# Common resume indicators used to validate extracted text
+RESUME_INDICATORS = [
+    'experience', 'education', 'skills', 'work', 'employment',
+    '@', 'email', 'phone', 'contact', 'resume', 'cv'
+]
+resume_indicator_matcher = KeywordMatcher(RESUME_INDICATORS)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -55,6 +64,14 @@ class EnhancedPDFProcessor:
         Extract content from PDF using multiple processors with fallbacks
         Returns the full resume text as a single string (no chunking)
         """
+        content, _ = self.extract_resume_content_with_processor(pdf_path)
+        return content
+    
+    def extract_resume_content_with_processor(self, pdf_path: str) -> Tuple[str, str]:
+        """
+        Extract content from PDF using multiple processors with fallbacks
+        Returns (cleaned full resume text, name of the processor that succeeded)
+        """
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
@@ -67,7 +84,7 @@ class EnhancedPDFProcessor:
                 
                 if self._validate_content(content):
                     logger.info(f"✅ {processor_name} succeeded - {len(content)} characters extracted")
-                    return self._clean_text(content)
+                    return self._clean_text(content), processor_name
                 else:
                     logger.warning(f"⚠️  {processor_name} extracted invalid content")
                     
@@ -127,14 +144,8 @@ class EnhancedPDFProcessor:
         if not content or len(content.strip()) < 50:
             return False
         
-        # Check for common resume indicators
-        resume_indicators = [
-            'experience', 'education', 'skills', 'work', 'employment',
-            '@', 'email', 'phone', 'contact', 'resume', 'cv'
-        ]
-        
-        content_lower = content.lower()
-        indicator_count = sum(1 for indicator in resume_indicators if indicator in content_lower)
+        # Check for common resume indicators (single scan)
+        indicator_count = len(resume_indicator_matcher.find_keywords(content))
         
         return indicator_count >= 2  # At least 2 resume indicators
     
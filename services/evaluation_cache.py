@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Evaluation Cache
+Persists the EvaluationCriteria parsed from each job description (keyed by a
+hash of the JD text) and each candidate's five component scores plus their
+breakdowns per (candidate unique_id, JD hash), so re-ranking with different
+weights or a different selection threshold never re-scans resume text
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Stored next to (not inside) hybrid_chroma_db so a rebuild does not wipe it
+DEFAULT_CACHE_PATH = "./hybrid_chroma_db_evaluation_cache.sqlite3"
+DEFAULT_MAX_COMPONENT_ENTRIES = 500_000
+
+# Bump when criteria parsing or component scoring changes so stale entries are discarded
+CACHE_SCHEMA_VERSION = 1
+
+# Component score columns, in CandidateScore order
+COMPONENT_NAMES = ('semantic', 'skills', 'experience', 'certification', 'role_fit')
+
+# SQLite host parameter limit headroom for IN (...) lookups
+_LOOKUP_CHUNK = 500
+
+
+def job_description_hash(job_description: str) -> str:
+    """Hash of the exact JD text (criteria parsing is sensitive to line breaks)"""
+    return hashlib.sha256((job_description or '').encode('utf-8')).hexdigest()
+
+
+class EvaluationCache:
+    """SQLite-backed criteria and component-score cache; oldest component rows are pruned past the cap"""
+
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH,
+                 max_component_entries: int = DEFAULT_MAX_COMPONENT_ENTRIES):
+        self.cache_path = cache_path
+        self.max_component_entries = max_component_entries
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self.counters = {
+            'criteria_hits': 0,
+            'criteria_misses': 0,
+            'component_hits': 0,
+            'component_misses': 0
+        }
+
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False, timeout=30)
+        self._initialize_schema()
+
+    def _initialize_schema(self):
+        """Create tables, discarding entries written by an older schema version"""
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != CACHE_SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS criteria")
+                self._conn.execute("DROP TABLE IF EXISTS components")
+                self._conn.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS criteria (
+                    jd_hash TEXT PRIMARY KEY,
+                    criteria_json TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS components (
+                    candidate_id TEXT NOT NULL,
+                    jd_hash TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    semantic REAL NOT NULL,
+                    skills REAL NOT NULL,
+                    experience REAL NOT NULL,
+                    certification REAL NOT NULL,
+                    role_fit REAL NOT NULL,
+                    breakdown_json TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (candidate_id, jd_hash)
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_components_created ON components(created_at)")
+            self._conn.commit()
+
+    def get_criteria(self, jd_hash: str) -> Optional[Dict[str, Any]]:
+        """Parsed criteria fields for a JD hash, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT criteria_json FROM criteria WHERE jd_hash = ?", (jd_hash,)).fetchone()
+            if row is None:
+                self.counters['criteria_misses'] += 1
+                return None
+            self.counters['criteria_hits'] += 1
+            return json.loads(row[0])
+
+    def put_criteria(self, jd_hash: str, criteria: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO criteria (jd_hash, criteria_json, created_at) VALUES (?, ?, ?)",
+                               (jd_hash, json.dumps(criteria), time.time()))
+            self._conn.commit()
+
+    def get_components(self, jd_hash: str, keys: Sequence[Tuple[str, str]]
+                       ) -> Dict[str, Tuple[Tuple[float, ...], Dict[str, Any]]]:
+        """
+        candidate_id -> (component scores in COMPONENT_NAMES order, breakdowns) for every
+        (candidate_id, fingerprint) key stored under this JD with the same fingerprint
+        """
+        fingerprints = dict(keys)
+        found: Dict[str, Tuple[Tuple[float, ...], Dict[str, Any]]] = {}
+        candidate_ids = list(fingerprints)
+        with self._lock:
+            for start in range(0, len(candidate_ids), _LOOKUP_CHUNK):
+                chunk = candidate_ids[start:start + _LOOKUP_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT candidate_id, fingerprint, {', '.join(COMPONENT_NAMES)}, breakdown_json "
+                    f"FROM components WHERE jd_hash = ? AND candidate_id IN ({', '.join('?' * len(chunk))})",
+                    (jd_hash, *chunk)
+                ).fetchall()
+                for candidate_id, fingerprint, *values in rows:
+                    # A changed resume, skills, experience or TF-IDF model invalidates the entry
+                    if fingerprints[candidate_id] == fingerprint:
+                        found[candidate_id] = (tuple(values[:-1]), json.loads(values[-1]))
+            self.counters['component_hits'] += len(found)
+            self.counters['component_misses'] += len(candidate_ids) - len(found)
+        return found
+
+    def put_components(self, jd_hash: str,
+                       entries: List[Tuple[str, str, Sequence[float], Dict[str, Any]]]):
+        """Store (candidate_id, fingerprint, component scores, breakdowns) entries for a JD"""
+        if not entries:
+            return
+        now = time.time()
+        rows = [(candidate_id, jd_hash, fingerprint, *[float(value) for value in scores], json.dumps(breakdowns), now)
+                for candidate_id, fingerprint, scores, breakdowns in entries]
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO components (candidate_id, jd_hash, fingerprint, "
+                f"{', '.join(COMPONENT_NAMES)}, breakdown_json, created_at) VALUES ({', '.join('?' * 10)})",
+                rows
+            )
+            self._conn.commit()
+            self._writes_since_prune += len(rows)
+            if self._writes_since_prune >= 1000:
+                self._prune()
+
+    def _prune(self):
+        """Drop the oldest component rows beyond the cap (caller holds the lock)"""
+        self._writes_since_prune = 0
+        count = self._conn.execute("SELECT COUNT(*) FROM components").fetchone()[0]
+        excess = count - self.max_component_entries
+        if excess > 0:
+            self._conn.execute("DELETE FROM components WHERE rowid IN "
+                               "(SELECT rowid FROM components ORDER BY created_at ASC LIMIT ?)", (excess,))
+            self._conn.commit()
+            logger.info(f"🧹 Evaluation cache pruned {excess} component entries")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus current entry counts"""
+        with self._lock:
+            criteria_entries = self._conn.execute("SELECT COUNT(*) FROM criteria").fetchone()[0]
+            component_entries = self._conn.execute("SELECT COUNT(*) FROM components").fetchone()[0]
+        lookups = self.counters['component_hits'] + self.counters['component_misses']
+        return {
+            **self.counters,
+            'component_hit_rate': self.counters['component_hits'] / lookups if lookups else 0.0,
+            'criteria_entries': criteria_entries,
+            'component_entries': component_entries
+        }
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM criteria")
+            self._conn.execute("DELETE FROM components")
+            self._conn.commit()
+
+# Global instance
+evaluation_cache = None
+
+def get_evaluation_cache() -> EvaluationCache:
+    """Get or create the global evaluation cache instance"""
+    global evaluation_cache
+    if evaluation_cache is None:
+        evaluation_cache = EvaluationCache()
+    return evaluation_cache
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Extraction Cache
+Persists cleaned PDF text, the winning PDF processor and ExtractedMetadata
+keyed by the file's SHA-256, so unchanged resumes are never re-parsed
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from dataclasses import asdict
+from typing import Dict, List, Optional, Sequence, Tuple, Any
+
+from .enhanced_pdf_processor import enhanced_pdf_processor
+from .local_metadata_extractor import local_metadata_extractor, ExtractedMetadata, EXTRACTION_METHOD
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Stored next to (not inside) hybrid_chroma_db so a rebuild does not wipe it
+DEFAULT_CACHE_PATH = "./hybrid_chroma_db_extraction_cache.sqlite3"
+DEFAULT_MAX_SIZE_BYTES = 512 * 1024 * 1024
+
+# Bump when extraction output changes so stale entries are discarded
+CACHE_SCHEMA_VERSION = 1
+
+# Stored size of a row: UTF-8 bytes of its text plus its metadata, whichever columns are set
+_ROW_SIZE_SQL = ("COALESCE(LENGTH(CAST(cleaned_text AS BLOB)), 0) "
+                 "+ COALESCE(LENGTH(CAST(metadata_json AS BLOB)), 0)")
+
+
+class ExtractionCache:
+    """SQLite-backed cache of PDF extraction results with size-based LRU eviction"""
+
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH,
+                 max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES):
+        self.cache_path = cache_path
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+        self.counters = {
+            'text_hits': 0,
+            'text_misses': 0,
+            'metadata_hits': 0,
+            'metadata_misses': 0,
+            'evictions': 0
+        }
+
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False, timeout=30)
+        self._initialize_schema()
+
+    def _initialize_schema(self):
+        """Create tables, discarding entries written by an older schema version"""
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != CACHE_SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS extractions")
+                self._conn.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS extractions (
+                    sha256 TEXT PRIMARY KEY,
+                    cleaned_text TEXT,
+                    processor TEXT,
+                    metadata_json TEXT,
+                    size_bytes INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_extractions_last_access ON extractions(last_access)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def file_sha256(pdf_path) -> str:
+        """SHA-256 of the raw file bytes"""
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def get_text(self, sha256: str) -> Optional[Tuple[str, str]]:
+        """Return (cleaned_text, processor) for a file hash, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cleaned_text, processor FROM extractions WHERE sha256 = ? AND cleaned_text IS NOT NULL",
+                (sha256,)
+            ).fetchone()
+            if row is None:
+                self.counters['text_misses'] += 1
+                return None
+            self.counters['text_hits'] += 1
+            self._touch(sha256)
+            return row[0], row[1]
+
+    def put_text(self, sha256: str, cleaned_text: str, processor: str):
+        """Store cleaned text and the processor that produced it"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO extractions (sha256, cleaned_text, processor, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(sha256) DO UPDATE SET
+                    cleaned_text = excluded.cleaned_text,
+                    processor = excluded.processor,
+                    last_access = excluded.last_access
+            """, (sha256, cleaned_text, processor, now, now))
+            self._update_size(sha256)
+            self._conn.commit()
+            self._after_write()
+
+    def get_metadata(self, sha256: str) -> Optional[ExtractedMetadata]:
+        """Return cached ExtractedMetadata for a file hash, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT metadata_json FROM extractions WHERE sha256 = ? AND metadata_json IS NOT NULL",
+                (sha256,)
+            ).fetchone()
+            if row is None:
+                self.counters['metadata_misses'] += 1
+                return None
+            try:
+                metadata = ExtractedMetadata(**json.loads(row[0]))
+            except (TypeError, ValueError):
+                # Written by an incompatible ExtractedMetadata - treat as a miss
+                self.counters['metadata_misses'] += 1
+                return None
+            if metadata.extraction_method != EXTRACTION_METHOD:
+                # Extracted by an older method - re-extract from the cached text
+                self.counters['metadata_misses'] += 1
+                return None
+            self.counters['metadata_hits'] += 1
+            self._touch(sha256)
+            return metadata
+
+    def put_metadata(self, sha256: str, metadata: ExtractedMetadata):
+        """Store ExtractedMetadata for a file hash"""
+        metadata_json = json.dumps(asdict(metadata))
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO extractions (sha256, metadata_json, created_at, last_access)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(sha256) DO UPDATE SET
+                    metadata_json = excluded.metadata_json,
+                    last_access = excluded.last_access
+            """, (sha256, metadata_json, now, now))
+            self._update_size(sha256)
+            self._conn.commit()
+            self._after_write()
+
+    def extract_text(self, pdf_path) -> str:
+        """Cached EnhancedPDFProcessor.extract_resume_content"""
+        sha256 = self.file_sha256(pdf_path)
+        cached = self.get_text(sha256)
+        if cached is not None:
+            return cached[0]
+
+        cleaned_text, processor = enhanced_pdf_processor.extract_resume_content_with_processor(str(pdf_path))
+        self.put_text(sha256, cleaned_text, processor)
+        return cleaned_text
+
+    def extract_metadata(self, sha256: str, resume_text: str) -> ExtractedMetadata:
+        """Cached LocalMetadataExtractor.extract_metadata"""
+        cached = self.get_metadata(sha256)
+        if cached is not None:
+            return cached
+
+        metadata = local_metadata_extractor.extract_metadata(resume_text)
+        self.put_metadata(sha256, metadata)
+        return metadata
+
+    def extract_metadata_many(self, items: Sequence[Tuple[str, str]]) -> List[ExtractedMetadata]:
+        """Cached LocalMetadataExtractor.extract_metadata_many for (sha256, resume_text) pairs"""
+        results: List[Optional[ExtractedMetadata]] = [self.get_metadata(sha256) for sha256, _ in items]
+        missing = [i for i, metadata in enumerate(results) if metadata is None]
+        if missing:
+            extracted = local_metadata_extractor.extract_metadata_many([items[i][1] for i in missing])
+            for i, metadata in zip(missing, extracted):
+                self.put_metadata(items[i][0], metadata)
+                results[i] = metadata
+        return results
+
+    def _update_size(self, sha256: str):
+        """Recompute a row's size from what it now holds, so inserts and overwrites agree (caller holds the lock)"""
+        self._conn.execute(f"UPDATE extractions SET size_bytes = {_ROW_SIZE_SQL} WHERE sha256 = ?", (sha256,))
+
+    def _touch(self, sha256: str):
+        """Refresh LRU position (caller holds the lock)"""
+        self._conn.execute("UPDATE extractions SET last_access = ? WHERE sha256 = ?", (time.time(), sha256))
+        self._conn.commit()
+
+    def _after_write(self):
+        """Run eviction every 100 writes (caller holds the lock)"""
+        self._writes_since_eviction += 1
+        if self._writes_since_eviction >= 100:
+            self._evict_if_needed()
+
+    def _evict_if_needed(self):
+        """Drop least-recently-used entries until the cache is back under 90% of its budget"""
+        self._writes_since_eviction = 0
+        total_size = self._conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM extractions").fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+
+        target_size = int(self.max_size_bytes * 0.9)
+        evicted = 0
+        rows = self._conn.execute("SELECT sha256, size_bytes FROM extractions ORDER BY last_access ASC").fetchall()
+        for sha256, size_bytes in rows:
+            if total_size <= target_size:
+                break
+            self._conn.execute("DELETE FROM extractions WHERE sha256 = ?", (sha256,))
+            total_size -= size_bytes
+            evicted += 1
+        self._conn.commit()
+
+        self.counters['evictions'] += evicted
+        logger.info(f"🧹 Extraction cache evicted {evicted} entries ({total_size} bytes remaining)")
+
+    def evict(self):
+        """Force an eviction pass"""
+        with self._lock:
+            self._evict_if_needed()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus current cache size"""
+        with self._lock:
+            entries, size_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM extractions"
+            ).fetchone()
+
+        text_lookups = self.counters['text_hits'] + self.counters['text_misses']
+        metadata_lookups = self.counters['metadata_hits'] + self.counters['metadata_misses']
+        return {
+            **self.counters,
+            'text_hit_rate': self.counters['text_hits'] / text_lookups if text_lookups else 0.0,
+            'metadata_hit_rate': self.counters['metadata_hits'] / metadata_lookups if metadata_lookups else 0.0,
+            'entries': entries,
+            'size_bytes': size_bytes,
+            'max_size_bytes': self.max_size_bytes
+        }
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM extractions")
+            self._conn.commit()
+
+# Global instance
+extraction_cache = None
+
+def get_extraction_cache() -> ExtractionCache:
+    """Get or create the global extraction cache instance"""
+    global extraction_cache
+    if extraction_cache is None:
+        extraction_cache = ExtractionCache()
+    return extraction_cache
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+HNSW Index Settings
+Distance space and HNSW graph parameters for each vector database collection.
+Space, M and construction_ef are fixed when a collection is created (changing
+them needs a migration); search_ef can be changed in place
+"""
+
+import os
+import logging
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SUPPORTED_SPACES = ("cosine", "l2", "ip")
+
+# Settings that can only change by rebuilding the collection
+IMMUTABLE_SETTINGS = ("space", "max_neighbors", "ef_construction")
+
+
+@dataclass
+class HNSWConfig:
+    """HNSW settings; max_neighbors is hnsw:M"""
+    space: str = "cosine"  # only for new collections; existing ones keep their space until migrated
+    max_neighbors: int = 16
+    ef_construction: int = 100
+    ef_search: int = 100
+
+    def __post_init__(self):
+        if self.space not in SUPPORTED_SPACES:
+            raise ValueError(f"Unsupported distance space '{self.space}' (expected one of {', '.join(SUPPORTED_SPACES)})")
+
+    @classmethod
+    def from_env(cls, collection_key: str) -> 'HNSWConfig':
+        """
+        HR_HNSW_<SETTING> applies to every collection; HR_HNSW_<COLLECTION>_<SETTING>
+        (e.g. HR_HNSW_CANDIDATES_EF_SEARCH) overrides it for one collection
+        """
+        def setting(name: str, default):
+            value = (os.environ.get(f"HR_HNSW_{collection_key.upper()}_{name}")
+                     or os.environ.get(f"HR_HNSW_{name}"))
+            return type(default)(value.strip().lower()) if value else default
+
+        defaults = cls()
+        return cls(
+            space=setting("SPACE", defaults.space),
+            max_neighbors=setting("M", defaults.max_neighbors),
+            ef_construction=setting("EF_CONSTRUCTION", defaults.ef_construction),
+            ef_search=setting("EF_SEARCH", defaults.ef_search)
+        )
+
+    @classmethod
+    def from_collection(cls, collection) -> 'HNSWConfig':
+        """Settings an existing collection was built with"""
+        hnsw = (collection.configuration or {}).get('hnsw') or {}
+        defaults = cls(space="l2")  # ChromaDB's own defaults
+        return cls(
+            space=hnsw.get('space', defaults.space),
+            max_neighbors=hnsw.get('max_neighbors', defaults.max_neighbors),
+            ef_construction=hnsw.get('ef_construction', defaults.ef_construction),
+            ef_search=hnsw.get('ef_search', defaults.ef_search)
+        )
+
+    def to_chroma(self) -> Dict[str, Any]:
+        """ChromaDB collection configuration"""
+        return {'hnsw': asdict(self)}
+
+    def immutable_differences(self, other: 'HNSWConfig') -> List[str]:
+        """Creation-time settings that differ from another config, as readable strings"""
+        return [f"{name}: {getattr(other, name)} -> {getattr(self, name)}"
+                for name in IMMUTABLE_SETTINGS if getattr(self, name) != getattr(other, name)]
+
+
+def apply_hnsw_config(collection, config: HNSWConfig, collection_key: str) -> HNSWConfig:
+    """
+    Bring an opened collection in line with the configured settings where possible:
+    search_ef is updated in place; creation-time differences are reported for migration
+    Returns the settings the collection actually uses
+    """
+    current = HNSWConfig.from_collection(collection)
+    if current.ef_search != config.ef_search:
+        # Read when the index is loaded: applies unless this process already queried the collection
+        collection.modify(configuration={'hnsw': {'ef_search': config.ef_search}})
+        current.ef_search = config.ef_search
+
+    differences = config.immutable_differences(current)
+    if current.space != config.space:
+        # Scores still read the distances in the collection's own space, but ranking and
+        # thresholds were tuned for the configured one
+        logger.error(f"❌ Collection '{collection.name}' uses {current.space} distance, not the configured "
+                     f"{config.space}. Run: python manage_vectordb.py migrate-index --collection {collection_key} "
+                     f"--space {config.space} (entries are copied, nothing is re-embedded)")
+    elif differences:
+        logger.warning(f"⚠️  Collection '{collection.name}' was built with different HNSW settings "
+                       f"({'; '.join(differences)}). Run: python manage_vectordb.py migrate-index "
+                       f"--collection {collection_key} to rebuild it under the configured settings")
+    return current
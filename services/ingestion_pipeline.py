@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Bulk Resume Ingestion Pipeline
+Three stages: process-pool PDF extraction -> batched metadata extraction -> batched upserts
+Keeps a checkpoint file so an interrupted rebuild resumes where it stopped
+Also provides an incremental sync that only embeds new or changed resumes
+"""
+
+import os
+import json
+import time
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import List, Dict, Optional, Set, Tuple, Iterator
+
+from .enhanced_pdf_processor import enhanced_pdf_processor
+from .extraction_cache import ExtractionCache, get_extraction_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+
+
+def checkpoint_path_for(persist_directory: str) -> str:
+    """Checkpoint file kept next to (not inside) the vector database directory"""
+    return f"{persist_directory.rstrip('/').rstrip(os.sep)}_ingest_checkpoint.json"
+
+
+DEFAULT_CHECKPOINT_PATH = checkpoint_path_for("./hybrid_chroma_db")
+
+
+def _resolved(pdf_path) -> str:
+    """Canonical path string, so relative, absolute and symlinked spellings of one file compare equal"""
+    return str(Path(pdf_path).resolve())
+
+
+def _extract_pdf_worker(pdf_path: str) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+    """Process-pool worker: extract the full resume text from one PDF"""
+    try:
+        resume_text, processor = enhanced_pdf_processor.extract_resume_content_with_processor(pdf_path)
+        return pdf_path, resume_text, processor, None
+    except Exception as e:
+        return pdf_path, None, None, str(e)
+
+
+@dataclass
+class IngestionStats:
+    """Counters for one ingestion run"""
+    total_files: int = 0
+    resumed_skipped: int = 0
+    extracted: int = 0
+    cache_hits: int = 0
+    failed: int = 0
+    upserted: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+
+@dataclass
+class SyncPlan:
+    """Diff between the resumes folder and the candidates collection"""
+    new_files: List[Path] = field(default_factory=list)
+    modified_files: List[Path] = field(default_factory=list)
+    unchanged_files: List[Path] = field(default_factory=list)
+    # Stored candidate ids whose source PDF no longer exists
+    deleted_ids: List[str] = field(default_factory=list)
+    # Stored candidate ids per modified PDF path (replaced once re-ingested)
+    stale_ids: Dict[str, List[str]] = field(default_factory=dict)
+    # New size/mtime per candidate id whose PDF was touched without changing its bytes
+    file_stats: Dict[str, Dict] = field(default_factory=dict)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'new': len(self.new_files),
+            'modified': len(self.modified_files),
+            'unchanged': len(self.unchanged_files),
+            'deleted': len(self.deleted_ids)
+        }
+
+
+class IngestionCheckpoint:
+    """
+    JSON checkpoint of PDFs already handled by the pipeline
+    A file counts as done only while its size and mtime are unchanged
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self):
+        """Load checkpoint entries from disk"""
+        try:
+            if self.path.exists():
+                with open(self.path, 'r') as f:
+                    self.entries = json.load(f).get('files', {})
+                logger.info(f"⏩ Loaded ingestion checkpoint with {len(self.entries)} files from {self.path}")
+        except Exception as e:
+            logger.warning(f"⚠️  Could not read checkpoint {self.path}, starting over: {e}")
+            self.entries = {}
+
+    @staticmethod
+    def _fingerprint(pdf_file: Path) -> Dict:
+        stat = pdf_file.stat()
+        return {'size': int(stat.st_size), 'mtime': stat.st_mtime}
+
+    def is_done(self, pdf_file: Path) -> bool:
+        """Check whether a PDF was already ingested (or already failed) unchanged"""
+        entry = self.entries.get(str(pdf_file))
+        if not entry:
+            return False
+        try:
+            fingerprint = self._fingerprint(pdf_file)
+        except OSError:
+            return False
+        return entry['size'] == fingerprint['size'] and entry['mtime'] == fingerprint['mtime']
+
+    def mark(self, pdf_files: List[Path], status: str = 'ingested'):
+        """Record PDFs as handled and persist the checkpoint atomically"""
+        for pdf_file in pdf_files:
+            try:
+                self.entries[str(pdf_file)] = {**self._fingerprint(pdf_file), 'status': status}
+            except OSError:
+                continue
+        self.save()
+
+    def save(self):
+        """Write checkpoint via a temp file so a crash never leaves it half-written"""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'files': self.entries, 'updated_at': time.time()}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Remove the checkpoint after a completed run"""
+        self.entries = {}
+        if self.path.exists():
+            self.path.unlink()
+
+
+class ResumeIngestionPipeline:
+    """Parallel, resumable bulk ingestion for HybridVectorDB"""
+
+    def __init__(self, vector_db, workers: Optional[int] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 checkpoint_path: Optional[str] = DEFAULT_CHECKPOINT_PATH,
+                 cache: Optional[ExtractionCache] = None):
+        self.vector_db = vector_db
+        self.cache = cache if cache is not None else get_extraction_cache()
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.batch_size = max(1, batch_size)
+        # Bound extracted-but-not-yet-written texts held in memory
+        self.max_in_flight = self.batch_size * 2
+        # None disables checkpointing (sync is idempotent and does not need one)
+        self.checkpoint = IngestionCheckpoint(checkpoint_path) if checkpoint_path else None
+        self.written_ids: List[str] = []
+        # Resolved paths of the PDFs whose upsert succeeded
+        self.written_files: Set[str] = set()
+
+    def _extract(self, pdf_files: List[Path], stats: IngestionStats) -> Iterator[Tuple[Path, str, Optional[str], Optional[str]]]:
+        """
+        Stage 1: yield (pdf_file, sha256, resume_text, error)
+        Cached files are served from the extraction cache, the rest are parsed
+        in a process pool when more than one worker is configured
+        """
+        to_parse = []
+        for pdf_file in pdf_files:
+            try:
+                sha256 = self.cache.file_sha256(pdf_file)
+            except OSError as e:
+                yield pdf_file, '', None, str(e)
+                continue
+
+            cached = self.cache.get_text(sha256)
+            if cached is not None:
+                stats.cache_hits += 1
+                yield pdf_file, sha256, cached[0], None
+            else:
+                to_parse.append((pdf_file, sha256))
+
+        def _parsed(result, sha256):
+            pdf_path, resume_text, processor, error = result
+            if error is None and resume_text:
+                self.cache.put_text(sha256, resume_text, processor)
+            return Path(pdf_path), sha256, resume_text, error
+
+        if self.workers <= 1 or len(to_parse) <= 1:
+            for pdf_file, sha256 in to_parse:
+                yield _parsed(_extract_pdf_worker(str(pdf_file)), sha256)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            in_flight = deque()
+            for pdf_file, sha256 in to_parse:
+                in_flight.append((executor.submit(_extract_pdf_worker, str(pdf_file)), sha256))
+                if len(in_flight) >= self.max_in_flight:
+                    future, pending_sha = in_flight.popleft()
+                    yield _parsed(future.result(), pending_sha)
+            while in_flight:
+                future, pending_sha = in_flight.popleft()
+                yield _parsed(future.result(), pending_sha)
+
+    def _flush(self, batch: List[Tuple[Path, str, str]], failed: List[Path], stats: IngestionStats):
+        """Stages 2 + 3: batched metadata extraction, then one upsert for the batch"""
+        if batch:
+            # One batched NER pass for the resumes whose name the heading heuristic misses
+            metadata_objs = self.cache.extract_metadata_many([(sha256, text) for _, sha256, text in batch])
+
+            records = []
+            for (pdf_file, sha256, resume_text), metadata_obj in zip(batch, metadata_objs):
+                candidate_name = self.vector_db.candidate_name_from_filename(pdf_file)
+                metadata = self.vector_db.build_candidate_metadata(pdf_file, candidate_name, metadata_obj,
+                                                                   content_sha256=sha256)
+                records.append((candidate_name, resume_text, metadata))
+
+            self.written_ids.extend(self.vector_db.upsert_candidates(records))
+            self.written_files.update(_resolved(pdf_file) for pdf_file, _, _ in batch)
+            stats.upserted += len(records)
+            stats.batches += 1
+            if self.checkpoint is not None:
+                self.checkpoint.mark([pdf_file for pdf_file, _, _ in batch])
+
+        if failed and self.checkpoint is not None:
+            # Extraction is deterministic - do not retry unchanged broken files on resume
+            self.checkpoint.mark(failed, status='failed')
+
+        logger.info(f"📦 Batch {stats.batches}: {stats.upserted} upserted, {stats.failed} failed so far")
+
+    def run(self, resumes_dir) -> IngestionStats:
+        """Ingest every PDF in resumes_dir, skipping files recorded in the checkpoint"""
+        start_time = time.time()
+        stats = IngestionStats()
+
+        pdf_files = sorted(Path(resumes_dir).glob("*.pdf"))
+        stats.total_files = len(pdf_files)
+
+        if self.checkpoint is not None:
+            pending = [pdf_file for pdf_file in pdf_files if not self.checkpoint.is_done(pdf_file)]
+        else:
+            pending = pdf_files
+        stats.resumed_skipped = len(pdf_files) - len(pending)
+
+        logger.info(f"📄 Found {len(pdf_files)} PDF files in {resumes_dir}")
+        if stats.resumed_skipped:
+            logger.info(f"⏩ Resuming: skipping {stats.resumed_skipped} files already in checkpoint")
+
+        # Text indexes are rebuilt once, after the last batch (not per upsert)
+        with self.vector_db.write_batch():
+            self._ingest(pending, stats)
+
+        # Completed run - next rebuild starts from scratch
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+
+        stats.elapsed_seconds = time.time() - start_time
+        logger.info(f"✅ Ingestion complete: {asdict(stats)}")
+        logger.info(f"🗄️  Extraction cache: {self.cache.stats()}")
+        return stats
+
+    def _ingest(self, pending: List[Path], stats: IngestionStats):
+        """Extract, enrich and upsert the given PDFs in batches"""
+        logger.info(f"⚙️  Ingesting {len(pending)} files with {self.workers} worker(s), batch size {self.batch_size}")
+
+        batch: List[Tuple[Path, str, str]] = []
+        failed: List[Path] = []
+
+        for pdf_file, sha256, resume_text, error in self._extract(pending, stats):
+            if error or not resume_text or not resume_text.strip():
+                logger.warning(f"❌ Error reading PDF {pdf_file.name}: {error or 'no text extracted'}")
+                stats.failed += 1
+                failed.append(pdf_file)
+                continue
+
+            stats.extracted += 1
+            batch.append((pdf_file, sha256, resume_text))
+
+            if len(batch) >= self.batch_size:
+                self._flush(batch, failed, stats)
+                batch, failed = [], []
+
+        if batch or failed:
+            self._flush(batch, failed, stats)
+
+    def plan_sync(self, resumes_dir) -> SyncPlan:
+        """
+        Diff the resumes folder against stored candidate metadata (paths compared resolved)
+        Size + mtime short-circuit the check; otherwise the content hash decides, and a
+        file whose bytes did not change gets its new size + mtime recorded by sync
+        """
+        plan = SyncPlan()
+        pdf_files = sorted(Path(resumes_dir).glob("*.pdf"))
+        on_disk = {_resolved(pdf_file): pdf_file for pdf_file in pdf_files}
+
+        stored: Dict[str, List[Tuple[str, Dict]]] = {}
+        for unique_id, metadata in self.vector_db.get_all_candidate_metadata():
+            pdf_path = (metadata or {}).get('pdf_file_path', '')
+            stored.setdefault(_resolved(pdf_path) if pdf_path else '', []).append((unique_id, metadata or {}))
+
+        for pdf_path, entries in stored.items():
+            if pdf_path not in on_disk:
+                plan.deleted_ids.extend(unique_id for unique_id, _ in entries)
+
+        for pdf_path, pdf_file in on_disk.items():
+            entries = stored.get(pdf_path)
+            if not entries:
+                plan.new_files.append(pdf_file)
+                continue
+
+            stat = pdf_file.stat()
+            metadata = entries[0][1]
+            same_fingerprint = (metadata.get('file_size') == int(stat.st_size)
+                                and metadata.get('file_mtime') == float(stat.st_mtime))
+            if len(entries) == 1 and same_fingerprint:
+                plan.unchanged_files.append(pdf_file)
+                continue
+
+            # Touched or duplicated entries - only re-embed if the bytes actually changed
+            stored_sha = metadata.get('content_sha256')
+            if len(entries) == 1 and stored_sha and stored_sha == self.cache.file_sha256(pdf_file):
+                plan.unchanged_files.append(pdf_file)
+                # Record the new stat so the next sync takes the size + mtime short-circuit again
+                plan.file_stats[entries[0][0]] = {'file_size': int(stat.st_size), 'file_mtime': float(stat.st_mtime)}
+                continue
+
+            plan.modified_files.append(pdf_file)
+            plan.stale_ids[pdf_path] = [unique_id for unique_id, _ in entries]
+
+        return plan
+
+    def sync(self, resumes_dir, dry_run: bool = False) -> Tuple[SyncPlan, IngestionStats]:
+        """Bring the candidates collection in line with resumes_dir, touching only what changed"""
+        start_time = time.time()
+        stats = IngestionStats()
+
+        plan = self.plan_sync(resumes_dir)
+        stats.total_files = len(plan.new_files) + len(plan.modified_files) + len(plan.unchanged_files)
+        logger.info(f"🔄 Sync plan for {resumes_dir}: {plan.summary()}")
+
+        if dry_run:
+            return plan, stats
+
+        with self.vector_db.write_batch():
+            self.vector_db.delete_candidates(plan.deleted_ids)
+
+            self.vector_db.update_file_stats(plan.file_stats)
+
+            self.written_ids = []
+            self.written_files = set()
+            self._ingest(plan.new_files + plan.modified_files, stats)
+
+            # A modified resume can change its unique ID (e.g. a new email) - drop the old entry,
+            # but only once its replacement is stored (a file that failed to re-extract keeps it)
+            written = set(self.written_ids)
+            stale = [unique_id for pdf_path, ids in plan.stale_ids.items() if pdf_path in self.written_files
+                     for unique_id in ids if unique_id not in written]
+            self.vector_db.delete_candidates(stale)
+
+        stats.elapsed_seconds = time.time() - start_time
+        logger.info(f"✅ Sync complete: {asdict(stats)}")
+        return plan, stats
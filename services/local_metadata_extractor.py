@@ -7,13 +7,30 @@ Enhanced extraction using spaCy + regex patterns (no API calls needed)
 import re
 import logging
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 from dataclasses import dataclass
 
+from utils.keyword_matcher import KeywordMatcher
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Recorded on every ExtractedMetadata; the extraction cache re-extracts entries written by another method
+EXTRACTION_METHOD = "local_heuristic_spacy_ner"
+
+# Names are looked for in the opening characters; NER runs on that prefix only
+NAME_SEARCH_CHARS = 500
+DEFAULT_NER_BATCH_SIZE = 64
+
+# Words that make a heading line a section title or job title rather than a name
+NON_NAME_HEADING_WORDS = {
+    'resume', 'curriculum', 'vitae', 'cv', 'profile', 'summary', 'objective', 'contact',
+    'experience', 'education', 'skills', 'projects', 'certifications', 'references',
+    'engineer', 'developer', 'manager', 'analyst', 'consultant', 'designer', 'architect',
+    'specialist', 'scientist', 'intern', 'senior', 'junior', 'lead', 'software', 'data'
+}
+
 @dataclass
 class ExtractedMetadata:
     """Structured metadata extracted from resume"""
@@ -35,6 +52,7 @@ class LocalMetadataExtractor:
     
     def __init__(self):
         self.nlp = None
+        self.non_ner_pipes: List[str] = []
         self._initialize_nlp()
         self._initialize_patterns()
     
@@ -43,6 +61,8 @@ class LocalMetadataExtractor:
         try:
             import spacy
             self.nlp = spacy.load("en_core_web_sm")
+            # Only the entity recognizer is used; tagger, parser, lemmatizer etc. never run
+            self.non_ner_pipes = [name for name in self.nlp.pipe_names if name != "ner"]
             logger.info("✅ spaCy model loaded successfully")
         except Exception as e:
             logger.warning(f"⚠️  spaCy not available: {e}")
@@ -110,6 +130,11 @@ class LocalMetadataExtractor:
             ]
         }
         
+        # Single-pass scanner over every skill keyword (substring semantics)
+        self.skill_matcher = KeywordMatcher(
+            skill for skills in self.skill_keywords.values() for skill in skills
+        )
+        
         # Education levels
         self.education_patterns = {
             'PhD': r'(ph\.?d|doctorate|doctoral)',
@@ -131,14 +156,15 @@ class LocalMetadataExtractor:
             r'(cpa|certified\s*public\s*accountant)'
         ]
     
-    def extract_metadata(self, resume_text: str) -> ExtractedMetadata:
-        """Extract comprehensive metadata from resume text"""
+    def extract_metadata(self, resume_text: str, candidate_name: Optional[str] = None) -> ExtractedMetadata:
+        """Extract comprehensive metadata from resume text (candidate_name if already extracted)"""
         
         if not resume_text:
             return self._create_empty_metadata()
         
         # Extract basic information
-        candidate_name = self._extract_name(resume_text)
+        if candidate_name is None:
+            candidate_name = self._extract_name(resume_text)
         email = self._extract_email(resume_text)
         phone = self._extract_phone(resume_text)
         
@@ -177,23 +203,72 @@ class LocalMetadataExtractor:
             languages=languages,
             location=location,
             confidence_score=confidence_score,
-            extraction_method="local_spacy_regex"
+            extraction_method=EXTRACTION_METHOD
         )
     
+    def extract_metadata_many(self, texts: Sequence[str], batch_size: int = DEFAULT_NER_BATCH_SIZE,
+                              n_process: int = 1) -> List[ExtractedMetadata]:
+        """
+        extract_metadata for many resumes, with the same results
+        Names come from the heading heuristic where it succeeds; only the remaining
+        resumes go through spaCy, in one nlp.pipe call with every component but NER disabled
+        """
+        names = [self._name_from_heading(text) if text else "" for text in texts]
+        pending = [i for i, text in enumerate(texts) if text and not names[i]]
+        if pending:
+            for i, name in zip(pending, self._person_names([texts[i] for i in pending], batch_size, n_process)):
+                names[i] = name or self._name_from_lines(texts[i])
+        
+        return [self.extract_metadata(text, candidate_name=names[i]) if text else self._create_empty_metadata()
+                for i, text in enumerate(texts)]
+    
     def _extract_name(self, text: str) -> str:
         """Extract candidate name using multiple strategies"""
         
-        # Strategy 1: Use spaCy NER if available
-        if self.nlp:
-            try:
-                doc = self.nlp(text[:500])  # First 500 chars for name
-                for ent in doc.ents:
-                    if ent.label_ == "PERSON" and len(ent.text.split()) >= 2:
-                        return ent.text.strip()
-            except Exception:
-                pass
-        
-        # Strategy 2: Look for name patterns at the beginning
+        # Strategy 1: A name-like heading line (no model needed)
+        name = self._name_from_heading(text)
+        if name:
+            return name
+        
+        # Strategy 2: spaCy NER if available
+        name = self._person_names([text])[0]
+        if name:
+            return name
+        
+        # Strategy 3: Look for name patterns at the beginning
+        return self._name_from_lines(text)
+    
+    def _name_from_heading(self, text: str) -> str:
+        """The first non-empty line when it is 2-4 capitalized words that are not a section or job title"""
+        for line in text[:NAME_SEARCH_CHARS].split('\n'):
+            line = line.split('|')[0].strip()
+            if not line:
+                continue
+            words = line.split()
+            if (2 <= len(words) <= 4 and
+                    all(re.fullmatch(r"[A-Z][A-Za-z'.-]*", word) for word in words) and
+                    not any(word.lower().strip('.') in NON_NAME_HEADING_WORDS for word in words)):
+                return line
+            return ""
+        return ""
+    
+    def _person_names(self, texts: Sequence[str], batch_size: int = DEFAULT_NER_BATCH_SIZE,
+                      n_process: int = 1) -> List[str]:
+        """First multi-word PERSON entity in each text's opening characters ("" when none or no spaCy)"""
+        if not self.nlp:
+            return [""] * len(texts)
+        try:
+            docs = self.nlp.pipe((text[:NAME_SEARCH_CHARS] for text in texts), disable=self.non_ner_pipes,
+                                 batch_size=batch_size, n_process=n_process)
+            return [next((ent.text.strip() for ent in doc.ents
+                          if ent.label_ == "PERSON" and len(ent.text.split()) >= 2), "")
+                    for doc in docs]
+        except Exception as e:
+            logger.warning(f"⚠️  spaCy name extraction failed: {e}")
+            return [""] * len(texts)
+    
+    def _name_from_lines(self, text: str) -> str:
+        """Fallback: any name-like line among the first five"""
         lines = text.split('\n')[:5]  # First 5 lines
         
         for line in lines:
@@ -262,13 +337,14 @@ class LocalMetadataExtractor:
         found_skills = []
         domains = set()
         
-        text_lower = text.lower()
+        # One scan of the resume finds every keyword
+        keyword_hits = self.skill_matcher.find_keywords(text)
         
         # Extract skills by category
         for domain, skills in self.skill_keywords.items():
             domain_skills = []
             for skill in skills:
-                if skill.lower() in text_lower:
+                if skill.lower() in keyword_hits:
                     found_skills.append(skill)
                     domain_skills.append(skill)
             
@@ -383,7 +459,7 @@ class LocalMetadataExtractor:
             languages=[],
             location="",
             confidence_score=0.0,
-            extraction_method="local_spacy_regex"
+            extraction_method=EXTRACTION_METHOD
         )
 
 # Global instance
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Versioned Result Cache
+A monotonically increasing collection version, shared by every process through
+a small file next to the vector database, plus an LRU cache whose entries are
+only served while the version they were computed at is still current
+"""
+
+import os
+import re
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_CACHE_ENTRIES = 256
+
+
+def collection_version_path_for(persist_directory: str) -> str:
+    """Version file kept next to (not inside) the vector database directory, so a rebuild keeps counting up"""
+    return f"{persist_directory.rstrip('/')}_collection_version"
+
+
+def normalize_request_text(text: str) -> str:
+    """
+    Collapse spaces and drop blank lines so trivially different requests share a cache entry
+    Line breaks are kept because request parsing is line based (e.g. 'Required Skills:' lines)
+    """
+    lines = (re.sub(r'[ \t]+', ' ', line).strip() for line in (text or '').splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+class CollectionVersion:
+    """Integer version of the candidates collection, bumped on every write"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def get(self) -> int:
+        """Current version (0 when nothing was ever written)"""
+        try:
+            with open(self.path, 'r') as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def bump(self) -> int:
+        """Increment the version and return the new value (atomic replace, visible to other processes)"""
+        with self._lock:
+            version = self.get() + 1
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'w') as f:
+                    f.write(str(version))
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"⚠️  Could not persist collection version to {self.path}: {e}")
+            return version
+
+
+class VersionedResultCache:
+    """LRU cache of computed results tagged with the collection version they were computed at"""
+
+    def __init__(self, max_entries: int = DEFAULT_RESULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Tuple[Hashable, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'stale': 0}
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[Any]:
+        """Cached value for key if it was computed at this version, else None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.counters['misses'] += 1
+                return None
+            if entry[0] != version:
+                del self._entries[key]
+                self.counters['stale'] += 1
+                self.counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters['hits'] += 1
+            return entry[1]
+
+    def put(self, key: Hashable, version: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+            entries = len(self._entries)
+        lookups = counters['hits'] + counters['misses']
+        return {**counters, 'entries': entries, 'hit_rate': counters['hits'] / lookups if lookups else 0.0}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
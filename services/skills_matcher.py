@@ -5,11 +5,22 @@ Provides intelligent skills-based filtering and scoring for candidates
 
 import re
 import logging
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Set, Tuple, Optional
 from difflib import SequenceMatcher
+from functools import lru_cache
+
+from utils.keyword_matcher import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
+# Bump when skill_synonyms change so precomputed canonical skills are ignored
+CANONICAL_SKILLS_VERSION = 1
+
+@lru_cache(maxsize=65536)
+def _skill_similarity(skill1: str, skill2: str) -> float:
+    """Cached string similarity - skill vocabularies are small, so pairs repeat across candidates"""
+    return SequenceMatcher(None, skill1, skill2).ratio()
+
 class SkillsMatcher:
     """Advanced skills matching and filtering system"""
     
@@ -68,6 +79,19 @@ class SkillsMatcher:
             'data_science': ['python', 'r', 'pandas', 'numpy', 'tensorflow', 'pytorch', 'scikit-learn'],
             'devops': ['docker', 'kubernetes', 'jenkins', 'terraform', 'ansible', 'git']
         }
+        
+        # Single-pass scanner over every synonym (word-boundary semantics)
+        self._synonym_to_canonicals: Dict[str, Set[str]] = {}
+        for canonical, synonyms in self.skill_synonyms.items():
+            for synonym in synonyms:
+                self._synonym_to_canonicals.setdefault(synonym.lower(), set()).add(canonical)
+        self.synonym_matcher = KeywordMatcher(self._synonym_to_canonicals, word_boundaries=True)
+        
+        # Reverse index: skill -> categories it belongs to
+        self._skill_to_categories: Dict[str, Set[str]] = {}
+        for category, skills in self.skill_categories.items():
+            for skill in skills:
+                self._skill_to_categories.setdefault(skill, set()).add(category)
     
     def normalize_skill(self, skill: str) -> str:
         """Normalize a skill name to its canonical form"""
@@ -88,20 +112,37 @@ class SkillsMatcher:
         if not text:
             return set()
         
-        text_lower = text.lower()
         found_skills = set()
         
-        # Check for each skill and its synonyms
-        for canonical_skill, synonyms in self.skill_synonyms.items():
-            for synonym in synonyms:
-                # Use word boundaries to avoid partial matches
-                pattern = r'\b' + re.escape(synonym) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_skills.add(canonical_skill)
-                    break
+        # One word-boundary scan finds every synonym of every skill
+        for synonym in self.synonym_matcher.find_keywords(text):
+            found_skills.update(self._synonym_to_canonicals[synonym])
         
         return found_skills
     
+    def compute_canonical_skills(self, metadata_skills: str, resume_text: str) -> Set[str]:
+        """
+        Canonical skill set for a candidate: normalized metadata skills plus skills found in the text
+        Computed once at ingest time and stored as 'canonical_skills' metadata
+        """
+        candidate_skills = {self.normalize_skill(skill) for skill in (metadata_skills or '').split(',') if skill.strip()}
+        candidate_skills.update(self.extract_skills_from_text(resume_text))
+        return candidate_skills
+    
+    def canonical_skills_metadata(self, metadata_skills: str, resume_text: str) -> Dict[str, object]:
+        """ChromaDB-compatible metadata fields holding the precomputed canonical skills"""
+        return {
+            'canonical_skills': ','.join(sorted(self.compute_canonical_skills(metadata_skills, resume_text))),
+            'canonical_skills_version': CANONICAL_SKILLS_VERSION
+        }
+    
+    def get_precomputed_skills(self, metadata: Dict) -> Optional[Set[str]]:
+        """Precomputed canonical skills from metadata, or None for legacy/stale entries"""
+        if metadata.get('canonical_skills_version') != CANONICAL_SKILLS_VERSION:
+            return None
+        canonical_skills = metadata.get('canonical_skills', '')
+        return set(canonical_skills.split(',')) if canonical_skills else set()
+    
     def calculate_skills_match_score(self, required_skills: List[str], candidate_skills: Set[str], 
                                    candidate_content: str = "") -> Dict[str, float]:
         """Calculate detailed skills matching score"""
@@ -173,7 +214,7 @@ class SkillsMatcher:
         
         for candidate_skill in candidate_skills:
             # Check string similarity
-            similarity = SequenceMatcher(None, required_skill, candidate_skill).ratio()
+            similarity = _skill_similarity(required_skill, candidate_skill)
             if similarity > best_score:
                 best_match = candidate_skill
                 best_score = similarity
@@ -195,25 +236,21 @@ class SkillsMatcher:
     
     def _skills_in_same_category(self, skill1: str, skill2: str) -> bool:
         """Check if two skills are in the same category"""
-        for category, skills in self.skill_categories.items():
-            if skill1 in skills and skill2 in skills:
-                return True
-        return False
+        categories = self._skill_to_categories.get(skill1)
+        return bool(categories and categories & self._skill_to_categories.get(skill2, set()))
     
-    def filter_candidates_by_skills(self, candidates: List[Dict], required_skills: List[str], 
-                                  min_match_threshold: float = 0.3) -> List[Dict]:
-        """Filter candidates based on skills matching threshold"""
+    def analyze_candidate(self, candidate: Dict, required_skills: List[str]) -> Dict:
+        """Skills match analysis for one candidate, also stored as candidate['skills_analysis']"""
+        metadata = candidate.get('metadata', {})
         
-        if not required_skills:
-            return candidates
+        # Fast path: canonical skills precomputed at ingest time
+        candidate_skills = self.get_precomputed_skills(metadata)
         
-        filtered_candidates = []
-        
-        for candidate in candidates:
-            metadata = candidate.get('metadata', {})
+        if candidate_skills is not None:
+            skills_analysis = self.calculate_skills_match_score(required_skills, candidate_skills)
+        else:
+            # Legacy entry: parse metadata skills and scan the resume text
             content = candidate.get('content', '')
-            
-            # Extract candidate skills
             candidate_skills_text = metadata.get('skills', '')
             candidate_skills = set()
             
@@ -226,9 +263,22 @@ class SkillsMatcher:
             skills_analysis = self.calculate_skills_match_score(
                 required_skills, candidate_skills, content
             )
-            
-            # Add skills analysis to candidate data
-            candidate['skills_analysis'] = skills_analysis
+        
+        # Add skills analysis to candidate data
+        candidate['skills_analysis'] = skills_analysis
+        return skills_analysis
+    
+    def filter_candidates_by_skills(self, candidates: List[Dict], required_skills: List[str], 
+                                  min_match_threshold: float = 0.3) -> List[Dict]:
+        """Filter candidates based on skills matching threshold"""
+        
+        if not required_skills:
+            return candidates
+        
+        filtered_candidates = []
+        
+        for candidate in candidates:
+            skills_analysis = self.analyze_candidate(candidate, required_skills)
             
             # Filter based on threshold
             if skills_analysis['match_score'] >= min_match_threshold:
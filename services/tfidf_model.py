@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Corpus TF-IDF Model
+One TF-IDF vocabulary and IDF fitted over the whole resume corpus at ingest,
+saved next to the vector database together with every resume's sparse TF-IDF
+vector (CSR arrays memory-mapped at load), so candidate evaluation scores a
+job description against all shortlisted resumes with one sparse mat-vec
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bump when the vectorizer settings or the on-disk layout change so old models are rebuilt
+TFIDF_MODEL_VERSION = 1
+
+# Same analyzer the evaluator always used; the vocabulary cap is sized for a corpus instead of two documents
+VECTORIZER_SETTINGS = {
+    'stop_words': 'english',
+    'ngram_range': (1, 2),
+    'lowercase': True
+}
+DEFAULT_MAX_FEATURES = 50000
+
+
+def tfidf_model_path_for(persist_directory: str) -> str:
+    """Model directory kept next to (not inside) the vector database directory"""
+    return f"{persist_directory.rstrip('/')}_tfidf"
+
+
+class CorpusTfidfModel:
+    """
+    Fitted vectorizer plus the L2-normalized TF-IDF matrix of the corpus
+    (row i is doc_ids[i]), so cosine similarity is a dot product
+    """
+
+    def __init__(self, doc_ids: List[str], vectorizer: TfidfVectorizer, matrix: sparse.csr_matrix,
+                 collection_version: int = 0):
+        self.doc_ids = doc_ids
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        self.collection_version = collection_version
+        self.doc_rows = {doc_id: row for row, doc_id in enumerate(doc_ids)}
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[str, str]], collection_version: int = 0,
+              max_features: int = DEFAULT_MAX_FEATURES) -> Optional['CorpusTfidfModel']:
+        """Fit on (doc_id, text) pairs; None when the corpus has no usable terms"""
+        doc_ids: List[str] = []
+        texts: List[str] = []
+        for doc_id, text in documents:
+            doc_ids.append(doc_id)
+            texts.append(text or '')
+
+        vectorizer = TfidfVectorizer(max_features=max_features, **VECTORIZER_SETTINGS)
+        try:
+            matrix = vectorizer.fit_transform(texts)
+        except ValueError:
+            # Empty corpus or only stop words
+            return None
+        return cls(doc_ids, vectorizer, matrix.tocsr().astype(np.float32), collection_version)
+
+    def save(self, model_dir: str):
+        """Write the CSR arrays and IDF, then the manifest; each file is replaced atomically"""
+        path = Path(model_dir)
+        path.mkdir(parents=True, exist_ok=True)
+
+        for name, array in (('data', self.matrix.data),
+                            ('indices', self.matrix.indices),
+                            ('indptr', self.matrix.indptr),
+                            ('idf', self.vectorizer.idf_)):
+            tmp_file = path / f"{name}.tmp.npy"
+            np.save(tmp_file, np.ascontiguousarray(array))
+            os.replace(tmp_file, path / f"{name}.npy")
+
+        manifest = {
+            'model_version': TFIDF_MODEL_VERSION,
+            'collection_version': self.collection_version,
+            'max_features': self.vectorizer.max_features,
+            'shape': list(self.matrix.shape),
+            'doc_ids': self.doc_ids,
+            'vocabulary': {term: int(column) for term, column in self.vectorizer.vocabulary_.items()}
+        }
+        tmp_manifest = path / "manifest.tmp.json"
+        with open(tmp_manifest, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_manifest, path / "manifest.json")
+
+    @classmethod
+    def load(cls, model_dir: str) -> Optional['CorpusTfidfModel']:
+        """Load a saved model with memory-mapped resume vectors; None if missing or from an older layout"""
+        path = Path(model_dir)
+        try:
+            with open(path / "manifest.json") as f:
+                manifest = json.load(f)
+            if manifest.get('model_version') != TFIDF_MODEL_VERSION:
+                return None
+
+            vectorizer = TfidfVectorizer(max_features=manifest['max_features'],
+                                         vocabulary=manifest['vocabulary'], **VECTORIZER_SETTINGS)
+            vectorizer.idf_ = np.load(path / "idf.npy")
+            matrix = sparse.csr_matrix(
+                (np.load(path / "data.npy", mmap_mode='r'),
+                 np.load(path / "indices.npy", mmap_mode='r'),
+                 np.load(path / "indptr.npy", mmap_mode='r')),
+                shape=tuple(manifest['shape']), copy=False
+            )
+            return cls(manifest['doc_ids'], vectorizer, matrix, manifest.get('collection_version', 0))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️  Could not load TF-IDF model from {model_dir}: {e}")
+            return None
+
+    def transform(self, texts: List[str]) -> sparse.csr_matrix:
+        """L2-normalized TF-IDF vectors under the corpus vocabulary and IDF"""
+        return self.vectorizer.transform(texts)
+
+    def similarities(self, query: str, doc_ids: List[Optional[str]],
+                     texts: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Cosine similarity of the query to each document: stored vectors are gathered
+        and scored in one sparse mat-vec; ids not in the corpus fall back to
+        vectorizing the matching entry of texts (0.0 without text)
+        """
+        scores = np.zeros(len(doc_ids), dtype=np.float64)
+        if not doc_ids:
+            return scores
+        query_vector = self.transform([query]).T.tocsc()
+
+        positions = [i for i, doc_id in enumerate(doc_ids) if doc_id in self.doc_rows]
+        if positions:
+            rows = self.matrix[[self.doc_rows[doc_ids[i]] for i in positions]]
+            scores[positions] = (rows @ query_vector).toarray().ravel()
+
+        missing = [i for i, doc_id in enumerate(doc_ids) if doc_id not in self.doc_rows and texts and texts[i]]
+        if missing:
+            vectors = self.transform([texts[i] for i in missing])
+            scores[missing] = (vectors @ query_vector).toarray().ravel()
+        return scores
@@ -1,27 +1,77 @@
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import os
+import re
+import threading
+import numpy as np
+from contextlib import contextmanager
 from pathlib import Path
 
 # Import hybrid components
 from .enhanced_pdf_processor import enhanced_pdf_processor
 from .local_metadata_extractor import local_metadata_extractor
+from .embedding_provider import EmbeddingConfig, create_embedding_function, open_collection
+from .hnsw_config import HNSWConfig, apply_hnsw_config
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Filter operators accepted by search_candidates -> ChromaDB operators
+FILTER_OPERATORS = {
+    '>=': '$gte', '<=': '$lte', '>': '$gt', '<': '$lt',
+    '==': '$eq', '!=': '$ne', 'in': '$in', 'not in': '$nin'
+}
+
+# Ordered education levels so range filters can run inside the index
+EDUCATION_RANKS = {
+    '': 0,
+    'High School': 1,
+    'Associates': 2,
+    'Bachelors': 3,
+    'Masters': 4,
+    'PhD': 5
+}
+
+# Leading resume text stored as metadata so listings never need the full document
+SNIPPET_LENGTH = 200
+
+# Terms whose presence in the resume text is recorded at ingest (the shortlist's tech boost)
+CONTENT_MENTION_TERMS = ('react', 'javascript', 'frontend', 'python', 'java')
+
+# Collection key -> (ChromaDB name, description)
+COLLECTION_SPECS = {
+    # Candidates collection (no chunking - whole resumes)
+    "candidates": ("candidates_hybrid", "Candidate resumes - no chunking, unique IDs"),
+    "job_descriptions": ("job_descriptions_hybrid", "Job descriptions"),
+    "interview_questions": ("interview_questions_hybrid", "Interview questions")
+}
+
 class HybridVectorDB:
     """
     Hybrid Vector Database with No-Chunking Strategy
     Uses unique candidate IDs to eliminate duplicates
     """
     
-    def __init__(self, persist_directory: str = "./hybrid_chroma_db"):
+    def __init__(self, persist_directory: str = "./hybrid_chroma_db", query_cache_size: int = 1024,
+                 persist_query_cache: bool = True, embedding_config: Optional[EmbeddingConfig] = None,
+                 hnsw_configs: Optional[Dict[str, HNSWConfig]] = None):
         """Initialize hybrid vector database"""
         self.persist_directory = persist_directory
+        self.embedding_config = embedding_config or EmbeddingConfig.from_env()
+        self.embedding_function = create_embedding_function(self.embedding_config)
+        # Embedding function per collection key (ChromaDB's built-in one when none is configured)
+        query_embedding_function = self.embedding_function or DefaultEmbeddingFunction()
+        self.embedding_functions = {key: query_embedding_function for key in COLLECTION_SPECS}
+        # Configured HNSW settings per collection key, and what each collection actually uses
+        self.hnsw_configs = {key: (hnsw_configs or {}).get(key) or HNSWConfig.from_env(key)
+                             for key in COLLECTION_SPECS}
+        self.index_settings: Dict[str, HNSWConfig] = {}
+        self.query_cache_size = query_cache_size
+        self.persist_query_cache = persist_query_cache
         
         # Initialize ChromaDB with persistence
         self.client = chromadb.PersistentClient(
@@ -36,30 +86,141 @@ class HybridVectorDB:
         self.collections = {}
         self._initialize_collections()
         
+        # Near-duplicate cluster index, built lazily from stored metadata
+        self._duplicate_clusters = None
+        
+        # Query embedding caches per collection key, built lazily
+        self._query_caches = {}
+        
+        # Version of the candidates collection, bumped on every write (shared across processes)
+        from .result_cache import CollectionVersion, collection_version_path_for
+        self._collection_version = CollectionVersion(collection_version_path_for(persist_directory))
+        
+        # BM25 lexical index for hybrid search and corpus TF-IDF model, rebuilt at the end of
+        # every write batch; searches never refit them, they serve the last saved ones if stale
+        self._bm25_index = None
+        self._tfidf_model = None  # (collection version, model or None)
+        self._write_batch_depth = 0
+        self._text_indexes_dirty = False
+        self._text_index_lock = threading.Lock()
+        self._background_rebuild_lock = threading.Lock()
+        self._background_rebuild = None
+        
         logger.info(f"✅ Hybrid Vector Database initialized at {persist_directory}")
     
     def _initialize_collections(self):
-        """Initialize ChromaDB collections"""
+        """Initialize ChromaDB collections (refuses collections embedded with a different model)"""
+        model_id = self.embedding_config.model_id
         
-        # Candidates collection (no chunking - whole resumes)
-        self.collections["candidates"] = self.client.get_or_create_collection(
-            name="candidates_hybrid",
-            metadata={"description": "Candidate resumes - no chunking, unique IDs"}
-        )
+        for key, (name, description) in COLLECTION_SPECS.items():
+            self._recover_interrupted_migration(name)
+            self.collections[key] = open_collection(self.client, name, description, self.embedding_function,
+                                                    model_id, configuration=self.hnsw_configs[key].to_chroma())
+            self.index_settings[key] = apply_hnsw_config(self.collections[key], self.hnsw_configs[key], key)
         
-        # Job descriptions collection
-        self.collections["job_descriptions"] = self.client.get_or_create_collection(
-            name="job_descriptions_hybrid",
-            metadata={"description": "Job descriptions"}
-        )
+        logger.info(f"✅ Collections initialized (embedding model: {model_id})")
+    
+    def distance_space(self, collection_key: str = "candidates") -> str:
+        """Distance space the collection's query distances are in"""
+        return HNSWConfig.from_collection(self.collections[collection_key]).space
+    
+    def pending_migrations(self) -> Dict[str, List[str]]:
+        """Collection key -> creation-time settings that differ from the configured ones (migrate-index fixes them)"""
+        pending = {}
+        for key, config in self.hnsw_configs.items():
+            differences = config.immutable_differences(self.index_settings[key])
+            if differences:
+                pending[key] = differences
+        return pending
+    
+    @staticmethod
+    def _migration_name(name: str) -> str:
+        return f"{name}_migrating"
+    
+    def _collection_names(self) -> List[str]:
+        return [collection if isinstance(collection, str) else collection.name
+                for collection in self.client.list_collections()]
+    
+    def _recover_interrupted_migration(self, name: str):
+        """Finish a migration that stopped after dropping the old collection but before the rename"""
+        names = self._collection_names()
+        temp_name = self._migration_name(name)
+        if temp_name in names and name not in names:
+            logger.warning(f"⚠️  Completing interrupted index migration of '{name}'")
+            self.client.get_collection(temp_name).modify(name=name)
+    
+    def migrate_collection(self, collection_key: str = "candidates", hnsw_config: Optional[HNSWConfig] = None,
+                           batch_size: int = 500) -> Dict[str, Any]:
+        """
+        Rebuild a collection under new HNSW settings (space, M, construction/search ef)
+        Stored embeddings are copied as-is, so nothing is re-embedded; the new index is
+        filled under a temporary name and swapped in only once every entry has been copied
+        """
+        import time
+        
+        hnsw_config = hnsw_config or self.hnsw_configs[collection_key]
+        name, description = COLLECTION_SPECS[collection_key]
+        temp_name = self._migration_name(name)
+        old = self.collections[collection_key]
+        previous = self.index_settings.get(collection_key) or HNSWConfig.from_collection(old)
+        start_time = time.time()
+        
+        if not hnsw_config.immutable_differences(previous):
+            # search_ef alone can change in place
+            self.index_settings[collection_key] = apply_hnsw_config(old, hnsw_config, collection_key)
+            self.hnsw_configs[collection_key] = hnsw_config
+            return {'collection': name, 'entries': 0, 'previous': previous,
+                    'current': self.index_settings[collection_key], 'elapsed_seconds': time.time() - start_time}
         
-        # Interview questions collection
-        self.collections["interview_questions"] = self.client.get_or_create_collection(
-            name="interview_questions_hybrid",
-            metadata={"description": "Interview questions"}
+        # Leftovers of an earlier interrupted run are rebuilt from scratch
+        if temp_name in self._collection_names():
+            self.client.delete_collection(temp_name)
+        
+        collection_kwargs = {"embedding_function": self.embedding_function} if self.embedding_function is not None else {}
+        new = self.client.create_collection(
+            name=temp_name,
+            metadata={key: value for key, value in (old.metadata or {}).items() if not key.startswith('hnsw:')},
+            configuration=hnsw_config.to_chroma(),
+            **collection_kwargs
         )
         
-        logger.info("✅ Collections initialized")
+        copied = 0
+        offset = 0
+        while True:
+            page = old.get(include=['documents', 'metadatas', 'embeddings'], limit=batch_size, offset=offset)
+            if not page['ids']:
+                break
+            new.add(ids=page['ids'], documents=page['documents'], metadatas=page['metadatas'],
+                    embeddings=page['embeddings'])
+            copied += len(page['ids'])
+            offset += len(page['ids'])
+            logger.info(f"📦 Migrating '{name}': {copied} entries copied")
+            if len(page['ids']) < batch_size:
+                break
+        
+        if new.count() != old.count():
+            self.client.delete_collection(temp_name)
+            raise RuntimeError(f"Migration of '{name}' copied {new.count()} of {old.count()} entries - aborted, "
+                               f"original collection left untouched")
+        
+        self.client.delete_collection(name)
+        new.modify(name=name)
+        self.collections[collection_key] = self.client.get_collection(name, **collection_kwargs)
+        self.index_settings[collection_key] = HNSWConfig.from_collection(self.collections[collection_key])
+        self.hnsw_configs[collection_key] = hnsw_config
+        if collection_key == "candidates":
+            # Distances changed, so cached shortlists are stale
+            self._candidates_written()
+        
+        elapsed = time.time() - start_time
+        logger.info(f"✅ Migrated '{name}' ({copied} entries) to {hnsw_config} in {elapsed:.1f}s")
+        return {
+            'collection': name,
+            'entries': copied,
+            'previous': previous,
+            'current': self.index_settings[collection_key],
+            'elapsed_seconds': elapsed
+        }
     
     def generate_unique_id(self, pdf_content: str, metadata: Dict[str, Any], pdf_filename: str) -> str:
         """Generate unique candidate ID"""
@@ -74,17 +235,12 @@ class HybridVectorDB:
         
         return f"candidate_{content_hash}_{meta_hash}_{file_hash}"
     
-    def add_resume(self, candidate_name: str, resume_text: str, metadata: Dict[str, Any]):
-        """
-        Add resume to vector database (NO CHUNKING)
-        Each resume is stored as a single entry with unique ID
-        """
-        
-        # Generate unique candidate ID
+    def _prepare_candidate_record(self, candidate_name: str, resume_text: str,
+                                  metadata: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Generate the unique ID and enhanced metadata stored with a resume"""
         pdf_filename = metadata.get('pdf_filename', 'unknown.pdf')
         unique_id = self.generate_unique_id(resume_text, metadata, pdf_filename)
         
-        # Enhanced metadata with unique ID
         enhanced_metadata = {
             **metadata,
             'unique_id': unique_id,
@@ -92,6 +248,106 @@ class HybridVectorDB:
             'processing_method': 'hybrid_no_chunking'
         }
         
+        # Filterable fields (domain flags, education rank) for where-clause pushdown
+        enhanced_metadata.update(self.filter_metadata(enhanced_metadata))
+        
+        # Snippet and term mentions, so searches can skip loading the document
+        enhanced_metadata.update(self.content_metadata(resume_text))
+        
+        # Canonical skills extracted once, at ingest time
+        from .skills_matcher import skills_matcher
+        enhanced_metadata.update(skills_matcher.canonical_skills_metadata(metadata.get('skills', ''), resume_text))
+        
+        # Near-duplicate cluster assigned once, at ingest time
+        cluster_id, signature = self.get_duplicate_clusters().assign(unique_id, resume_text, enhanced_metadata)
+        enhanced_metadata['dup_cluster_id'] = cluster_id
+        enhanced_metadata['minhash_signature'] = signature
+        return unique_id, enhanced_metadata
+    
+    @staticmethod
+    def content_metadata(resume_text: str) -> Dict[str, Any]:
+        """Document-derived fields stored as metadata: display snippet and content term mentions"""
+        content_lower = (resume_text or '').lower()
+        return {
+            'snippet': (resume_text or '')[:SNIPPET_LENGTH],
+            'content_mentions': ','.join(term for term in CONTENT_MENTION_TERMS if term in content_lower)
+        }
+    
+    @staticmethod
+    def domain_flag_key(domain: str) -> str:
+        """Metadata key of the boolean flag for one domain, e.g. 'Web Frontend' -> 'domain_web_frontend'"""
+        return 'domain_' + re.sub(r'[^a-z0-9]+', '_', domain.lower()).strip('_')
+    
+    @classmethod
+    def filter_metadata(cls, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Scalar fields that let domain and education filters run inside ChromaDB
+        (metadata values cannot be lists and strings cannot be substring-filtered)
+        """
+        fields = {'education_rank': EDUCATION_RANKS.get(metadata.get('education_level') or '', 0)}
+        domains = metadata.get('domains') or ''
+        for domain in (domains.split(',') if isinstance(domains, str) else domains):
+            if domain.strip():
+                fields[cls.domain_flag_key(domain.strip())] = True
+        return fields
+    
+    def get_duplicate_clusters(self):
+        """Get the near-duplicate cluster index, seeding it from the collection on first use"""
+        if self._duplicate_clusters is None:
+            from .duplicate_clusters import DuplicateClusterIndex
+            self._duplicate_clusters = DuplicateClusterIndex.from_metadata(self.get_all_candidate_metadata())
+        return self._duplicate_clusters
+    
+    def duplicate_cluster_report(self) -> Dict[str, Any]:
+        """Report the near-duplicate cluster structure across all stored candidates"""
+        from .duplicate_clusters import build_cluster_report
+        return build_cluster_report(self.get_all_candidate_metadata())
+    
+    def collection_version(self) -> int:
+        """Current candidates collection version; cached results computed at an older version are stale"""
+        return self._collection_version.get()
+    
+    def bump_collection_version(self) -> int:
+        """Mark the candidates collection as changed"""
+        return self._collection_version.bump()
+    
+    @contextmanager
+    def write_batch(self):
+        """Group writes so the BM25 index and TF-IDF model are rebuilt once, when the block exits"""
+        self._write_batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._write_batch_depth -= 1
+            if self._write_batch_depth == 0 and self._text_indexes_dirty:
+                self._refresh_text_indexes()
+    
+    def _candidates_written(self):
+        """
+        Bump the version after a write and mark the text indexes stale: a write batch rebuilds
+        them when it ends, a single write in the background (O(corpus), kept off the request path)
+        """
+        self.bump_collection_version()
+        self._text_indexes_dirty = True
+        if self._write_batch_depth == 0:
+            self._rebuild_text_indexes_in_background()
+    
+    def _refresh_text_indexes(self):
+        """Rebuild the text indexes; a failure leaves searches on the last saved ones"""
+        try:
+            self.rebuild_text_indexes()
+        except Exception as e:
+            logger.error(f"❌ Could not rebuild BM25 / TF-IDF indexes, searches keep the last saved ones: {e}")
+    
+    def add_resume(self, candidate_name: str, resume_text: str, metadata: Dict[str, Any]):
+        """
+        Add resume to vector database (NO CHUNKING)
+        Each resume is stored as a single entry with unique ID
+        """
+        
+        # Generate unique candidate ID and enhanced metadata
+        unique_id, enhanced_metadata = self._prepare_candidate_record(candidate_name, resume_text, metadata)
+        
         try:
             # Check if candidate already exists
             existing = self._get_candidate_by_id(unique_id)
@@ -106,6 +362,33 @@ class HybridVectorDB:
             logger.error(f"❌ Error adding resume for {candidate_name}: {e}")
             raise
     
+    def upsert_candidates(self, records: List[Tuple[str, str, Dict[str, Any]]]) -> List[str]:
+        """
+        Add or update a batch of resumes in one round-trip (NO CHUNKING)
+        records: (candidate_name, resume_text, metadata) tuples
+        Returns the unique IDs written
+        """
+        if not records:
+            return []
+        
+        # Keyed by unique ID so a repeated resume inside one batch is written once
+        batch = {}
+        for candidate_name, resume_text, metadata in records:
+            unique_id, enhanced_metadata = self._prepare_candidate_record(candidate_name, resume_text, metadata)
+            batch[unique_id] = (resume_text, enhanced_metadata)
+        
+        ids = list(batch.keys())
+        self.collections["candidates"].upsert(
+            ids=ids,
+            documents=[batch[unique_id][0] for unique_id in ids],
+            metadatas=[batch[unique_id][1] for unique_id in ids]
+        )
+        
+        self._candidates_written()
+        
+        logger.info(f"📥 Upserted batch of {len(ids)} candidates")
+        return ids
+    
     def _get_candidate_by_id(self, unique_id: str) -> Optional[Dict]:
         """Check if candidate already exists by unique ID"""
         try:
@@ -124,6 +407,7 @@ class HybridVectorDB:
             metadatas=[metadata],
             ids=[unique_id]
         )
+        self._candidates_written()
     
     def _update_candidate(self, unique_id: str, resume_text: str, metadata: Dict[str, Any]):
         """Update existing candidate"""
@@ -132,44 +416,349 @@ class HybridVectorDB:
             metadatas=[metadata],
             ids=[unique_id]
         )
+        self._candidates_written()
+    
+    def update_file_stats(self, file_stats: Dict[str, Dict[str, Any]]):
+        """
+        Record new file_size / file_mtime for candidates whose PDF was touched but not changed
+        Metadata-only merge: nothing is re-embedded and searchable fields are unchanged, so the
+        collection version (and every cache keyed on it) stays valid
+        """
+        if not file_stats:
+            return
+        ids = list(file_stats)
+        self.collections["candidates"].update(ids=ids, metadatas=[file_stats[unique_id] for unique_id in ids])
+        logger.info(f"🕒 Recorded new file stats for {len(ids)} unchanged resumes")
+    
+    def get_all_candidate_metadata(self, page_size: int = 1000) -> List[Tuple[str, Dict[str, Any]]]:
+        """Page through every stored candidate returning (id, metadata) - no documents"""
+        collection = self.collections["candidates"]
+        entries = []
+        offset = 0
+        
+        while True:
+            page = collection.get(include=['metadatas'], limit=page_size, offset=offset)
+            if not page['ids']:
+                break
+            entries.extend(zip(page['ids'], page['metadatas']))
+            offset += len(page['ids'])
+            if len(page['ids']) < page_size:
+                break
+        
+        return entries
+    
+    def delete_candidates(self, unique_ids: List[str]):
+        """Delete candidates by unique ID"""
+        if not unique_ids:
+            return
+        self.collections["candidates"].delete(ids=list(unique_ids))
+        # Drop the cluster index so deleted resumes stop attracting new members
+        self._duplicate_clusters = None
+        self._candidates_written()
+        logger.info(f"🗑️  Deleted {len(unique_ids)} candidates")
+    
+    @classmethod
+    def _build_where_clause(cls, filters: Optional[Dict]) -> Optional[Dict]:
+        """
+        Translate search filters into a ChromaDB where clause
+        Supports ranges ({'experience_years': {'>=': 3, '<=': 5}}), equality, lists (IN),
+        education ranges ({'education_level': {'>=': 'Bachelors'}}), required domains
+        ({'domains': ['Cloud']}) and raw '$and'/'$or' clauses; conditions are ANDed
+        """
+        conditions = []
+        for key, value in (filters or {}).items():
+            if key.startswith('$'):
+                conditions.append({key: value})
+            elif key == 'domains':
+                for domain in ([value] if isinstance(value, str) else value):
+                    conditions.append({cls.domain_flag_key(domain): True})
+            elif isinstance(value, dict):
+                # ChromaDB allows one operator per expression, so ranges become two conditions
+                for operator, operand in value.items():
+                    chroma_operator = FILTER_OPERATORS.get(operator, operator)
+                    field = key
+                    if key == 'education_level' and chroma_operator in ('$gte', '$gt', '$lte', '$lt'):
+                        field, operand = 'education_rank', EDUCATION_RANKS.get(operand, 0)
+                    conditions.append({field: {chroma_operator: operand}})
+            elif isinstance(value, (list, tuple, set)):
+                conditions.append({key: {'$in': list(value)}})
+            else:
+                conditions.append({key: value})
+        
+        if not conditions:
+            return None
+        return conditions[0] if len(conditions) == 1 else {'$and': conditions}
+    
+    @staticmethod
+    def _format_query_results(results: Dict, query_index: int) -> List[Dict]:
+        """
+        Format one query's slice of a ChromaDB query response
+        Without documents in the response the results carry no 'content' key (see attach_documents)
+        """
+        formatted_results = []
+        documents = results.get('documents')
+        if results['ids'] and results['ids'][query_index]:
+            for i in range(len(results['ids'][query_index])):
+                result = {
+                    'id': results['ids'][query_index][i],
+                    'metadata': results['metadatas'][query_index][i],
+                    'distance': results['distances'][query_index][i] if results['distances'] else None
+                }
+                if documents:
+                    result['content'] = documents[query_index][i]
+                formatted_results.append(result)
+        return formatted_results
+    
+    @staticmethod
+    def _query_include(include_documents: bool) -> List[str]:
+        return ['documents', 'metadatas', 'distances'] if include_documents else ['metadatas', 'distances']
+    
+    def get_documents(self, unique_ids: List[str]) -> Dict[str, str]:
+        """Full resume texts for the given ids in one round-trip (missing ids are left out)"""
+        unique_ids = list(dict.fromkeys(unique_ids))
+        if not unique_ids:
+            return {}
+        results = self.collections["candidates"].get(ids=unique_ids, include=['documents'])
+        return dict(zip(results['ids'], results['documents']))
+    
+    def attach_documents(self, results: List[Dict]) -> List[Dict]:
+        """Load 'content' for lightweight search results that do not have it yet (one batched fetch)"""
+        missing = [result['id'] for result in results if 'content' not in result]
+        if missing:
+            documents = self.get_documents(missing)
+            for result in results:
+                if 'content' not in result:
+                    result['content'] = documents.get(result['id'], '')
+        return results
+    
+    def get_query_embedding_cache(self, collection_key: str = "candidates"):
+        """Query embedding cache for a collection's embedding model (rebuilt if the collection or function is swapped)"""
+        from .embedding_cache import QueryEmbeddingCache, embedding_model_id, query_cache_path_for
+        
+        collection = self.collections[collection_key]
+        embedding_function = self.embedding_functions[collection_key]
+        cached = self._query_caches.get(collection_key)
+        if cached is None or cached[0] is not collection or cached[1] is not embedding_function:
+            cache = QueryEmbeddingCache(
+                embedding_function.embed_query,
+                embedding_model_id(embedding_function),
+                max_entries=self.query_cache_size,
+                disk_path=query_cache_path_for(self.persist_directory) if self.persist_query_cache else None
+            )
+            cached = (collection, embedding_function, cache)
+            self._query_caches[collection_key] = cached
+        return cached[2]
+    
+    def embed_queries(self, queries: List[str], collection_key: str = "candidates") -> List[List[float]]:
+        """Query embeddings through the cache (only unseen queries reach the embedding model)"""
+        return self.get_query_embedding_cache(collection_key).embed(queries)
+    
+    def query_embedding_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit-rate counters of every query embedding cache in use"""
+        return {key: cache.stats() for key, (_, _, cache) in self._query_caches.items()}
+    
+    def _candidate_documents(self, page_size: int = 500) -> List[Tuple[str, str]]:
+        """(unique_id, resume text) for every stored candidate, read in pages"""
+        collection = self.collections["candidates"]
+        documents = []
+        offset = 0
+        while True:
+            page = collection.get(include=['documents'], limit=page_size, offset=offset)
+            if not page['ids']:
+                break
+            documents.extend(zip(page['ids'], page['documents']))
+            offset += len(page['ids'])
+            if len(page['ids']) < page_size:
+                break
+        return documents
+    
+    def rebuild_text_indexes(self):
+        """Rebuild the BM25 index and the TF-IDF model from one pass over the stored resumes"""
+        with self._text_index_lock:
+            # Writes landing while the corpus is read mark the indexes dirty again
+            self._text_indexes_dirty = False
+            documents = self._candidate_documents()
+            self.rebuild_bm25_index(documents)
+            self.rebuild_tfidf_model(documents)
+    
+    def _refresh_until_clean(self):
+        """Background rebuild, repeated while writes outside a batch landed during the previous one"""
+        self._refresh_text_indexes()
+        while self._text_indexes_dirty and self._write_batch_depth == 0:
+            self._refresh_text_indexes()
+    
+    def _rebuild_text_indexes_in_background(self):
+        """Start one background rebuild (no-op while one is running); searches keep the stale indexes meanwhile"""
+        with self._background_rebuild_lock:
+            if self._background_rebuild is not None and self._background_rebuild.is_alive():
+                return
+            self._background_rebuild = threading.Thread(target=self._refresh_until_clean,
+                                                        name="text-index-rebuild", daemon=True)
+            self._background_rebuild.start()
+    
+    def rebuild_bm25_index(self, documents: Optional[List[Tuple[str, str]]] = None):
+        """Build the BM25 index from every stored resume and save it next to the database"""
+        from .bm25_index import BM25Index, bm25_index_path_for
+        
+        version = self.collection_version()
+        if documents is None:
+            documents = self._candidate_documents()
+        
+        index = BM25Index.build(documents, collection_version=version)
+        index.save(bm25_index_path_for(self.persist_directory))
+        self._bm25_index = index
+        logger.info(f"📇 Built BM25 index: {len(index)} resumes, {len(index.vocabulary)} terms")
+        return index
+    
+    def get_bm25_index(self):
+        """
+        BM25 index for hybrid search, as built at the last write batch (possibly by another process)
+        A stale index is served as-is while a background rebuild runs; only a missing one is built here
+        """
+        from .bm25_index import BM25Index, bm25_index_path_for
+        
+        version = self.collection_version()
+        index = self._bm25_index
+        if index is None or index.collection_version != version:
+            saved = BM25Index.load(bm25_index_path_for(self.persist_directory))
+            if saved is not None and (index is None or saved.collection_version > index.collection_version):
+                index = self._bm25_index = saved
+        
+        if index is None:
+            logger.info("📇 No BM25 index saved yet - building")
+            return self.rebuild_bm25_index()
+        if index.collection_version != version:
+            logger.warning(f"⚠️  BM25 index is stale (collection version {index.collection_version}, "
+                           f"now {version}) - serving it while it is rebuilt")
+            self._rebuild_text_indexes_in_background()
+        return index
+    
+    def rebuild_tfidf_model(self, documents: Optional[List[Tuple[str, str]]] = None):
+        """Fit the corpus TF-IDF model on every stored resume and save it next to the database"""
+        from .tfidf_model import CorpusTfidfModel, tfidf_model_path_for
+        
+        version = self.collection_version()
+        if documents is None:
+            documents = self._candidate_documents()
+        
+        model = CorpusTfidfModel.build(documents, collection_version=version)
+        self._tfidf_model = (version, model)
+        if model is None:
+            logger.info("🔤 No resume text to fit a TF-IDF model on")
+            return None
+        model.save(tfidf_model_path_for(self.persist_directory))
+        logger.info(f"🔤 Fitted TF-IDF model: {len(model)} resumes, {len(model.vectorizer.vocabulary_)} terms")
+        return model
+    
+    def get_tfidf_model(self):
+        """
+        Corpus TF-IDF model as fitted at the last write batch (None for an empty corpus)
+        Like get_bm25_index, a stale model is served while a background rebuild runs
+        """
+        from .tfidf_model import CorpusTfidfModel, tfidf_model_path_for
+        
+        version = self.collection_version()
+        cached = self._tfidf_model
+        if cached is None or cached[0] != version:
+            saved = CorpusTfidfModel.load(tfidf_model_path_for(self.persist_directory))
+            if saved is not None and (cached is None or saved.collection_version > cached[0]):
+                cached = self._tfidf_model = (saved.collection_version, saved)
+        
+        if cached is None:
+            logger.info("🔤 No TF-IDF model saved yet - fitting")
+            return self.rebuild_tfidf_model()
+        if cached[0] != version:
+            logger.warning(f"⚠️  TF-IDF model is stale (collection version {cached[0]}, "
+                           f"now {version}) - serving it while it is refitted")
+            self._rebuild_text_indexes_in_background()
+        return cached[1]
+    
+    @staticmethod
+    def _embedding_distances(space: str, query_embedding: List[float], embeddings) -> List[float]:
+        """Distances computed the way ChromaDB does for the collection's space"""
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if space == 'cosine':
+            norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query_vector)
+            return (1 - vectors @ query_vector / np.maximum(norms, 1e-12)).tolist()
+        if space == 'ip':
+            return (1 - vectors @ query_vector).tolist()
+        return ((vectors - query_vector) ** 2).sum(axis=1).tolist()
+    
+    def _hybrid_search(self, query: str, n_results: int, filters: Optional[Dict],
+                       include_documents: bool = True) -> List[Dict]:
+        """
+        Dense + BM25 retrieval fused with reciprocal rank fusion
+        BM25-only hits are fetched by id (honouring the filters) and given their real vector distance
+        """
+        from .bm25_index import reciprocal_rank_fusion
+        
+        collection = self.collections["candidates"]
+        where = self._build_where_clause(filters)
+        depth = max(n_results * 2, 20)
+        query_embedding = self.embed_queries([query])
+        
+        vector_results = self._format_query_results(collection.query(
+            query_embeddings=query_embedding,
+            n_results=depth,
+            where=where,
+            include=self._query_include(include_documents)
+        ), 0)
+        results_by_id = {result['id']: result for result in vector_results}
+        
+        bm25_ids = [doc_id for doc_id, _ in self.get_bm25_index().search(query, depth)]
+        missing_ids = [doc_id for doc_id in bm25_ids if doc_id not in results_by_id]
+        if missing_ids:
+            fetched = collection.get(ids=missing_ids, where=where,
+                                     include=(['documents'] if include_documents else []) + ['metadatas', 'embeddings'])
+            if fetched['ids']:
+                distances = self._embedding_distances(self.distance_space(), query_embedding[0], fetched['embeddings'])
+                for i, doc_id in enumerate(fetched['ids']):
+                    results_by_id[doc_id] = {
+                        'id': doc_id,
+                        'metadata': fetched['metadatas'][i],
+                        'distance': distances[i]
+                    }
+                    if include_documents:
+                        results_by_id[doc_id]['content'] = fetched['documents'][i]
+        
+        # Ids filtered out by the where clause never reach the fusion
+        bm25_ranking = [doc_id for doc_id in bm25_ids if doc_id in results_by_id]
+        fused = reciprocal_rank_fusion([[result['id'] for result in vector_results], bm25_ranking])
+        
+        formatted_results = []
+        for doc_id, fused_score in fused[:n_results]:
+            result = dict(results_by_id[doc_id])
+            result['rrf_score'] = fused_score
+            formatted_results.append(result)
+        return formatted_results
     
     def search_candidates(self, query: str, n_results: int = 10, 
-                         filters: Optional[Dict] = None) -> List[Dict]:
+                         filters: Optional[Dict] = None, mode: str = "vector",
+                         include_documents: bool = True) -> List[Dict]:
         """
         Search candidates with automatic deduplication
         Returns unique candidates only (no duplicates possible with unique IDs)
+        mode="hybrid" fuses dense results with BM25 keyword results (better for exact skill queries)
+        include_documents=False returns ids, metadata (with 'snippet') and distances only;
+        load full text later with attach_documents / get_documents
         """
         
         try:
-            # Build where clause for filtering
-            where_clause = {}
-            if filters:
-                for key, value in filters.items():
-                    if isinstance(value, dict) and '>=' in value:
-                        # Handle numeric filters like experience_years >= 4
-                        where_clause[key] = {"$gte": value['>=']}
-                    else:
-                        where_clause[key] = value
+            if mode == "hybrid":
+                formatted_results = self._hybrid_search(query, n_results, filters, include_documents)
+                logger.info(f"🔍 Hybrid search for '{query}' returned {len(formatted_results)} unique candidates")
+                return formatted_results
             
             # Search in candidates collection
             results = self.collections["candidates"].query(
-                query_texts=[query],
+                query_embeddings=self.embed_queries([query]),
                 n_results=n_results,
-                where=where_clause if where_clause else None,
-                include=['documents', 'metadatas', 'distances']
+                where=self._build_where_clause(filters),
+                include=self._query_include(include_documents)
             )
             
-            # Format results
-            formatted_results = []
-            if results['ids'] and results['ids'][0]:
-                for i in range(len(results['ids'][0])):
-                    result = {
-                        'id': results['ids'][0][i],
-                        'content': results['documents'][0][i],
-                        'metadata': results['metadatas'][0][i],
-                        'distance': results['distances'][0][i] if results['distances'] else None
-                    }
-                    formatted_results.append(result)
+            formatted_results = self._format_query_results(results, 0)
             
             logger.info(f"🔍 Search for '{query}' returned {len(formatted_results)} unique candidates")
             return formatted_results
@@ -178,80 +767,118 @@ class HybridVectorDB:
             logger.error(f"❌ Search error: {e}")
             return []
     
-    def add_sample_data(self):
-        """Add actual PDF resume data to the vector database (NO CHUNKING)"""
+    def search_candidates_batch(self, queries: List[str], n_results: int = 10,
+                                filters: Optional[Dict] = None) -> List[List[Dict]]:
+        """
+        Search candidates for many queries in a single ChromaDB call
+        Cached embeddings are reused; the rest are computed in one pass, identical queries once
+        Returns one result list per query, in input order, shaped like search_candidates
+        """
+        if not queries:
+            return []
+        
+        # Embed each distinct query only once
+        unique_queries = list(dict.fromkeys(queries))
+        
+        try:
+            results = self.collections["candidates"].query(
+                query_embeddings=self.embed_queries(unique_queries),
+                n_results=n_results,
+                where=self._build_where_clause(filters),
+                include=['documents', 'metadatas', 'distances']
+            )
+            
+            results_by_query = {
+                query: self._format_query_results(results, i)
+                for i, query in enumerate(unique_queries)
+            }
+            
+            logger.info(f"🔍 Batch search for {len(queries)} queries ({len(unique_queries)} unique) "
+                        f"returned {sum(len(r) for r in results_by_query.values())} results")
+            # Copy per query so callers can mutate results independently
+            return [[dict(result) for result in results_by_query[query]] for query in queries]
+            
+        except Exception as e:
+            logger.error(f"❌ Batch search error: {e}")
+            return [[] for _ in queries]
+    
+    @staticmethod
+    def candidate_name_from_filename(pdf_file: Path) -> str:
+        """Extract candidate name from a resume_<n>_<First>_<Last>_... filename"""
+        filename = pdf_file.stem
+        parts = filename.split('_')
+        if len(parts) >= 4:
+            return f"{parts[2]} {parts[3]}"
+        return filename.replace('_', ' ').title()
+    
+    @staticmethod
+    def build_candidate_metadata(pdf_file: Path, candidate_name: str, metadata_obj,
+                                 content_sha256: str = '') -> Dict[str, Any]:
+        """Convert ExtractedMetadata to a dict with ChromaDB-compatible types (no lists)"""
+        file_stat = pdf_file.stat()
+        return {
+            'candidate_name': candidate_name,
+            'experience_years': float(metadata_obj.experience_years),
+            'skills': ', '.join(metadata_obj.skills) if metadata_obj.skills else '',
+            'domains': ', '.join(metadata_obj.domains) if metadata_obj.domains else '',
+            'email': metadata_obj.email or '',
+            'phone': metadata_obj.phone or '',
+            'education_level': metadata_obj.education_level or '',
+            'certifications': ', '.join(metadata_obj.certifications) if metadata_obj.certifications else '',
+            'languages': ', '.join(metadata_obj.languages) if metadata_obj.languages else '',
+            'location': metadata_obj.location or '',
+            'confidence_score': float(metadata_obj.confidence_score),
+            'extraction_method': metadata_obj.extraction_method,
+            'pdf_file_path': str(pdf_file),
+            'pdf_filename': pdf_file.name,
+            'file_size': int(file_stat.st_size),
+            # Change detection for incremental sync
+            'file_mtime': float(file_stat.st_mtime),
+            'content_sha256': content_sha256
+        }
+    
+    def add_sample_data(self, workers: Optional[int] = None, batch_size: int = 200,
+                        checkpoint_path: Optional[str] = None):
+        """
+        Add actual PDF resume data to the vector database (NO CHUNKING)
+        Runs the bulk ingestion pipeline: process-pool PDF extraction, batched
+        metadata extraction and batched upserts, resumable from a checkpoint file
+        """
+        from .ingestion_pipeline import ResumeIngestionPipeline, checkpoint_path_for
         
-        pdf_files = []
         sample_resumes_path = Path("sample_resumes")
         
         if not sample_resumes_path.exists():
             logger.warning("sample_resumes folder not found")
-            return
-        
-        # Get all PDF files
-        for pdf_file in sample_resumes_path.glob("*.pdf"):
-            pdf_files.append(pdf_file)
+            return None
         
-        logger.info(f"📄 Found {len(pdf_files)} PDF files in sample_resumes folder")
+        pipeline = ResumeIngestionPipeline(
+            self,
+            workers=workers,
+            batch_size=batch_size,
+            checkpoint_path=checkpoint_path or checkpoint_path_for(self.persist_directory)
+        )
+        # The pipeline rebuilds the BM25 index and TF-IDF model once it has written everything
+        stats = pipeline.run(sample_resumes_path)
         
-        # Process actual PDF files with NO CHUNKING
-        processed_candidates = []
+        logger.info(f"✅ Processed {stats.upserted} actual PDF resumes with NO CHUNKING")
+        logger.info("✅ Added actual PDF data to hybrid vector database")
+        return stats
+    
+    def sync_sample_data(self, resumes_dir: str = "sample_resumes", workers: Optional[int] = None,
+                         batch_size: int = 200, dry_run: bool = False):
+        """
+        Incrementally sync the candidates collection with the resumes folder
+        Only new or changed PDFs are embedded; entries whose PDF disappeared are deleted
+        """
+        from .ingestion_pipeline import ResumeIngestionPipeline
         
-        for pdf_file in pdf_files:
-            try:
-                logger.info(f"🔄 Processing {pdf_file.name}...")
-                
-                # Extract candidate name from filename
-                filename = pdf_file.stem
-                parts = filename.split('_')
-                if len(parts) >= 4:
-                    candidate_name = f"{parts[2]} {parts[3]}"
-                else:
-                    candidate_name = filename.replace('_', ' ').title()
-                
-                # Extract FULL content from PDF (no chunking)
-                try:
-                    resume_text = enhanced_pdf_processor.extract_resume_content(str(pdf_file))
-                    
-                    if not resume_text.strip():
-                        logger.warning(f"⚠️  No text extracted from {pdf_file.name}")
-                        continue
-                        
-                except Exception as pdf_error:
-                    logger.warning(f"❌ Error reading PDF {pdf_file.name}: {pdf_error}")
-                    continue
-                
-                # Extract metadata using local extractor
-                metadata_obj = local_metadata_extractor.extract_metadata(resume_text)
-                
-                # Convert to dict with ChromaDB-compatible types (no lists)
-                metadata_dict = {
-                    'candidate_name': candidate_name,
-                    'experience_years': float(metadata_obj.experience_years),
-                    'skills': ', '.join(metadata_obj.skills) if metadata_obj.skills else '',
-                    'domains': ', '.join(metadata_obj.domains) if metadata_obj.domains else '',
-                    'email': metadata_obj.email or '',
-                    'phone': metadata_obj.phone or '',
-                    'education_level': metadata_obj.education_level or '',
-                    'certifications': ', '.join(metadata_obj.certifications) if metadata_obj.certifications else '',
-                    'languages': ', '.join(metadata_obj.languages) if metadata_obj.languages else '',
-                    'location': metadata_obj.location or '',
-                    'confidence_score': float(metadata_obj.confidence_score),
-                    'extraction_method': metadata_obj.extraction_method,
-                    'pdf_file_path': str(pdf_file),
-                    'pdf_filename': pdf_file.name,
-                    'file_size': int(pdf_file.stat().st_size)
-                }
-                
-                # Add resume with NO CHUNKING (whole resume as single entry)
-                self.add_resume(candidate_name, resume_text, metadata_dict)
-                processed_candidates.append(candidate_name)
-                
-            except Exception as e:
-                logger.warning(f"❌ Error processing {pdf_file.name}: {e}")
+        if not Path(resumes_dir).exists():
+            logger.warning(f"{resumes_dir} folder not found")
+            return None
         
-        logger.info(f"✅ Processed {len(processed_candidates)} actual PDF resumes with NO CHUNKING")
-        logger.info("✅ Added actual PDF data to hybrid vector database")
+        pipeline = ResumeIngestionPipeline(self, workers=workers, batch_size=batch_size, checkpoint_path=None)
+        return pipeline.sync(resumes_dir, dry_run=dry_run)
 
 # Global instance
 hybrid_vector_db = None
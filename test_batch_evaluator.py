@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized batch evaluator against per-candidate evaluation
+"""
+
+import os
+import sys
+import json
+import time
+import random
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.candidate_evaluator import CandidateEvaluator, plain_justification
+from services.tfidf_model import CorpusTfidfModel
+from tools.candidate_shortlist import ShortlistResult
+
+WORDS = ["python", "django", "react", "javascript", "java", "spring", "aws", "docker", "kubernetes",
+         "machine", "learning", "senior", "junior", "lead", "manager", "engineer", "developer",
+         "certified", "aws certified solutions architect", "intern", "sr.", "team lead", "sql", "go"]
+
+JOB_DESCRIPTIONS = [
+    "Senior Python Engineer\n\nRequired Skills: Python, Django, AWS\n\nPreferred Skills: Docker, Kubernetes\n\n"
+    "5-8 years experience. AWS Certified Solutions Architect certification preferred.",
+    "Junior frontend developer. Required Skills: React, JavaScript\n\n1-3 years of experience",
+    "Engineering Manager for the data team.\nRequired Skills: Machine Learning, SQL, Leadership\n\n"
+    "Minimum 7 years. Certified Scrum Master certificate is a plus",
+    "Backend developer, Java and Spring, open to any experience level",
+]
+
+
+def _make_candidates(count: int, seed: int = 13):
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(count):
+        content = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 60)))
+        skills = ", ".join(rng.sample(["Python", "React", "Java", "AWS", "Docker", "SQL", "Machine"],
+                                      rng.randint(0, 3)))
+        experience = rng.choice([0, 1, 2, 3.5, 4, 5, 6, 7, 9, 12, 20])
+        candidates.append({
+            'id': f"cand_{i}",
+            'content': content,
+            'metadata': {'candidate_name': f"Person {i}", 'skills': skills, 'experience_years': experience}
+        })
+    # Skill and certification text split across the join between metadata skills and resume text
+    candidates.append({'id': "straddle", 'content': "learning systems", 'metadata': {
+        'candidate_name': "Straddle", 'skills': "Python, Machine", 'experience_years': 4}})
+    return candidates
+
+
+def _score_fields(score):
+    fields = dict(vars(score))
+    justification = dict(fields.pop('justification'))
+    return fields, justification
+
+
+def test_batch_matches_per_candidate():
+    """Batch CandidateScores (values and justification breakdowns) equal evaluate_candidate's"""
+
+    print("🧪 TESTING BATCH EVALUATOR EQUIVALENCE")
+    print("=" * 60)
+
+    candidates = _make_candidates(300)
+    model = CorpusTfidfModel.build([(c['id'], c['content']) for c in candidates])
+
+    for corpus_model_loader in (lambda: model, None):
+        evaluator = CandidateEvaluator(corpus_model_loader=corpus_model_loader, evaluation_cache_loader=None)
+        for job_description in JOB_DESCRIPTIONS:
+            criteria = evaluator.extract_evaluation_criteria(job_description)
+            batch = evaluator.evaluate_candidates_batch(candidates, job_description, criteria)
+            for candidate, batch_score in zip(candidates, batch):
+                expected = evaluator.evaluate_candidate(candidate, job_description, criteria)
+                assert _score_fields(batch_score) == _score_fields(expected), candidate['id']
+
+    machine_learning = "Required Skills: Machine Learning\n\n2-5 years"
+    evaluator = CandidateEvaluator(corpus_model_loader=None, evaluation_cache_loader=None)
+    straddle = evaluator.evaluate_candidates_batch(candidates[-1:], machine_learning)[0]
+    assert straddle.justification['skills_breakdown']['required_matches'] == ["Machine Learning"]
+
+    results = evaluator.evaluate_candidates(candidates[:20], JOB_DESCRIPTIONS[0])
+    assert len(results['selected_candidates']) + len(results['rejected_candidates']) == 20
+
+    print("✅ Batch evaluator equivalence tests passed")
+
+
+def test_batch_evaluator_scales():
+    """Thousands of applicants are evaluated in seconds"""
+
+    print("🧪 TESTING BATCH EVALUATOR THROUGHPUT")
+    print("=" * 60)
+
+    candidates = _make_candidates(5000, seed=5)
+    model = CorpusTfidfModel.build([(c['id'], c['content']) for c in candidates])
+    evaluator = CandidateEvaluator(corpus_model_loader=lambda: model, evaluation_cache_loader=None)
+
+    start = time.perf_counter()
+    scores = evaluator.evaluate_candidates_batch(candidates, JOB_DESCRIPTIONS[0])
+    elapsed = time.perf_counter() - start
+    print(f"Evaluated {len(scores)} candidates in {elapsed:.2f}s")
+    assert len(scores) == len(candidates)
+    assert elapsed < 10
+
+    print("✅ Batch evaluator throughput test passed")
+
+
+def test_parallel_matches_serial():
+    """Process-pool evaluation reports progress and returns exactly the serial results"""
+
+    print("🧪 TESTING PARALLEL BATCH EVALUATOR")
+    print("=" * 60)
+
+    candidates = _make_candidates(1200, seed=8)
+    model = CorpusTfidfModel.build([(c['id'], c['content']) for c in candidates])
+    serial = CandidateEvaluator(corpus_model_loader=lambda: model, evaluation_cache_loader=None)
+    parallel = CandidateEvaluator(corpus_model_loader=lambda: model, evaluation_cache_loader=None,
+                                  workers=3, chunk_size=100)
+
+    progress = []
+    expected = serial.evaluate_candidates(candidates, JOB_DESCRIPTIONS[0])
+    results = parallel.evaluate_candidates(candidates, JOB_DESCRIPTIONS[0],
+                                           progress_callback=lambda done, total: progress.append((done, total)))
+    print(f"Progress updates: {len(progress)}, last {progress[-1]}")
+    # 1201 candidates in 13 chunks, reported as each finishes
+    done_counts = [done for done, _ in progress]
+    assert len(done_counts) == 13 and done_counts == sorted(done_counts) and done_counts[-1] == 1201
+    assert all(total == len(candidates) for _, total in progress)
+
+    for key in ('selected_candidates', 'rejected_candidates'):
+        assert ([(result['candidate']['id'], _score_fields(result['score'])) for result in results[key]] ==
+                [(result['candidate']['id'], _score_fields(result['score'])) for result in expected[key]])
+    assert results['summary'] == expected['summary']
+
+    print("✅ Parallel batch evaluator tests passed")
+
+
+def test_iter_evaluate_streams_results():
+    """iter_evaluate yields the first results after one chunk and sums up to evaluate_candidates"""
+
+    print("🧪 TESTING STREAMING EVALUATION")
+    print("=" * 60)
+
+    candidates = _make_candidates(120, seed=21)
+    model = CorpusTfidfModel.build([(c['id'], c['content']) for c in candidates])
+    evaluator = CandidateEvaluator(corpus_model_loader=lambda: model, evaluation_cache_loader=None)
+    criteria = evaluator.extract_evaluation_criteria(JOB_DESCRIPTIONS[0])
+
+    scored = []
+    keyword_components = evaluator._keyword_components
+    evaluator._keyword_components = lambda chunk, criteria: scored.append(len(chunk)) or keyword_components(chunk, criteria)
+
+    stream = evaluator.iter_evaluate(candidates, JOB_DESCRIPTIONS[0], chunk_size=10, criteria=criteria)
+    first = next(stream)
+    print(f"First result after scoring {sum(scored)} of {len(candidates)} candidates")
+    assert scored == [10] and first['position'] == 0 and 'recommendation' in first['justification']
+
+    streamed = [first] + list(stream)
+    assert sum(scored) == len(candidates) and len(streamed) == len(candidates)
+
+    expected = evaluator.evaluate_candidates(candidates, JOB_DESCRIPTIONS[0])
+    results = evaluator.summarize_evaluations(streamed[::-1], criteria)
+    for key in ('selected_candidates', 'rejected_candidates'):
+        assert ([(result['candidate']['id'], _score_fields(result['score'])) for result in results[key]] ==
+                [(result['candidate']['id'], _score_fields(result['score'])) for result in expected[key]])
+    assert results['summary'] == expected['summary']
+
+    print("✅ Streaming evaluation tests passed")
+
+
+def test_lazy_justification():
+    """Justifications are rendered only for the candidates whose justification is read"""
+
+    print("🧪 TESTING LAZY JUSTIFICATION")
+    print("=" * 60)
+
+    candidates = _make_candidates(50, seed=4)
+    evaluator = CandidateEvaluator(corpus_model_loader=None, evaluation_cache_loader=None)
+    generate_justification = evaluator.generate_justification
+    rendered = []
+    evaluator.generate_justification = lambda candidate, *args: (rendered.append(candidate['id'])
+                                                                  or generate_justification(candidate, *args))
+
+    results = evaluator.evaluate_candidates(candidates, JOB_DESCRIPTIONS[1])
+    evaluated = results['selected_candidates'] + results['rejected_candidates']
+    assert len(evaluated) == len(candidates) and rendered == []
+
+    top = evaluated[0]
+    assert not top['justification'].is_rendered
+    decision = top['justification']['decision']
+    recommendation = top['justification'].get('recommendation')
+    print(f"{top['candidate']['id']}: {decision} - {recommendation}")
+    assert rendered == [top['candidate']['id']]
+    assert decision == ('SELECTED' if top['score'].is_selected else 'REJECTED')
+
+    criteria = results['evaluation_criteria']
+    expected = generate_justification(top['candidate'], top['score'], criteria, None,
+                                      top['justification']['evaluation_date'])
+    assert dict(top['justification']) == expected == top['justification'].render()
+    assert len(rendered) == 1
+
+    # Serialization points resolve the justification to a plain dict
+    assert json.loads(json.dumps(plain_justification(top['justification']))) == expected
+    assert plain_justification(expected) is expected and plain_justification(None) is None
+    second = evaluated[1]
+    candidate = {**second['candidate'], 'justification': second['justification']}
+    payload = json.loads(json.dumps(ShortlistResult.candidate_to_dict(candidate)))
+    assert payload['justification']['decision'] == ('SELECTED' if second['score'].is_selected else 'REJECTED')
+
+    print("✅ Lazy justification tests passed")
+
+
+if __name__ == "__main__":
+    test_batch_matches_per_candidate()
+    test_batch_evaluator_scales()
+    test_parallel_matches_serial()
+    test_iter_evaluate_streams_results()
+    test_lazy_justification()
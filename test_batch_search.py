@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test batched multi-query candidate search
+Uses a deterministic local embedding function so no model download is needed
+"""
+
+import os
+import sys
+import tempfile
+
+from chromadb import Documents, EmbeddingFunction, Embeddings
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.vector_db import HybridVectorDB
+
+VOCABULARY = ["python", "django", "react", "javascript", "java", "spring", "aws", "docker"]
+
+
+class KeywordEmbedding(EmbeddingFunction):
+    """Bag-of-keywords embedding that counts how many texts it embedded per call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, input: Documents) -> Embeddings:
+        self.calls.append(len(input))
+        return [[float(text.lower().count(word)) + 0.01 for word in VOCABULARY] for text in input]
+
+    @staticmethod
+    def name() -> str:
+        return "keyword-test"
+
+
+def _make_vector_db(tmp_dir: str):
+    vector_db = HybridVectorDB(persist_directory=os.path.join(tmp_dir, "db"))
+    embedding = KeywordEmbedding()
+    vector_db.collections["candidates"] = vector_db.client.get_or_create_collection(
+        name="candidates_batch_test", embedding_function=embedding
+    )
+    vector_db.embedding_functions["candidates"] = embedding
+    vector_db.collections["candidates"].add(
+        ids=["python_dev", "react_dev", "java_dev"],
+        documents=["Python Django developer", "React JavaScript frontend", "Java Spring AWS backend"],
+        metadatas=[
+            {"candidate_name": "Py Dev", "experience_years": 5.0},
+            {"candidate_name": "React Dev", "experience_years": 2.0},
+            {"candidate_name": "Java Dev", "experience_years": 8.0},
+        ]
+    )
+    embedding.calls = []
+    return vector_db, embedding
+
+
+def test_search_candidates_batch():
+    """Batched search matches per-query search and embeds all queries in one call"""
+
+    print("🧪 TESTING BATCH CANDIDATE SEARCH")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vector_db, embedding = _make_vector_db(tmp_dir)
+        queries = ["python django", "react javascript", "python django"]
+
+        batch_results = vector_db.search_candidates_batch(queries, n_results=2)
+        print(f"Embedding calls for batch: {embedding.calls}")
+        assert embedding.calls == [2]  # one call, duplicate query embedded once
+        assert len(batch_results) == len(queries)
+
+        for query, results in zip(queries, batch_results):
+            single = vector_db.search_candidates(query, n_results=2)
+            print(f"{query}: {[r['id'] for r in results]}")
+            assert [r['id'] for r in results] == [r['id'] for r in single]
+            assert set(results[0].keys()) == {'id', 'content', 'metadata', 'distance'}
+
+        assert batch_results[0][0]['id'] == "python_dev"
+        assert batch_results[1][0]['id'] == "react_dev"
+
+        # Filters apply to every query
+        filtered = vector_db.search_candidates_batch(queries[:2], n_results=3,
+                                                     filters={'experience_years': {'>=': 4}})
+        for results in filtered:
+            assert all(r['metadata']['experience_years'] >= 4 for r in results)
+
+        assert vector_db.search_candidates_batch([]) == []
+
+    print("✅ Batch search tests passed")
+
+
+def test_filter_pushdown():
+    """Range, education and domain filters are translated and evaluated inside ChromaDB"""
+
+    print("🧪 TESTING WHERE-CLAUSE FILTER PUSHDOWN")
+    print("=" * 60)
+
+    where = HybridVectorDB._build_where_clause({
+        'experience_years': {'>=': 3, '<=': 5},
+        'education_level': {'>=': 'Bachelors'},
+        'domains': ['Web Frontend']
+    })
+    print(f"Where clause: {where}")
+    assert where == {'$and': [
+        {'experience_years': {'$gte': 3}},
+        {'experience_years': {'$lte': 5}},
+        {'education_rank': {'$gte': 3}},
+        {'domain_web_frontend': True}
+    ]}
+    assert HybridVectorDB._build_where_clause({'experience_years': {'>=': 4}}) == {'experience_years': {'$gte': 4}}
+    assert HybridVectorDB._build_where_clause({'location': ['Berlin', 'Paris']}) == {'location': {'$in': ['Berlin', 'Paris']}}
+    assert HybridVectorDB._build_where_clause(None) is None
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vector_db, _ = _make_vector_db(tmp_dir)
+        profiles = {
+            "python_dev": {'education_level': 'Masters', 'domains': 'Data Science, Backend'},
+            "react_dev": {'education_level': 'Bachelors', 'domains': 'Web Frontend'},
+            "java_dev": {'education_level': 'High School', 'domains': 'Backend'},
+        }
+        collection = vector_db.collections["candidates"]
+        stored = collection.get(ids=list(profiles))
+        metadatas = []
+        for unique_id, metadata in zip(stored['ids'], stored['metadatas']):
+            metadata.update(profiles[unique_id])
+            metadata.update(HybridVectorDB.filter_metadata(metadata))
+            metadatas.append(metadata)
+        collection.update(ids=stored['ids'], metadatas=metadatas)
+
+        def ids_for(filters):
+            return sorted(r['id'] for r in vector_db.search_candidates("python react java", 10, filters=filters))
+
+        assert ids_for({'experience_years': {'>=': 3, '<=': 6}}) == ["python_dev"]
+        assert ids_for({'education_level': {'>=': 'Bachelors'}}) == ["python_dev", "react_dev"]
+        assert ids_for({'domains': 'Backend'}) == ["java_dev", "python_dev"]
+        assert ids_for({'domains': ['Backend'], 'experience_years': {'>': 6}}) == ["java_dev"]
+        assert ids_for({'domains': 'Mobile'}) == []
+
+    print("✅ Filter pushdown tests passed")
+
+
+def test_lazy_document_fetch():
+    """Lightweight search returns no documents; full texts are fetched in one batched call"""
+
+    print("🧪 TESTING LAZY DOCUMENT FETCH")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vector_db, _ = _make_vector_db(tmp_dir)
+
+        full = vector_db.search_candidates("python django", 3)
+        light = vector_db.search_candidates("python django", 3, include_documents=False)
+        print(f"Lightweight result keys: {sorted(light[0].keys())}")
+        assert all('content' not in result for result in light)
+        assert [(r['id'], r['distance']) for r in light] == [(r['id'], r['distance']) for r in full]
+
+        hybrid = vector_db.search_candidates("python django", 3, mode="hybrid", include_documents=False)
+        assert all('content' not in result for result in hybrid)
+
+        documents = vector_db.get_documents(["java_dev", "python_dev", "missing"])
+        assert documents == {"python_dev": "Python Django developer", "java_dev": "Java Spring AWS backend"}
+
+        vector_db.attach_documents(light)
+        assert [r['content'] for r in light] == [r['content'] for r in full]
+
+        # Snippet and content term mentions are stored at ingest
+        metadata = HybridVectorDB.content_metadata("React and JavaScript frontend. " * 20)
+        assert metadata['snippet'] == ("React and JavaScript frontend. " * 20)[:200]
+        assert metadata['content_mentions'] == "react,javascript,frontend,java"
+
+    print("✅ Lazy document fetch tests passed")
+
+
+if __name__ == "__main__":
+    test_search_candidates_batch()
+    test_filter_pushdown()
+    test_lazy_document_fetch()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test the BM25 inverted index and hybrid (vector + BM25) candidate search
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.bm25_index import BM25Index, reciprocal_rank_fusion, tokenize
+from test_batch_search import _make_vector_db
+
+
+def test_bm25_index_build_and_search():
+    """Exact terms rank first, and a saved index loads with memory-mapped postings"""
+
+    print("🧪 TESTING BM25 INDEX")
+    print("=" * 60)
+
+    assert tokenize("Skills: C++, C#, Node.js and CI/CD.") == ["skills", "c++", "c#", "node.js", "ci/cd"]
+
+    documents = [
+        ("frontend", "React TypeScript GraphQL frontend engineer building React apps"),
+        ("backend", "Python Django REST backend engineer with PostgreSQL"),
+        ("fullstack", "Full stack engineer: React, Node.js, Python"),
+        ("data", "Data scientist: Python, pandas, machine learning"),
+    ]
+    index = BM25Index.build(documents, collection_version=7)
+
+    hits = index.search("React TypeScript GraphQL", n_results=3)
+    print(f"Hits: {hits}")
+    assert hits[0][0] == "frontend"
+    assert [doc_id for doc_id, _ in hits] == ["frontend", "fullstack"]
+    assert index.search("kubernetes") == []
+    assert [doc_id for doc_id, _ in index.search("python", n_results=2)][0] in {"backend", "data", "fullstack"}
+    assert len(index.search("python", n_results=2)) == 2
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index.save(tmp_dir)
+        loaded = BM25Index.load(tmp_dir)
+        assert loaded is not None
+        assert isinstance(loaded.postings_docs, np.memmap)
+        assert loaded.collection_version == 7
+        assert loaded.search("React TypeScript GraphQL", n_results=3) == hits
+        assert BM25Index.load(os.path.join(tmp_dir, "missing")) is None
+
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]])
+    assert [doc_id for doc_id, _ in fused] == ["a", "c", "b"]
+
+    print("✅ BM25 index tests passed")
+
+
+def test_hybrid_candidate_search():
+    """Hybrid mode surfaces exact keyword matches the dense ranking misses, honouring filters"""
+
+    print("🧪 TESTING HYBRID CANDIDATE SEARCH")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vector_db, _ = _make_vector_db(tmp_dir)
+        vector_db.collections["candidates"].add(
+            ids=["graphql_dev"],
+            # Heavy on an unrelated keyword so the dense ranking places it last
+            documents=["GraphQL TypeScript Apollo specialist, docker docker docker"],
+            metadatas=[{"candidate_name": "Gql Dev", "experience_years": 6.0}]
+        )
+        vector_db.bump_collection_version()
+
+        query = "GraphQL TypeScript"
+        dense = vector_db.search_candidates(query, n_results=1)
+        hybrid = vector_db.search_candidates(query, n_results=1, mode="hybrid")
+        print(f"Dense top: {dense[0]['id']}, hybrid top: {hybrid[0]['id']}")
+        assert dense[0]['id'] != "graphql_dev"
+        assert hybrid[0]['id'] == "graphql_dev"
+        assert 'rrf_score' in hybrid[0]
+        assert hybrid[0]['distance'] is not None
+        assert set(hybrid[0].keys()) >= {'id', 'content', 'metadata', 'distance'}
+
+        # BM25-only hits still go through the where clause
+        filtered = vector_db.search_candidates(query, n_results=4, mode="hybrid",
+                                               filters={'experience_years': {'<=': 5}})
+        assert "graphql_dev" not in [r['id'] for r in filtered]
+
+        # Distances given to BM25-only hits match what ChromaDB reports for the same documents
+        all_dense = {r['id']: r['distance'] for r in vector_db.search_candidates(query, n_results=4)}
+        stored = vector_db.collections["candidates"].get(ids=list(all_dense), include=['embeddings'])
+        computed = vector_db._embedding_distances('l2', vector_db.embed_queries([query])[0], stored['embeddings'])
+        for doc_id, distance in zip(stored['ids'], computed):
+            assert abs(distance - all_dense[doc_id]) < 1e-3
+
+        # A single write rebuilds the index in the background, not on the caller's path
+        index_version = vector_db.get_bm25_index().collection_version
+        vector_db.upsert_candidates([("Kai Wu", "Rust Tokio systems engineer", {'experience_years': 4.0})])
+        vector_db._background_rebuild.join()
+        assert vector_db._bm25_index.collection_version == vector_db.collection_version() > index_version
+        rust_hits = vector_db.search_candidates("Rust Tokio", n_results=1, mode="hybrid")
+        assert rust_hits[0]['metadata']['candidate_name'] == "Kai Wu"
+
+        # Inside a write batch the index is rebuilt once, when the batch ends
+        rebuilds = []
+        rebuild = vector_db.rebuild_bm25_index
+        vector_db.rebuild_bm25_index = lambda documents=None: rebuilds.append(1) or rebuild(documents)
+        with vector_db.write_batch():
+            vector_db.upsert_candidates([("Ana Lee", "Elixir Phoenix engineer", {'experience_years': 3.0})])
+            vector_db.upsert_candidates([("Bo Chen", "Scala Akka engineer", {'experience_years': 7.0})])
+            assert rebuilds == []
+        assert rebuilds == [1]
+
+        # An index behind the collection (a write it has not seen) is served while it is rebuilt
+        vector_db.bump_collection_version()
+        stale = vector_db.get_bm25_index()
+        print(f"Stale index version {stale.collection_version}, collection {vector_db.collection_version()}")
+        assert stale.collection_version < vector_db.collection_version()
+        vector_db._background_rebuild.join()
+        assert vector_db.get_bm25_index().collection_version == vector_db.collection_version()
+
+    print("✅ Hybrid search tests passed")
+
+
+if __name__ == "__main__":
+    test_bm25_index_build_and_search()
+    test_hybrid_candidate_search()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test ingest-time near-duplicate clustering
+Checks cluster assignment, persistence through metadata, and the cluster report
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.duplicate_clusters import DuplicateClusterIndex, build_cluster_report
+from utils.near_duplicates import MinHasher, default_minhasher
+from services.ingestion_pipeline import ResumeIngestionPipeline
+from services.extraction_cache import ExtractionCache
+from test_ingestion_pipeline import RecordingVectorDB, _make_resume_dir
+
+
+def test_cluster_assignment():
+    """Near-identical texts and shared contacts join one cluster; distinct texts do not"""
+
+    print("🧪 TESTING DUPLICATE CLUSTER ASSIGNMENT")
+    print("=" * 60)
+
+    base = ("Jane Doe - Senior Data Engineer. Eight years building Spark and Airflow pipelines on AWS, "
+            "leading a team of five, migrating warehouses to Snowflake and mentoring analysts. ") * 3
+    near_copy = base.replace("five", "six", 1)
+    other = ("John Roe - Frontend Developer. React, TypeScript and design systems for e-commerce, "
+             "accessibility audits and performance budgets across mobile web. ") * 3
+
+    index = DuplicateClusterIndex()
+    cluster_a, signature = index.assign("a", base, {'email': 'jane@example.com'})
+    cluster_b, _ = index.assign("b", near_copy, {})
+    cluster_c, _ = index.assign("c", other, {})
+    cluster_d, _ = index.assign("d", "completely different text about gardening", {'email': 'JANE@example.com '})
+
+    print(f"Clusters: {cluster_a}, {cluster_b}, {cluster_c}, {cluster_d}")
+    assert cluster_a == cluster_b == cluster_d
+    assert cluster_c != cluster_a
+    assert index.assign("a", base, {})[0] == cluster_a
+
+    # An index rebuilt from stored metadata assigns the same clusters
+    entries = [("a", {'dup_cluster_id': cluster_a, 'minhash_signature': signature,
+                      'email': 'jane@example.com'})]
+    rebuilt = DuplicateClusterIndex.from_metadata(entries + [("legacy", {'candidate_name': 'Old'})])
+    assert rebuilt.assign("b", near_copy, {})[0] == cluster_a
+
+    print("✅ Cluster assignment tests passed")
+
+
+# One layout, different people: the Jaccard of these texts (0.7-0.77) is what templated resumes reach
+TEMPLATE = ("{name}\n{email} | {phone} | {city}\n\nPROFESSIONAL SUMMARY\nSoftware Engineering Executive with "
+            "{years} years of experience leading engineering organizations, scaling platforms and building "
+            "high-performing teams.\n\nCORE COMPETENCIES\nEngineering Leadership, Cloud Architecture, Agile Delivery, "
+            "Budget Management, Stakeholder Communication, {skill}\n\nPROFESSIONAL EXPERIENCE\nVP of Engineering - "
+            "{company} ({start} - Present)\n- Led a team of {team} engineers across three product lines\n"
+            "- Reduced infrastructure costs by {saving}% through cloud migration\n"
+            "- Introduced quarterly planning, incident reviews and an engineering career ladder\n"
+            "- Partnered with product and sales leadership on roadmap and enterprise customer commitments\n"
+            "- Built hiring pipelines, onboarding programs and mentoring for new engineering managers\n"
+            "Director of Engineering - Previous Company\n- Owned platform reliability and on-call practices\n"
+            "- Delivered the migration from a monolith to services with zero customer downtime\n\nEDUCATION\n{degree}, {school}\n")
+PEOPLE = [
+    dict(name="Zara Ibrahim", email="zara.ibrahim@email.com", phone="+1-555-0110", city="Seattle, WA", years=15,
+         skill="Kubernetes", company="Northwind Systems", start=2016, team=120, saving=30,
+         degree="MS Computer Science", school="University of Washington"),
+    dict(name="Nour Khalil", email="nour.khalil@email.com", phone="+1-555-0192", city="Austin, TX", years=12,
+         skill="Data Platforms", company="Contoso Labs", start=2018, team=85, saving=25,
+         degree="BS Software Engineering", school="UT Austin"),
+    dict(name="Diego Alvarez", email="d.alvarez@email.com", phone="+1-555-0147", city="Denver, CO", years=18,
+         skill="Security", company="Fabrikam Inc", start=2014, team=200, saving=40,
+         degree="MBA", school="Colorado State University"),
+]
+
+
+def test_templated_resumes_stay_separate():
+    """Resumes sharing a template but not a person get separate clusters, and clusters do not chain"""
+
+    print("\n🧪 TESTING TEMPLATED RESUMES")
+    print("=" * 60)
+
+    texts = [TEMPLATE.format(**person) for person in PEOPLE]
+    signatures = [default_minhasher.signature(text) for text in texts]
+    similarities = [MinHasher.estimate_jaccard(signatures[0], signature) for signature in signatures[1:]]
+    print(f"Template similarities: {similarities}")
+    assert all(similarity >= 0.7 for similarity in similarities)
+
+    index = DuplicateClusterIndex()
+    clusters = [index.assign(person['name'], text, {'email': person['email'], 'phone': person['phone']})[0]
+                for person, text in zip(PEOPLE, texts)]
+    assert len(set(clusters)) == len(PEOPLE)
+
+    # Line-by-line blends of two people: B is near-identical to A and C to B, but C is not to A,
+    # so C must not reach A's cluster through B
+    lines_a, lines_b = texts[0].split('\n'), texts[1].split('\n')
+    chain = [texts[0], '\n'.join(lines_a[:16] + lines_b[16:]), '\n'.join(lines_a[:9] + lines_b[9:])]
+    chain_signatures = [default_minhasher.signature(text) for text in chain]
+    assert MinHasher.estimate_jaccard(chain_signatures[0], chain_signatures[1]) >= 0.9
+    assert MinHasher.estimate_jaccard(chain_signatures[1], chain_signatures[2]) >= 0.9
+    assert MinHasher.estimate_jaccard(chain_signatures[0], chain_signatures[2]) < 0.9
+    chained = DuplicateClusterIndex()
+    chain_clusters = [chained.assign(f"chain_{i}", text, {})[0] for i, text in enumerate(chain)]
+    print(f"Chain clusters: {chain_clusters}")
+    assert chain_clusters[0] == chain_clusters[1] != chain_clusters[2]
+
+    print("✅ Templated resume tests passed")
+
+
+def test_pipeline_stores_clusters_and_report():
+    """Ingested copies of one PDF share a dup_cluster_id and show up in the report"""
+
+    print("\n🧪 TESTING INGEST-TIME CLUSTERS")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        resumes_dir = _make_resume_dir(tmp_dir, 3)
+        first_pdf = sorted(resumes_dir.glob("*.pdf"))[0]
+        shutil.copy(first_pdf, resumes_dir / ("copy_of_" + first_pdf.name))
+
+        vector_db = RecordingVectorDB(os.path.join(tmp_dir, "db"))
+        cache = ExtractionCache(os.path.join(tmp_dir, "cache.sqlite3"))
+        ResumeIngestionPipeline(vector_db, workers=1, batch_size=2, checkpoint_path=None, cache=cache).run(resumes_dir)
+
+        clusters = {meta['pdf_filename']: meta['dup_cluster_id'] for meta in vector_db.stored.values()}
+        print(f"Clusters by file: {clusters}")
+        assert clusters[first_pdf.name] == clusters["copy_of_" + first_pdf.name]
+        assert len(set(clusters.values())) == 3
+
+        report = build_cluster_report(list(vector_db.stored.items()))
+        print(f"Report: { {k: v for k, v in report.items() if k != 'clusters'} }")
+        assert report['total_candidates'] == 4
+        assert report['duplicate_clusters'] == 1
+        assert report['clusters'][0]['size'] == 2
+        assert report['unclustered_candidates'] == 0
+
+    print("✅ Ingest-time cluster tests passed")
+
+
+if __name__ == "__main__":
+    test_cluster_assignment()
+    test_templated_resumes_stay_separate()
+    test_pipeline_stores_clusters_and_report()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test embedding provider configuration and the collection model-id check
+No model is downloaded: the sentence-transformers model only loads on first embed
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.embedding_provider import (
+    EMBEDDING_MODEL_METADATA_KEY, DEFAULT_MODEL_ID, EmbeddingConfig,
+    EmbeddingModelMismatchError, LocalSentenceTransformerEmbedding, create_embedding_function,
+    quantized_onnx_file
+)
+from services.vector_db import HybridVectorDB
+
+
+def test_embedding_config_from_env():
+    """HR_EMBEDDING_* variables configure the provider; model id ignores runtime-only options"""
+
+    print("🧪 TESTING EMBEDDING CONFIG")
+    print("=" * 60)
+
+    env = {
+        'HR_EMBEDDING_PROVIDER': 'sentence-transformers',
+        'HR_EMBEDDING_MODEL': 'all-MiniLM-L6-v2',
+        'HR_EMBEDDING_BATCH_SIZE': '128',
+        'HR_EMBEDDING_MAX_SEQ_LENGTH': '256',
+        'HR_EMBEDDING_THREADS': '4',
+        'HR_EMBEDDING_BACKEND': 'onnx',
+        'HR_EMBEDDING_QUANTIZED': 'true'
+    }
+    saved = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    try:
+        config = EmbeddingConfig.from_env()
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    print(f"Config: {config}")
+    assert config.provider == "sentence-transformers"
+    assert (config.batch_size, config.max_seq_length, config.threads) == (128, 256, 4)
+    assert config.backend == "onnx" and config.quantized
+    assert config.model_id == "sentence-transformers/all-MiniLM-L6-v2"
+    assert EmbeddingConfig(provider="sentence-transformers", batch_size=8).model_id == config.model_id
+    assert EmbeddingConfig().model_id == DEFAULT_MODEL_ID
+
+    assert create_embedding_function(EmbeddingConfig()) is None
+    embedding_function = create_embedding_function(config)
+    assert isinstance(embedding_function, LocalSentenceTransformerEmbedding)
+    assert LocalSentenceTransformerEmbedding.build_from_config(embedding_function.get_config()).config == config
+
+    # The quantized ONNX export follows the CPU; VNNI kernels only where the CPU has them
+    assert quantized_onnx_file({'avx2', 'avx512f', 'avx512_vnni'}) == "onnx/model_qint8_avx512_vnni.onnx"
+    assert quantized_onnx_file({'avx2', 'avx512f'}) == "onnx/model_qint8_avx512.onnx"
+    assert quantized_onnx_file({'sse4_2', 'avx2'}) == "onnx/model_quint8_avx2.onnx"
+    assert quantized_onnx_file({'arm64'}) == "onnx/model_qint8_arm64.onnx"
+    assert quantized_onnx_file({'sse4_2'}) is None
+
+    print("✅ Embedding config tests passed")
+
+
+def test_collection_model_mismatch_refused():
+    """The model id is stamped on new collections and a different model is refused at startup"""
+
+    print("🧪 TESTING EMBEDDING MODEL CHECK")
+    print("=" * 60)
+
+    local_config = EmbeddingConfig(provider="sentence-transformers", model_name="all-MiniLM-L6-v2")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        persist_directory = os.path.join(tmp_dir, "db")
+        vector_db = HybridVectorDB(persist_directory=persist_directory, embedding_config=local_config)
+        metadata = vector_db.collections["candidates"].metadata
+        print(f"Candidates collection metadata: {metadata}")
+        assert metadata[EMBEDDING_MODEL_METADATA_KEY] == local_config.model_id
+        assert metadata["description"]
+
+        # Runtime-only options do not matter
+        HybridVectorDB(persist_directory=persist_directory,
+                       embedding_config=EmbeddingConfig(provider="sentence-transformers",
+                                                        model_name="all-MiniLM-L6-v2", batch_size=16))
+
+        try:
+            HybridVectorDB(persist_directory=persist_directory, embedding_config=EmbeddingConfig())
+            raise AssertionError("Mismatched embedding model was accepted")
+        except EmbeddingModelMismatchError as e:
+            print(f"Refused: {e}")
+            assert local_config.model_id in str(e)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Legacy collection: data but no recorded model id -> built-in model assumed
+        persist_directory = os.path.join(tmp_dir, "db")
+        vector_db = HybridVectorDB(persist_directory=persist_directory, embedding_config=EmbeddingConfig())
+        collection = vector_db.collections["candidates"]
+        collection.add(ids=["legacy"], documents=["legacy resume"], embeddings=[[0.1] * 384])
+        collection.modify(metadata={"description": "Candidate resumes - no chunking, unique IDs"})
+
+        try:
+            HybridVectorDB(persist_directory=persist_directory, embedding_config=local_config)
+            raise AssertionError("Legacy collection accepted a different embedding model")
+        except EmbeddingModelMismatchError:
+            pass
+        reopened = HybridVectorDB(persist_directory=persist_directory, embedding_config=EmbeddingConfig())
+        assert reopened.collections["candidates"].metadata[EMBEDDING_MODEL_METADATA_KEY] == DEFAULT_MODEL_ID
+
+    print("✅ Embedding model check tests passed")
+
+
+if __name__ == "__main__":
+    test_embedding_config_from_env()
+    test_collection_model_mismatch_refused()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test the per-JD criteria and component-score cache of the candidate evaluator
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.candidate_evaluator import CandidateEvaluator
+from services.evaluation_cache import EvaluationCache
+from services.tfidf_model import CorpusTfidfModel
+from test_batch_evaluator import JOB_DESCRIPTIONS, _make_candidates, _score_fields
+
+NEW_WEIGHTS = {'semantic': 0.1, 'skills': 0.5, 'experience': 0.2, 'certification': 0.1, 'role_fit': 0.1}
+
+
+def _counting(evaluator, method_name):
+    """Wrap an evaluator method so its calls are recorded"""
+    calls = []
+    method = getattr(evaluator, method_name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return method(*args, **kwargs)
+
+    setattr(evaluator, method_name, wrapper)
+    return calls
+
+
+def test_recombination_uses_cached_components():
+    """New weights or threshold rescore from cached components, identical to a fresh evaluation"""
+
+    print("🧪 TESTING EVALUATION CACHE RECOMBINATION")
+    print("=" * 60)
+
+    candidates = _make_candidates(200)
+    model = CorpusTfidfModel.build([(c['id'], c['content']) for c in candidates], collection_version=4)
+    job_description = JOB_DESCRIPTIONS[0]
+    reference = CandidateEvaluator(corpus_model_loader=lambda: model, evaluation_cache_loader=None)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = EvaluationCache(os.path.join(tmp_dir, "evaluation_cache.sqlite3"))
+        evaluator = CandidateEvaluator(corpus_model_loader=lambda: model, evaluation_cache_loader=lambda: cache)
+        parses = _counting(evaluator, '_parse_evaluation_criteria')
+        computations = _counting(evaluator, '_keyword_components')
+
+        first = evaluator.evaluate_candidates(candidates, job_description)
+        assert len(parses) == 1 and len(computations) == 1
+
+        for weights, threshold in ((None, None), (NEW_WEIGHTS, None), (None, 0.45), (NEW_WEIGHTS, 0.5)):
+            results = evaluator.evaluate_candidates(candidates, job_description, weights, threshold)
+            expected = reference.evaluate_candidates(candidates, job_description, weights, threshold)
+            for key in ('selected_candidates', 'rejected_candidates'):
+                assert ([_score_fields(result['score']) for result in results[key]] ==
+                        [_score_fields(result['score']) for result in expected[key]]), (weights, threshold)
+            assert results['summary'] == expected['summary']
+        print(f"Selected: default={len(first['selected_candidates'])}, "
+              f"threshold 0.45={len(results['selected_candidates'])}")
+
+        # Only the first run parsed the JD or scanned resume text
+        assert len(parses) == 1
+        assert sum(len(args[0]) for args in computations) == 201
+        stats = cache.stats()
+        print(f"Cache stats: {stats}")
+        assert stats['component_entries'] == 201 and stats['criteria_entries'] == 1
+
+        # A changed resume is recomputed; the others still come from the cache
+        edited = [dict(candidate) for candidate in candidates]
+        edited[7] = {**edited[7], 'content': edited[7]['content'] + " kubernetes docker"}
+        scores = evaluator.evaluate_candidates_batch(edited, job_description)
+        assert sum(len(args[0]) for args in computations) == 202 and computations[-1][0][0]['id'] == edited[7]['id']
+        assert _score_fields(scores[7]) == _score_fields(reference.evaluate_candidates_batch(edited, job_description)[7])
+
+        # Entries persist across instances
+        reopened = CandidateEvaluator(corpus_model_loader=lambda: model,
+                                      evaluation_cache_loader=lambda: EvaluationCache(cache.cache_path))
+        reopened_computations = _counting(reopened, '_keyword_components')
+        reopened.evaluate_candidates_batch(edited[:50], job_description)
+        assert reopened_computations == []
+
+        cache.clear()
+        assert cache.stats()['component_entries'] == 0
+
+    print("✅ Evaluation cache recombination tests passed")
+
+
+def test_model_change_invalidates_components():
+    """Scores cached under one TF-IDF model are not reused with another"""
+
+    print("🧪 TESTING EVALUATION CACHE INVALIDATION")
+    print("=" * 60)
+
+    candidates = _make_candidates(20, seed=2)
+    models = [CorpusTfidfModel.build([(c['id'], c['content']) for c in candidates], collection_version=version)
+              for version in (1, 2)]
+    current = [models[0]]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = EvaluationCache(os.path.join(tmp_dir, "evaluation_cache.sqlite3"))
+        evaluator = CandidateEvaluator(corpus_model_loader=lambda: current[0], evaluation_cache_loader=lambda: cache)
+        computations = _counting(evaluator, '_keyword_components')
+
+        computed = []
+        for job_description, model in ((JOB_DESCRIPTIONS[1], models[0]), (JOB_DESCRIPTIONS[1], models[0]),
+                                       (JOB_DESCRIPTIONS[1], models[1]),
+                                       # A different JD is keyed separately
+                                       (JOB_DESCRIPTIONS[2], models[1])):
+            current[0] = model
+            before = sum(len(args[0]) for args in computations)
+            evaluator.evaluate_candidates_batch(candidates, job_description)
+            computed.append(sum(len(args[0]) for args in computations) - before)
+        assert computed == [21, 0, 21, 21]
+
+    print("✅ Evaluation cache invalidation tests passed")
+
+
+if __name__ == "__main__":
+    test_recombination_uses_cached_components()
+    test_model_change_invalidates_components()
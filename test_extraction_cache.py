@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test the content-addressed extraction cache
+"""
+
+import os
+import sys
+import json
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.extraction_cache import ExtractionCache
+from services.local_metadata_extractor import local_metadata_extractor
+
+
+def test_extraction_cache_hits_and_misses():
+    """Text and metadata round-trip through the cache with hit/miss counters"""
+
+    print("🧪 TESTING EXTRACTION CACHE")
+    print("=" * 60)
+
+    pdf_file = sorted(Path("sample_resumes").glob("*.pdf"))[0]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ExtractionCache(os.path.join(tmp_dir, "cache.sqlite3"))
+
+        first = cache.extract_text(pdf_file)
+        second = cache.extract_text(pdf_file)
+        assert first == second
+
+        sha256 = cache.file_sha256(pdf_file)
+        metadata = cache.extract_metadata(sha256, first)
+        cached_metadata = cache.extract_metadata(sha256, first)
+        assert cached_metadata == metadata
+        assert cached_metadata == local_metadata_extractor.extract_metadata(first)
+
+        # A fresh instance on the same file sees the persisted entry
+        reopened = ExtractionCache(os.path.join(tmp_dir, "cache.sqlite3"))
+        text, processor = reopened.get_text(sha256)
+        print(f"Winning processor: {processor}")
+        assert text == first
+
+        stats = cache.stats()
+        print(f"Cache stats: {stats}")
+        assert stats['text_hits'] == 1 and stats['text_misses'] == 1
+        assert stats['metadata_hits'] == 1 and stats['metadata_misses'] == 1
+        assert stats['entries'] == 1
+
+    print("✅ Extraction cache tests passed")
+
+
+def test_extraction_cache_eviction():
+    """Least-recently-used entries are evicted once the size budget is exceeded"""
+
+    print("\n🧪 TESTING EXTRACTION CACHE EVICTION")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ExtractionCache(os.path.join(tmp_dir, "cache.sqlite3"), max_size_bytes=1000)
+
+        for i in range(10):
+            cache.put_text(f"hash{i}", "x" * 200, "test")
+        cache.get_text("hash0")  # keep the oldest entry warm
+        cache.evict()
+
+        stats = cache.stats()
+        print(f"After eviction: {stats['entries']} entries, {stats['size_bytes']} bytes")
+        assert stats['size_bytes'] <= 900
+        assert cache.get_text("hash0") is not None
+        assert cache.get_text("hash1") is None
+
+    print("✅ Eviction tests passed")
+
+
+def test_extraction_cache_size_accounting():
+    """Overwrites replace a row's size instead of adding to it; sizes are UTF-8 bytes"""
+
+    print("\n🧪 TESTING EXTRACTION CACHE SIZE ACCOUNTING")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ExtractionCache(os.path.join(tmp_dir, "cache.sqlite3"))
+        metadata = local_metadata_extractor.extract_metadata("Jane Doe\nPython developer")
+        metadata_size = len(json.dumps(asdict(metadata)).encode('utf-8'))
+
+        cache.put_metadata("hash0", metadata)
+        cache.put_text("hash0", "x" * 300, "test")
+        cache.put_text("hash0", "é" * 100, "test")
+        cache.put_metadata("hash0", metadata)
+        cache.put_text("hash1", "y" * 50, "test")
+        cache.put_text("hash1", "y" * 10, "test")
+
+        stats = cache.stats()
+        print(f"Size after overwrites: {stats['size_bytes']} bytes")
+        assert stats['entries'] == 2
+        assert stats['size_bytes'] == 200 + metadata_size + 10
+
+    print("✅ Size accounting tests passed")
+
+
+if __name__ == "__main__":
+    test_extraction_cache_hits_and_misses()
+    test_extraction_cache_eviction()
+    test_extraction_cache_size_accounting()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test configurable HNSW settings and the collection migration
+Entries are added with explicit embeddings so no embedding model is needed
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.hnsw_config import HNSWConfig
+from services.vector_db import HybridVectorDB
+from tools.candidate_shortlist import CandidateShortlistTool
+
+
+def test_hnsw_config_from_env():
+    """Global HR_HNSW_* settings with per-collection overrides"""
+
+    print("🧪 TESTING HNSW CONFIG")
+    print("=" * 60)
+
+    env = {'HR_HNSW_M': '32', 'HR_HNSW_CANDIDATES_EF_SEARCH': '64', 'HR_HNSW_SPACE': 'IP'}
+    saved = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    try:
+        candidates = HNSWConfig.from_env("candidates")
+        jobs = HNSWConfig.from_env("job_descriptions")
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    print(f"Candidates: {candidates}, jobs: {jobs}")
+    assert (candidates.space, candidates.max_neighbors, candidates.ef_search) == ("ip", 32, 64)
+    assert (jobs.max_neighbors, jobs.ef_search) == (32, 100)
+    assert HNSWConfig().space == "cosine"
+    try:
+        HNSWConfig(space="manhattan")
+        raise AssertionError("Unsupported space accepted")
+    except ValueError:
+        pass
+
+    print("✅ HNSW config tests passed")
+
+
+def test_collection_migration():
+    """Legacy L2 collections are detected and migrated to cosine without re-embedding"""
+
+    print("🧪 TESTING HNSW MIGRATION")
+    print("=" * 60)
+
+    rng = np.random.default_rng(3)
+    embeddings = rng.normal(size=(30, 8)).astype(np.float32)
+    ids = [f"cand_{i}" for i in range(30)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        persist_directory = os.path.join(tmp_dir, "db")
+        legacy_configs = {"candidates": HNSWConfig(space="l2")}
+        vector_db = HybridVectorDB(persist_directory=persist_directory, hnsw_configs=legacy_configs)
+        collection = vector_db.collections["candidates"]
+        collection.add(ids=ids, embeddings=embeddings, documents=[f"resume {i}" for i in ids],
+                       metadatas=[{"experience_years": float(i)} for i in range(30)])
+
+        # New collections use the configured (cosine) settings; the old one is reported as l2
+        vector_db = HybridVectorDB(persist_directory=persist_directory)
+        assert vector_db.index_settings["candidates"].space == "l2"
+        assert vector_db.index_settings["job_descriptions"].space == "cosine"
+        assert vector_db.distance_space() == "l2"
+        assert vector_db.pending_migrations() == {"candidates": ["space: l2 -> cosine"]}
+
+        query = embeddings[0] * 3
+        l2_results = vector_db.collections["candidates"].query(query_embeddings=[query], n_results=3)
+        version = vector_db.collection_version()
+
+        result = vector_db.migrate_collection("candidates", HNSWConfig(space="cosine", max_neighbors=32))
+        print(f"Migration: {result['entries']} entries, {result['previous'].space} -> {result['current'].space}")
+        assert result['entries'] == 30
+        assert vector_db.index_settings["candidates"].space == "cosine"
+        assert vector_db.index_settings["candidates"].max_neighbors == 32
+        assert vector_db.collection_version() > version
+        assert vector_db.distance_space() == "cosine" and vector_db.pending_migrations() == {}
+
+        migrated = vector_db.collections["candidates"]
+        assert migrated.name == "candidates_hybrid"
+        assert migrated.count() == 30
+        stored = migrated.get(ids=["cand_5"], include=['documents', 'metadatas', 'embeddings'])
+        assert stored['documents'] == ["resume cand_5"]
+        assert stored['metadatas'][0]["experience_years"] == 5.0
+        assert np.allclose(stored['embeddings'][0], embeddings[5])
+
+        # Cosine distance ignores the query's scale: the same vector is now at distance ~0
+        cosine_results = migrated.query(query_embeddings=[query], n_results=3)
+        print(f"Top distance l2={l2_results['distances'][0][0]:.3f} cosine={cosine_results['distances'][0][0]:.3f}")
+        assert cosine_results['ids'][0][0] == "cand_0"
+        assert cosine_results['distances'][0][0] < 1e-3 < l2_results['distances'][0][0]
+
+        # search_ef alone changes in place
+        in_place = vector_db.migrate_collection("candidates", HNSWConfig(space="cosine", max_neighbors=32, ef_search=50))
+        assert in_place['entries'] == 0
+        assert vector_db.index_settings["candidates"].ef_search == 50
+
+        # A migration interrupted after dropping the old collection is completed on startup
+        vector_db.client.get_collection("candidates_hybrid").modify(name="candidates_hybrid_migrating")
+        recovered = HybridVectorDB(persist_directory=persist_directory)
+        assert recovered.collections["candidates"].count() == 30
+
+    print("✅ HNSW migration tests passed")
+
+
+def test_match_score_per_space():
+    """The shortlist converts each space's distance to the same similarity"""
+
+    print("🧪 TESTING MATCH SCORE PER DISTANCE SPACE")
+    print("=" * 60)
+
+    rng = np.random.default_rng(5)
+    vectors = rng.normal(size=(20, 8))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    query = vectors[0]
+    for vector in vectors:
+        similarity = float(query @ vector)
+        distances = {'cosine': 1 - similarity, 'ip': 1 - similarity, 'l2': float(np.sum((query - vector) ** 2))}
+        scores = {space: CandidateShortlistTool._match_score(distance, space) for space, distance in distances.items()}
+        expected = max(0.0, similarity)
+        assert all(abs(score - expected) < 1e-9 for score in scores.values()), scores
+
+    assert CandidateShortlistTool._match_score(None, "cosine") == 0.0
+    assert CandidateShortlistTool._match_score(4.0, "l2") == 0.0
+
+    print("✅ Match score conversion tests passed")
+
+
+if __name__ == "__main__":
+    test_hnsw_config_from_env()
+    test_collection_migration()
+    test_match_score_per_space()
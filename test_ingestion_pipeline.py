@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Test the bulk ingestion pipeline
+Checks batching, checkpointing and resume after an interrupted run
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.vector_db import HybridVectorDB
+from services.ingestion_pipeline import ResumeIngestionPipeline, IngestionCheckpoint
+from services.extraction_cache import ExtractionCache
+
+
+class RecordingVectorDB(HybridVectorDB):
+    """HybridVectorDB that records upsert batches instead of embedding them"""
+
+    def __init__(self, persist_directory: str, fail_on_batch: int = None):
+        super().__init__(persist_directory=persist_directory)
+        self.batches = []
+        self.fail_on_batch = fail_on_batch
+        self.stored = {}
+        self.deleted = []
+
+    def upsert_candidates(self, records):
+        if self.fail_on_batch is not None and len(self.batches) + 1 == self.fail_on_batch:
+            raise RuntimeError("simulated interruption")
+        prepared = [self._prepare_candidate_record(*record) for record in records]
+        self.stored.update(prepared)
+        self.batches.append([unique_id for unique_id, _ in prepared])
+        return self.batches[-1]
+
+    def get_all_candidate_metadata(self, page_size: int = 1000):
+        return list(self.stored.items())
+
+    def delete_candidates(self, unique_ids):
+        for unique_id in unique_ids:
+            self.stored.pop(unique_id, None)
+        self.deleted.extend(unique_ids)
+
+    def update_file_stats(self, file_stats):
+        for unique_id, stat in file_stats.items():
+            self.stored[unique_id] = {**self.stored[unique_id], **stat}
+
+
+def _make_resume_dir(tmp_dir: str, count: int) -> Path:
+    resumes_dir = Path(tmp_dir) / "resumes"
+    resumes_dir.mkdir()
+    for pdf_file in sorted(Path("sample_resumes").glob("*.pdf"))[:count]:
+        shutil.copy(pdf_file, resumes_dir / pdf_file.name)
+    return resumes_dir
+
+
+def test_checkpoint_roundtrip():
+    """Checkpoint entries survive a reload and are invalidated by file changes"""
+
+    print("🧪 TESTING INGESTION CHECKPOINT")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_file = Path(tmp_dir) / "resume.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4 test")
+        checkpoint_path = os.path.join(tmp_dir, "checkpoint.json")
+
+        checkpoint = IngestionCheckpoint(checkpoint_path)
+        assert not checkpoint.is_done(pdf_file)
+        checkpoint.mark([pdf_file])
+
+        reloaded = IngestionCheckpoint(checkpoint_path)
+        print(f"Done after reload: {reloaded.is_done(pdf_file)}")
+        assert reloaded.is_done(pdf_file)
+
+        pdf_file.write_bytes(b"%PDF-1.4 test, modified")
+        print(f"Done after modification: {reloaded.is_done(pdf_file)}")
+        assert not reloaded.is_done(pdf_file)
+
+        reloaded.clear()
+        assert not os.path.exists(checkpoint_path)
+
+    print("✅ Checkpoint tests passed")
+
+
+def test_pipeline_resumes_after_interruption():
+    """An interrupted run resumes from the last completed batch"""
+
+    print("\n🧪 TESTING PIPELINE RESUME")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        resumes_dir = _make_resume_dir(tmp_dir, 5)
+        checkpoint_path = os.path.join(tmp_dir, "checkpoint.json")
+        cache = ExtractionCache(os.path.join(tmp_dir, "cache.sqlite3"))
+
+        # First run dies while writing the second batch
+        vector_db = RecordingVectorDB(os.path.join(tmp_dir, "db"), fail_on_batch=2)
+        pipeline = ResumeIngestionPipeline(vector_db, workers=2, batch_size=2,
+                                           checkpoint_path=checkpoint_path, cache=cache)
+        try:
+            pipeline.run(resumes_dir)
+            raise AssertionError("expected simulated interruption")
+        except RuntimeError as e:
+            print(f"First run interrupted: {e}")
+
+        first_run_ids = [uid for batch in vector_db.batches for uid in batch]
+        print(f"Written before interruption: {len(first_run_ids)}")
+        assert len(first_run_ids) == 2
+        assert os.path.exists(checkpoint_path)
+
+        # Second run only processes what is left, then removes the checkpoint
+        vector_db.fail_on_batch = None
+        vector_db.batches = []
+        stats = ResumeIngestionPipeline(vector_db, workers=1, batch_size=2,
+                                        checkpoint_path=checkpoint_path, cache=cache).run(resumes_dir)
+
+        second_run_ids = [uid for batch in vector_db.batches for uid in batch]
+        print(f"Resumed run stats: {stats}")
+        assert stats.resumed_skipped == 2
+        assert stats.upserted == 3
+        assert not set(first_run_ids) & set(second_run_ids)
+        assert not os.path.exists(checkpoint_path)
+
+        # Third run re-parses nothing - every PDF comes from the extraction cache
+        vector_db.batches = []
+        stats = ResumeIngestionPipeline(vector_db, workers=1, batch_size=2,
+                                        checkpoint_path=checkpoint_path, cache=cache).run(resumes_dir)
+        print(f"Cached run stats: {stats}")
+        assert stats.cache_hits == 5
+        assert stats.upserted == 5
+
+    print("✅ Pipeline resume tests passed")
+
+
+def test_incremental_sync():
+    """Sync only re-ingests new/changed PDFs and drops deleted ones"""
+
+    print("\n🧪 TESTING INCREMENTAL SYNC")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        resumes_dir = _make_resume_dir(tmp_dir, 4)
+        cache = ExtractionCache(os.path.join(tmp_dir, "cache.sqlite3"))
+        vector_db = RecordingVectorDB(os.path.join(tmp_dir, "db"))
+
+        def _sync_dir(folder, dry_run=False):
+            vector_db.batches = []
+            vector_db.deleted = []
+            pipeline = ResumeIngestionPipeline(vector_db, workers=1, batch_size=10,
+                                               checkpoint_path=None, cache=cache)
+            return pipeline.sync(folder, dry_run=dry_run)
+
+        def _sync(dry_run=False):
+            return _sync_dir(resumes_dir, dry_run=dry_run)
+
+        plan, stats = _sync()
+        print(f"Initial sync: {plan.summary()}")
+        assert plan.summary()['new'] == 4
+        assert stats.upserted == 4
+
+        # Nothing changed - nothing is embedded
+        plan, stats = _sync()
+        print(f"No-op sync: {plan.summary()}")
+        assert plan.summary()['unchanged'] == 4
+        assert stats.upserted == 0 and not vector_db.batches
+
+        # Touching a file without changing its bytes is still unchanged, and its new stat is recorded
+        pdf_files = sorted(resumes_dir.glob("*.pdf"))
+        os.utime(pdf_files[0], (0, 0))
+        plan, _ = _sync()
+        assert plan.summary()['unchanged'] == 4
+        assert list(plan.file_stats.values()) == [{'file_size': pdf_files[0].stat().st_size, 'file_mtime': 0.0}]
+        assert not vector_db.batches and not vector_db.deleted
+
+        # ...so the next sync takes the size + mtime short-circuit without hashing
+        hashed = []
+        file_sha256 = cache.file_sha256
+        cache.file_sha256 = lambda pdf_file: hashed.append(pdf_file) or file_sha256(pdf_file)
+        plan, _ = _sync()
+        cache.file_sha256 = file_sha256
+        assert plan.summary()['unchanged'] == 4 and not plan.file_stats and not hashed
+
+        # Another spelling of the same folder matches the stored paths
+        plan, _ = _sync_dir(resumes_dir / ".." / "resumes")
+        assert plan.summary() == {'new': 0, 'modified': 0, 'unchanged': 4, 'deleted': 0}
+
+        # A modified resume that fails to re-extract keeps its stored entry
+        original_bytes = pdf_files[0].read_bytes()
+        pdf_files[0].write_bytes(b"not a pdf any more")
+        kept_ids = [uid for uid, meta in vector_db.stored.items() if meta['pdf_file_path'] == str(pdf_files[0])]
+        plan, stats = _sync()
+        assert plan.summary()['modified'] == 1 and stats.failed == 1
+        assert not vector_db.deleted and set(kept_ids) <= set(vector_db.stored)
+        pdf_files[0].write_bytes(original_bytes)
+        _sync()
+
+        # Replace one resume with another's content, delete one, add one
+        shutil.copy(pdf_files[2], pdf_files[1])
+        removed_path = str(pdf_files[3])
+        removed_ids = [uid for uid, meta in vector_db.stored.items() if meta['pdf_file_path'] == removed_path]
+        pdf_files[3].unlink()
+        extra_pdf = sorted(Path("sample_resumes").glob("*.pdf"))[4]
+        shutil.copy(extra_pdf, resumes_dir / extra_pdf.name)
+
+        plan, _ = _sync(dry_run=True)
+        print(f"Dry run: {plan.summary()}")
+        assert plan.summary() == {'new': 1, 'modified': 1, 'unchanged': 2, 'deleted': 1}
+        assert not vector_db.batches and not vector_db.deleted
+
+        plan, stats = _sync()
+        print(f"Incremental sync stats: {stats}")
+        assert stats.upserted == 2
+        assert set(removed_ids) <= set(vector_db.deleted)
+        stored_paths = sorted(meta['pdf_file_path'] for meta in vector_db.stored.values())
+        assert stored_paths == sorted(str(p) for p in resumes_dir.glob("*.pdf"))
+
+    print("✅ Incremental sync tests passed")
+
+
+if __name__ == "__main__":
+    test_checkpoint_roundtrip()
+    test_pipeline_resumes_after_interruption()
+    test_incremental_sync()
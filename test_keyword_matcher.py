@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test the shared single-pass keyword matcher
+Compares every converted call site with the per-keyword loops it replaced
+"""
+
+import os
+import re
+import sys
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.keyword_matcher import KeywordMatcher
+from services.skills_matcher import skills_matcher
+from services.local_metadata_extractor import local_metadata_extractor
+from services.candidate_evaluator import CandidateEvaluator
+from services.enhanced_pdf_processor import enhanced_pdf_processor, RESUME_INDICATORS
+
+EDGE_CASES = [
+    "Java and JavaScript developer; C++/C# and c++11, node.js, Node, ReactJS, react.js.",
+    "Sr. engineer, team lead and tech-lead; intern-turned-principal. email: a@b.co",
+    "Go, golang, R, r-lang, ci/cd via Jenkins; Vue.js + vue; ASP.NET, .NET, GitLab CI",
+    "python3 pandas pd numpy np sklearn scikit learn TF tensorflow torch",
+    "",
+]
+
+
+def _sample_texts(limit: int = 8):
+    texts = list(EDGE_CASES)
+    for pdf_file in sorted(Path("sample_resumes").glob("*.pdf"))[:limit]:
+        texts.append(enhanced_pdf_processor.extract_resume_content(str(pdf_file)))
+    return texts
+
+
+def _reference_skills_from_text(text):
+    text_lower = text.lower()
+    found = set()
+    for canonical, synonyms in skills_matcher.skill_synonyms.items():
+        for synonym in synonyms:
+            if re.search(r'\b' + re.escape(synonym) + r'\b', text_lower):
+                found.add(canonical)
+                break
+    return found
+
+
+def _reference_skills_and_domains(text):
+    text_lower = text.lower()
+    found_skills, domains = [], set()
+    for domain, skills in local_metadata_extractor.skill_keywords.items():
+        domain_skills = [skill for skill in skills if skill.lower() in text_lower]
+        found_skills.extend(domain_skills)
+        if domain_skills:
+            domains.add(domain.replace('_', ' ').title())
+    return found_skills, domains
+
+
+def test_keyword_matcher_semantics():
+    """Substring mode reports overlapping hits; word mode applies \\b like re"""
+
+    print("🧪 TESTING KEYWORD MATCHER")
+    print("=" * 60)
+
+    substring = KeywordMatcher(["java", "javascript", "script", "c++", "sr."])
+    hits = substring.find_all("JavaScript and Sr. C++")
+    print(f"Substring hits: {hits}")
+    assert hits == [(0, "java"), (0, "javascript"), (4, "script"), (15, "sr."), (19, "c++")]
+
+    words = KeywordMatcher(["java", "javascript", "c++", "go"], word_boundaries=True)
+    for text in ["javascript", "java-based", "c++ dev", "c++x", "golang", "go, go"]:
+        expected = {kw for kw in words.keywords if re.search(r'\b' + re.escape(kw) + r'\b', text)}
+        assert words.find_keywords(text) == expected, text
+
+    assert substring.find_keywords("JavaScript and Sr. C++") == {kw for _, kw in hits}
+    for text in EDGE_CASES:
+        assert substring.find_keywords(text) == {kw for kw in substring.keywords if kw in text.lower()}, text
+    assert KeywordMatcher([]).find_all("anything") == []
+    print("✅ Keyword matcher semantics tests passed")
+
+
+def test_call_sites_match_previous_behaviour():
+    """All four converted call sites return exactly what the old loops returned"""
+
+    print("\n🧪 TESTING CONVERTED CALL SITES")
+    print("=" * 60)
+
+    evaluator = CandidateEvaluator()
+    for text in _sample_texts():
+        assert skills_matcher.extract_skills_from_text(text) == _reference_skills_from_text(text)
+
+        found_skills, domains = local_metadata_extractor._extract_skills_and_domains(text)
+        expected_skills, expected_domains = _reference_skills_and_domains(text)
+        assert found_skills == expected_skills
+        assert set(domains) == expected_domains
+
+        text_lower = text.lower()
+        hits = evaluator.role_indicator_matcher.find_keywords(text)
+        for indicators in evaluator.role_indicators.values():
+            for indicator in indicators:
+                assert (indicator in hits) == (indicator in text_lower)
+
+        expected_valid = (len(text.strip()) >= 50 and
+                          sum(1 for indicator in RESUME_INDICATORS if indicator in text_lower) >= 2)
+        assert enhanced_pdf_processor._validate_content(text) == expected_valid
+
+    print("✅ Converted call sites match previous behaviour")
+
+
+if __name__ == "__main__":
+    test_keyword_matcher_semantics()
+    test_call_sites_match_previous_behaviour()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test batched metadata extraction (heading heuristic first, one NER pass for the rest)
+A stand-in spaCy pipeline is used so the test does not need the model installed
+"""
+
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.extraction_cache import ExtractionCache
+from services.local_metadata_extractor import LocalMetadataExtractor, EXTRACTION_METHOD
+
+RESUMES = [
+    "Jane Doe\njane@example.com | +1-555-123-4567\nSenior Python developer with 6 years of experience",
+    "MARIA GARCIA | Austin, TX\nReact and JavaScript engineer, 3 years experience",
+    "RESUME\nPrepared for Acme. Contact Priya Raman at priya@example.com\nData engineer, Python, AWS",
+    "Senior Software Engineer\nKnown as Tom Baker on GitHub\nJava, Spring, 10 years experience",
+    "",
+    "objective: backend role\nAlex Kim\nGo, Docker",
+]
+
+
+class FakeNER:
+    """Stands in for spaCy: PERSON entities are the known names found in each text"""
+
+    pipe_names = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
+    known_names = ["Priya Raman", "Tom Baker", "Jane Doe"]
+
+    def __init__(self):
+        self.calls = []
+
+    def _doc(self, text):
+        ents = [SimpleNamespace(text=name, label_="PERSON") for name in self.known_names if name in text]
+        return SimpleNamespace(ents=ents)
+
+    def pipe(self, texts, disable=(), batch_size=1000, n_process=1):
+        texts = list(texts)
+        self.calls.append({'texts': texts, 'disable': list(disable), 'batch_size': batch_size,
+                           'n_process': n_process})
+        return (self._doc(text) for text in texts)
+
+
+def _extractor_with_fake_ner():
+    extractor = LocalMetadataExtractor()
+    extractor.nlp = FakeNER()
+    extractor.non_ner_pipes = [name for name in extractor.nlp.pipe_names if name != "ner"]
+    return extractor
+
+
+def test_extract_metadata_many():
+    """Batch results equal per-resume results; NER runs once, only where the heuristic fails"""
+
+    print("🧪 TESTING BATCHED METADATA EXTRACTION")
+    print("=" * 60)
+
+    extractor = _extractor_with_fake_ner()
+    batch = extractor.extract_metadata_many(RESUMES, batch_size=16)
+    names = [metadata.candidate_name for metadata in batch]
+    print(f"Names: {names}")
+    assert names == ["Jane Doe", "MARIA GARCIA", "Priya Raman", "Tom Baker", "Unknown", "Alex Kim"]
+    assert all(metadata.extraction_method == EXTRACTION_METHOD for metadata in batch)
+
+    # One pipe call for the three resumes without a name heading, NER only
+    assert len(extractor.nlp.calls) == 1
+    call = extractor.nlp.calls[0]
+    assert call['texts'] == [RESUMES[2], RESUMES[3], RESUMES[5]]
+    assert "ner" not in call['disable'] and "parser" in call['disable'] and "tagger" in call['disable']
+    assert call['batch_size'] == 16
+
+    for resume, metadata in zip(RESUMES, batch):
+        assert extractor.extract_metadata(resume) == metadata
+
+    # Without spaCy the heading and line heuristics still find the plain names
+    plain = LocalMetadataExtractor()
+    plain.nlp = None
+    plain_names = [metadata.candidate_name for metadata in plain.extract_metadata_many(RESUMES)]
+    assert [plain_names[i] for i in (0, 1, 2, 5)] == ["Jane Doe", "MARIA GARCIA", "Unknown", "Alex Kim"]
+
+    print("✅ Batched metadata extraction tests passed")
+
+
+def test_extraction_cache_batch():
+    """The cache extracts only missing entries, and re-extracts metadata from an older method"""
+
+    print("🧪 TESTING EXTRACTION CACHE BATCH METADATA")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ExtractionCache(os.path.join(tmp_dir, "cache.sqlite3"))
+        items = [(f"sha{i}", text) for i, text in enumerate(RESUMES[:4])]
+
+        first = cache.extract_metadata_many(items)
+        assert cache.counters['metadata_misses'] == 4
+        assert cache.extract_metadata_many(items) == first
+        assert cache.counters['metadata_hits'] == 4
+
+        stale = first[0]
+        stale.extraction_method = "local_spacy_regex"
+        cache.put_metadata("sha0", stale)
+        assert cache.get_metadata("sha0") is None
+        assert cache.extract_metadata_many(items[:1])[0].extraction_method == EXTRACTION_METHOD
+
+    print("✅ Extraction cache batch tests passed")
+
+
+if __name__ == "__main__":
+    test_extract_metadata_many()
+    test_extraction_cache_batch()
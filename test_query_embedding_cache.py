@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test the query embedding cache (memory LRU + SQLite tier) and its use by candidate search
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.embedding_cache import QueryEmbeddingCache, normalize_query
+from test_batch_search import _make_vector_db
+
+
+class CountingEmbedder:
+    """Deterministic embedder recording every batch it is asked to embed"""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(text)), float(sum(map(ord, text)) % 97), 0.5] for text in texts]
+
+
+def test_query_embedding_cache_tiers():
+    """LRU eviction, disk persistence, model-id keying and hit-rate counters"""
+
+    print("🧪 TESTING QUERY EMBEDDING CACHE")
+    print("=" * 60)
+
+    assert normalize_query("  Senior   Python\nDeveloper ") == "Senior Python Developer"
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        disk_path = os.path.join(tmp_dir, "queries.sqlite3")
+        embedder = CountingEmbedder()
+        cache = QueryEmbeddingCache(embedder, "model-a", max_entries=2, disk_path=disk_path)
+
+        first = cache.embed(["python developer", "react  developer", "python developer"])
+        assert embedder.batches == [["python developer", "react developer"]]
+        assert first[0] == first[2]
+
+        # Whitespace variants hit the memory tier
+        assert cache.embed(["python   developer"]) == [first[0]]
+        assert len(embedder.batches) == 1
+
+        # Third distinct query evicts the least recently used entry from memory
+        cache.embed(["java developer"])
+        stats = cache.stats()
+        print(f"Stats: {stats}")
+        assert stats['memory_entries'] == 2
+        assert stats['evictions'] == 1
+
+        # Evicted entry comes back from disk without re-embedding
+        assert cache.embed(["react developer"]) == [first[1]]
+        assert len(embedder.batches) == 2
+        assert cache.stats()['disk_hits'] == 1
+
+        # A fresh process (new cache object) starts warm from disk
+        reloaded_embedder = CountingEmbedder()
+        reloaded = QueryEmbeddingCache(reloaded_embedder, "model-a", disk_path=disk_path)
+        assert reloaded.embed(["java developer", "python developer"]) == cache.embed(["java developer", "python developer"])
+        assert reloaded_embedder.batches == []
+        assert reloaded.stats()['hit_rate'] == 1.0
+
+        # A different embedding model never reuses another model's vectors
+        other_embedder = CountingEmbedder()
+        other = QueryEmbeddingCache(other_embedder, "model-b", disk_path=disk_path)
+        other.embed(["python developer"])
+        assert other_embedder.batches == [["python developer"]]
+        assert other.stats()['hit_rate'] == 0.0
+
+    print("✅ Query embedding cache tests passed")
+
+
+def test_disk_tier_pruning():
+    """The disk tier is pruned every 100 writes (oldest access first), not on every miss"""
+
+    print("🧪 TESTING QUERY EMBEDDING DISK PRUNING")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = QueryEmbeddingCache(CountingEmbedder(), "model-a", max_entries=1,
+                                    disk_path=os.path.join(tmp_dir, "queries.sqlite3"), disk_max_entries=10)
+
+        def disk_keys():
+            return {key for key, in cache._conn.execute("SELECT cache_key FROM query_embeddings")}
+
+        for i in range(99):
+            cache.embed([f"query {i}"])
+        assert len(disk_keys()) == 99
+
+        # A disk hit refreshes the entry's access time (buffered, written with the next write)
+        cache.embed(["query 0"])
+        assert cache.stats()['disk_hits'] == 1
+        cache.embed(["query 99"])
+        keys = disk_keys()
+        print(f"Disk entries after 100 writes: {len(keys)}")
+        assert len(keys) == 10
+        assert cache._cache_key("query 0") in keys and cache._cache_key("query 1") not in keys
+
+        indexes = [row[1] for row in cache._conn.execute("PRAGMA index_list(query_embeddings)")]
+        assert "idx_query_embeddings_access" in indexes
+
+    print("✅ Query embedding disk pruning tests passed")
+
+
+def test_search_uses_cached_query_embeddings():
+    """Repeated candidate searches embed the query once and return identical results"""
+
+    print("🧪 TESTING CACHED QUERY EMBEDDINGS IN SEARCH")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vector_db, embedding = _make_vector_db(tmp_dir)
+
+        first = vector_db.search_candidates("python django", n_results=2)
+        second = vector_db.search_candidates("python  django", n_results=2)
+        batch = vector_db.search_candidates_batch(["python django", "react javascript"], n_results=2)
+
+        print(f"Embedding calls: {embedding.calls}")
+        assert embedding.calls == [1, 1]  # 'python django' once, 'react javascript' once
+        assert [r['id'] for r in first] == [r['id'] for r in second] == [r['id'] for r in batch[0]]
+        assert first[0]['id'] == "python_dev"
+
+        stats = vector_db.query_embedding_stats()['candidates']
+        print(f"Stats: {stats}")
+        assert stats['misses'] == 2
+        assert stats['memory_hits'] == 2
+        assert stats['model_id'] == "keyword-test"
+
+    print("✅ Cached search tests passed")
+
+
+if __name__ == "__main__":
+    test_query_embedding_cache_tiers()
+    test_disk_tier_pruning()
+    test_search_uses_cached_query_embeddings()
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Test the structured shortlist API used by the Streamlit search flow
+Runs against a stub vector database so no embeddings are needed
+"""
+
+import os
+import sys
+import json
+import random
+import time
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import tools.candidate_shortlist as candidate_shortlist
+from tools.candidate_shortlist import CandidateShortlistTool, ShortlistResult
+from services.duplicate_clusters import encode_signature
+from utils.near_duplicates import default_minhasher
+
+
+def _candidate(unique_id, name, experience, distance, skills, email=''):
+    return {
+        'id': unique_id,
+        'content': f"{name} resume. Skills: {skills}. " + unique_id * 20,
+        'metadata': {
+            'unique_id': unique_id,
+            'candidate_name': name,
+            'experience_years': float(experience),
+            'skills': skills,
+            'email': email,
+            'phone': ''
+        },
+        'distance': distance
+    }
+
+
+class StubVectorDB:
+    """Returns a fixed result list and counts searches"""
+
+    def __init__(self, results):
+        self.results = results
+        self.search_calls = 0
+        self.requests = []
+        self.document_fetches = []
+        self.version = 0
+
+    def collection_version(self):
+        return self.version
+
+    def distance_space(self, collection_key="candidates"):
+        return "cosine"
+
+    def search_candidates(self, query, n_results=10, filters=None, mode="vector", include_documents=True):
+        self.search_calls += 1
+        self.requests.append((n_results, filters))
+        results = [dict(result) for result in self.results[:n_results]]
+        if not include_documents:
+            for result in results:
+                result.pop('content', None)
+        return results
+
+    def attach_documents(self, results):
+        documents = {result['id']: result.get('content', '') for result in self.results}
+        missing = [result for result in results if 'content' not in result]
+        if missing:
+            self.document_fetches.append([result['id'] for result in missing])
+        for result in missing:
+            result['content'] = documents.get(result['id'], '')
+        return results
+
+
+def test_shortlist_returns_ranked_candidates():
+    """shortlist() runs one search and returns ranked dicts plus the same text as _run"""
+
+    print("🧪 TESTING STRUCTURED SHORTLIST RESULT")
+    print("=" * 60)
+
+    results = [
+        _candidate("cand_a", "Alice Smith", 5, 0.4, "Python, Django", email="alice@example.com"),
+        _candidate("cand_b", "Bob Jones", 8, 0.5, "React, JavaScript"),
+        # Same email as Alice - a duplicate resume
+        _candidate("cand_c", "Alice M Smith", 5, 0.45, "Python", email="alice@example.com"),
+        _candidate("cand_d", "Carol White", 1, 0.3, "Python, Flask"),
+    ]
+    stub = StubVectorDB(results)
+    original_get_vector_db = candidate_shortlist.get_vector_db
+    candidate_shortlist.get_vector_db = lambda: stub
+    candidate_shortlist.shortlist_result_cache.clear()
+
+    try:
+        tool = CandidateShortlistTool()
+        result = tool.shortlist("Python developer", min_experience=3, max_experience=10, n_candidates=5)
+
+        print(f"Stats: {result.stats}")
+        assert isinstance(result, ShortlistResult)
+        assert stub.search_calls == 1
+        assert result.stats['unique_results'] == 3
+        assert result.stats['experience_filtered'] == 2
+
+        ids = [c['metadata']['unique_id'] for c in result.candidates]
+        print(f"Ranked ids: {ids}")
+        assert set(ids) == {"cand_a", "cand_b"}
+        scores = [c['final_combined_score'] for c in result.candidates]
+        assert scores == sorted(scores, reverse=True)
+        assert "ENHANCED CANDIDATE SHORTLIST" in result.formatted_text
+
+        # _run still returns exactly the formatted text (served from the result cache)
+        assert tool._run("Python developer", 3, 10, 5) == result.formatted_text
+        assert stub.search_calls == 1
+
+        # JSON view carries real metadata, and the report can be skipped entirely
+        lean = tool.shortlist("Python developer", min_experience=3, max_experience=10,
+                              n_candidates=5, format_text=False)
+        assert lean.formatted_text == ""
+        serialized = json.loads(json.dumps(lean.to_dict()))
+        alice = next(c for c in serialized['candidates'] if c['unique_id'] == "cand_a")
+        print(f"Serialized candidate: {alice}")
+        assert alice['email'] == "alice@example.com"
+        assert alice['experience'] == 5.0
+        assert alice['skills'] == "Python, Django"
+        assert [c['unique_id'] for c in serialized['candidates']] == ids
+
+        # No matches still yields a structured (empty) result with the message
+        empty = tool.shortlist("Python developer", min_experience=20, max_experience=30)
+        assert empty.candidates == []
+        assert "No unique candidates found" in empty.formatted_text
+    finally:
+        candidate_shortlist.get_vector_db = original_get_vector_db
+
+    print("✅ Structured shortlist tests passed")
+
+
+def _reference_deduplicate(tool, candidates):
+    """Original pairwise deduplication, used as the oracle"""
+    unique_candidates = []
+    for candidate in candidates:
+        if not tool._is_duplicate_candidate(candidate, unique_candidates):
+            unique_candidates.append(candidate)
+    return unique_candidates
+
+
+def test_indexed_deduplication_matches_pairwise():
+    """Indexed dedup keeps exactly the candidates the pairwise SequenceMatcher scan kept"""
+
+    print("\n🧪 TESTING INDEXED DEDUPLICATION")
+    print("=" * 60)
+
+    rng = random.Random(7)
+    # Resume-like vocabulary: unrelated resumes share few shingles
+    vocabulary = ["".join(rng.choice("abcdefghijklmnop") for _ in range(rng.randint(3, 9)))
+                  for _ in range(2000)]
+    candidates = []
+    for i in range(80):
+        content = " ".join(rng.choice(vocabulary) for _ in range(90))
+        candidates.append(_candidate(f"cand_{i}", f"Person {i}", 5, 0.5, "Python",
+                                     email=f"person{i}@example.com"))
+        candidates[-1]['content'] = content
+        if i % 5 == 0:
+            # Re-extracted copy of the same resume: small edits, no contact details
+            variant = _candidate(f"cand_{i}_copy", f"Person {i}", 5, 0.5, "Python")
+            variant['content'] = content.replace("python", "Python3", 1) + " updated"
+            candidates.append(variant)
+        if i % 7 == 0:
+            # Same person, different file, shared email
+            candidates.append(_candidate(f"cand_{i}_email", f"P. {i}", 5, 0.5, "Python",
+                                         email=f"person{i}@example.com"))
+    rng.shuffle(candidates)
+
+    tool = CandidateShortlistTool()
+    expected = [c['id'] for c in _reference_deduplicate(tool, candidates)]
+    actual = [c['id'] for c in tool._deduplicate_candidates(candidates)]
+
+    print(f"{len(candidates)} candidates -> {len(actual)} unique (pairwise: {len(expected)})")
+    assert actual == expected
+    assert 80 <= len(actual) < len(candidates)
+
+    # A shared dup_cluster_id only picks the pair: the fuzzy check drops the real duplicate
+    # and keeps a distinct candidate that ingest put in the same cluster, as the pairwise scan does
+    clustered = [_candidate(f"clu_{i}", f"Clustered {i}", 5, 0.5, "Python") for i in range(3)]
+    clustered[1]['metadata']['candidate_name'] = "Clustered 0"
+    clustered[1]['content'] = clustered[0]['content'] + " updated"
+    for candidate in clustered:
+        candidate['metadata']['dup_cluster_id'] = "dup_clu_0"
+    assert [c['id'] for c in tool._deduplicate_candidates(clustered)] == ["clu_0", "clu_2"]
+    assert [c['id'] for c in _reference_deduplicate(tool, clustered)] == ["clu_0", "clu_2"]
+
+    # A clustered resume (searched without its text) and a legacy re-extraction of it still collapse
+    resume = candidates[0]['content']
+    clustered_entry = _candidate("clu_resume", "Jordan Reyes", 5, 0.5, "Python")
+    clustered_entry['metadata']['dup_cluster_id'] = "dup_clu_resume"
+    clustered_entry['metadata']['minhash_signature'] = encode_signature(default_minhasher.signature(resume))
+    clustered_entry['content'] = resume
+    legacy_entry = _candidate("legacy_resume", "Jordan Reyes", 5, 0.5, "Python")
+    legacy_entry['content'] = resume + " updated"
+    assert tool._is_duplicate_candidate(legacy_entry, [clustered_entry])
+    for pair in ([clustered_entry, legacy_entry], [legacy_entry, clustered_entry]):
+        stub = StubVectorDB(pair)
+        searched = [{key: value for key, value in entry.items() if key != 'content'}
+                    if entry['metadata'].get('dup_cluster_id') else dict(entry) for entry in pair]
+        unique = list(tool._iter_unique_candidates(searched, load_documents=stub.attach_documents))
+        print(f"{[entry['id'] for entry in pair]} -> {[entry['id'] for entry in unique]}")
+        assert [entry['id'] for entry in unique] == [pair[0]['id']]
+        assert stub.document_fetches == [["clu_resume"]]
+
+    # Ingest clustering missed a near-duplicate (different clusters): the fuzzy check still collapses it
+    other_cluster = _candidate("clu_resume_2", "Jordan Reyes", 5, 0.5, "Python")
+    other_cluster['metadata']['dup_cluster_id'] = "dup_clu_resume_2"
+    other_cluster['metadata']['minhash_signature'] = encode_signature(default_minhasher.signature(resume + " 2024"))
+    other_cluster['content'] = resume + " 2024"
+    stub = StubVectorDB([clustered_entry, other_cluster])
+    searched = [{key: value for key, value in entry.items() if key != 'content'} for entry in stub.results]
+    unique = list(tool._iter_unique_candidates(searched, load_documents=stub.attach_documents))
+    assert [entry['id'] for entry in unique] == ["clu_resume"]
+    assert stub.document_fetches == [["clu_resume_2", "clu_resume"]]
+
+    print("✅ Indexed deduplication tests passed")
+
+
+def test_adaptive_over_fetch():
+    """Filters go to the search and n_results only grows while the filtered pool is short"""
+
+    print("🧪 TESTING ADAPTIVE OVER-FETCH")
+    print("=" * 60)
+
+    # Only every fourth candidate has the required skill
+    results = [_candidate(f"cand_{i:03d}", f"Person{i} Name{i}", 5, 0.2 + i / 1000,
+                          "Rust, Tokio" if i % 4 == 0 else "Cobol")
+               for i in range(200)]
+    rng = random.Random(11)
+    for result in results:
+        # Distinct resume bodies so deduplication keeps every candidate
+        result['content'] += " " + " ".join(f"w{rng.randrange(100000)}" for _ in range(60))
+    stub = StubVectorDB(results)
+    original_get_vector_db = candidate_shortlist.get_vector_db
+    candidate_shortlist.get_vector_db = lambda: stub
+    candidate_shortlist.shortlist_result_cache.clear()
+
+    try:
+        tool = CandidateShortlistTool()
+        result = tool.shortlist("Required Skills: Rust, Tokio", min_experience=3, max_experience=8,
+                                n_candidates=10, format_text=False, filters={'domains': ['Backend']})
+
+        requested = [n_results for n_results, _ in stub.requests]
+        print(f"Requested n_results per round: {requested}, stats: {result.stats}")
+        assert requested == [30, 60, 100]  # capped at the old fixed fetch size
+        assert result.stats['fetch_rounds'] == 3
+        assert stub.requests[0][1] == {'experience_years': {'>=': 3, '<=': 8}, 'domains': ['Backend']}
+        assert len(result.candidates) == 10
+
+        # A pool that fills on the first round costs one small search
+        stub.requests = []
+        tool.shortlist("Python developer", n_candidates=5, format_text=False)
+        assert stub.requests == [(15, {})]
+
+        # Without a minimum the range is not pushed down: entries lacking experience_years count as 0 years
+        legacy = _candidate("no_experience", "Legacy Person", 0, 0.1, "Python")
+        del legacy['metadata']['experience_years']
+        stub = StubVectorDB([legacy] + results[:5])
+        candidate_shortlist.get_vector_db = lambda: stub
+        unbounded = tool.shortlist("Python developer", max_experience=8, n_candidates=5, format_text=False)
+        assert stub.requests[0][1] == {}
+        assert "no_experience" in [c['id'] for c in unbounded.candidates]
+    finally:
+        candidate_shortlist.get_vector_db = original_get_vector_db
+
+    print("✅ Adaptive over-fetch tests passed")
+
+
+def test_shortlist_result_cache():
+    """Identical requests are served from cache until the collection version changes"""
+
+    print("🧪 TESTING VERSIONED SHORTLIST CACHE")
+    print("=" * 60)
+
+    results = [_candidate(f"cand_{i}", f"Person{i} Name{i}", 4, 0.3 + i / 100, "Python, SQL")
+               for i in range(6)]
+    stub = StubVectorDB(results)
+    original_get_vector_db = candidate_shortlist.get_vector_db
+    candidate_shortlist.get_vector_db = lambda: stub
+    candidate_shortlist.shortlist_result_cache.clear()
+
+    try:
+        tool = CandidateShortlistTool()
+        first = tool.shortlist("Python developer\nRequired Skills: Python", n_candidates=3)
+        assert stub.search_calls == 1
+
+        start = time.perf_counter()
+        again = tool.shortlist("  Python   developer \n\nRequired Skills:  Python", n_candidates=3)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Cached shortlist took {elapsed_ms:.3f} ms")
+        assert stub.search_calls == 1
+        assert elapsed_ms < 1.0
+        assert again.formatted_text == first.formatted_text
+        assert [c['id'] for c in again.candidates] == [c['id'] for c in first.candidates]
+
+        # Callers get their own lists and candidate dicts
+        cached_ids = [c['id'] for c in again.candidates]
+        again.candidates[0]['content'] = "replaced by the caller"
+        again.candidates[0]['metadata']['candidate_name'] = "Renamed"
+        again.experience_filtered[0]['justification'] = {'recommendation': 'mutated'}
+        again.candidates.clear()
+        cached = tool.shortlist("Python developer\nRequired Skills: Python", n_candidates=3)
+        assert [c['id'] for c in cached.candidates] == cached_ids
+        assert cached.candidates[0]['content'] != "replaced by the caller"
+        assert cached.candidates[0]['metadata']['candidate_name'] != "Renamed"
+        assert all('justification' not in c for c in cached.experience_filtered)
+        assert cached.candidates[0] is next(c for c in cached.experience_filtered if c['id'] == cached_ids[0])
+
+        # Different parameters are different entries
+        tool.shortlist("Python developer\nRequired Skills: Python", n_candidates=2)
+        assert stub.search_calls == 2
+
+        # A collection write invalidates every cached shortlist
+        stub.version += 1
+        tool.shortlist("Python developer\nRequired Skills: Python", n_candidates=3)
+        assert stub.search_calls == 3
+        stats = candidate_shortlist.shortlist_result_cache.stats()
+        print(f"Cache stats: {stats}")
+        assert stats['stale'] == 1
+    finally:
+        candidate_shortlist.get_vector_db = original_get_vector_db
+
+    print("✅ Shortlist cache tests passed")
+
+
+def test_collection_writes_bump_version():
+    """add_resume, updates, upserts and deletes all advance the collection version"""
+
+    from test_batch_search import _make_vector_db
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vector_db, _ = _make_vector_db(tmp_dir)
+        versions = [vector_db.collection_version()]
+
+        metadata = {'experience_years': 3.0, 'skills': 'Python', 'email': 'dana@example.com'}
+        vector_db.add_resume("Dana Lee", "Python developer resume", metadata)
+        versions.append(vector_db.collection_version())
+        vector_db.add_resume("Dana Lee", "Python developer resume", metadata)  # update path
+        versions.append(vector_db.collection_version())
+        vector_db.upsert_candidates([("Eli Park", "Java developer resume", {'experience_years': 5.0})])
+        versions.append(vector_db.collection_version())
+        vector_db.delete_candidates(["python_dev"])
+        versions.append(vector_db.collection_version())
+        vector_db._background_rebuild.join()  # text indexes are rebuilt off the write path
+
+        print(f"Collection versions: {versions}")
+        assert versions == sorted(set(versions))
+        assert len(versions) == 5
+
+        # The version lives next to the database, so a new process sees the same value
+        from services.vector_db import HybridVectorDB
+        assert HybridVectorDB(persist_directory=vector_db.persist_directory).collection_version() == versions[-1]
+
+
+def test_lazy_document_fetch():
+    """Ingest-stamped candidates are shortlisted from metadata; only the final texts are fetched"""
+
+    from services.skills_matcher import skills_matcher
+    from services.vector_db import HybridVectorDB
+
+    print("🧪 TESTING SHORTLIST LAZY DOCUMENT FETCH")
+    print("=" * 60)
+
+    legacy = [_candidate(f"cand_{i}", f"Person{i} Name{i}", 3 + i % 5, 0.3 + i / 100,
+                         "Python, React" if i % 2 else "Java, Spring")
+              for i in range(12)]
+    rng = random.Random(5)
+    for candidate in legacy:
+        candidate['content'] += " " + " ".join(f"w{rng.randrange(100000)}" for _ in range(60))
+    stamped = []
+    for candidate in legacy:
+        candidate = dict(candidate, metadata=dict(candidate['metadata']))
+        metadata = candidate['metadata']
+        metadata['dup_cluster_id'] = candidate['id']
+        metadata.update(HybridVectorDB.content_metadata(candidate['content']))
+        metadata.update(skills_matcher.canonical_skills_metadata(metadata['skills'], candidate['content']))
+        stamped.append(candidate)
+
+    original_get_vector_db = candidate_shortlist.get_vector_db
+    try:
+        outputs = []
+        for results in (legacy, stamped):
+            stub = StubVectorDB(results)
+            candidate_shortlist.get_vector_db = lambda: stub
+            candidate_shortlist.shortlist_result_cache.clear()
+            result = CandidateShortlistTool().shortlist("Python developer\nRequired Skills: Python, React",
+                                                        n_candidates=3)
+            outputs.append((result, stub.document_fetches))
+
+        (legacy_result, legacy_fetches), (stamped_result, stamped_fetches) = outputs
+        print(f"Document fetches: legacy={legacy_fetches}, stamped={stamped_fetches}")
+        assert stamped_fetches == [[c['id'] for c in stamped_result.candidates]]
+        assert sum(legacy_fetches, []) == [c['id'] for c in legacy]  # legacy entries still need their texts
+        assert stamped_result.formatted_text == legacy_result.formatted_text
+        assert ([(c['id'], c['final_combined_score'], c['content']) for c in stamped_result.candidates]
+                == [(c['id'], c['final_combined_score'], c['content']) for c in legacy_result.candidates])
+    finally:
+        candidate_shortlist.get_vector_db = original_get_vector_db
+
+    print("✅ Shortlist lazy document fetch tests passed")
+
+
+def _materialized_shortlist(tool, results, required_skills, min_experience, max_experience, n_candidates):
+    """Reference: the full-list pipeline (dedup, filter, skills pass with relaxed retry, full sort)"""
+    from services.skills_matcher import skills_matcher
+
+    unique = tool._deduplicate_candidates([dict(result) for result in results])
+    experience_filtered = [c for c in unique
+                           if min_experience <= c['metadata'].get('experience_years', 0) <= max_experience]
+    skills_filtered = experience_filtered
+    if required_skills:
+        skills_filtered = skills_matcher.filter_candidates_by_skills(experience_filtered, required_skills, 0.3)
+        if len(skills_filtered) < max(2, n_candidates // 2):
+            relaxed = skills_matcher.filter_candidates_by_skills(experience_filtered, required_skills, 0.1)
+            if len(relaxed) > len(skills_filtered):
+                skills_filtered = relaxed
+    for candidate in skills_filtered:
+        base_score = tool._calculate_combined_score(candidate, min_experience, max_experience)
+        skills_score = candidate.get('skills_analysis', {}).get('match_score', 0) * 0.5
+        candidate['final_combined_score'] = min(1.0, base_score + skills_score)
+    skills_filtered.sort(key=lambda x: x.get('final_combined_score', 0), reverse=True)
+    return skills_filtered[:n_candidates]
+
+
+def test_streaming_top_k_matches_full_sort():
+    """The heap-based pipeline returns the same ranking as sorting the fully materialized list"""
+
+    print("🧪 TESTING STREAMING TOP-K SHORTLIST")
+    print("=" * 60)
+
+    rng = random.Random(7)
+    skill_sets = ["Python, Django", "Python", "React, JavaScript", "Java, Spring", "Python, React, Docker", "Go"]
+    results = [_candidate(f"cand_{i:02d}", f"Person{i} Name{i}", rng.randint(1, 12), rng.uniform(0.1, 1.4),
+                          rng.choice(skill_sets), email=f"p{i % 17}@example.com")
+               for i in range(24)]
+    for result in results:
+        result['content'] += " " + " ".join(f"w{rng.randrange(100000)}" for _ in range(60))
+    results.sort(key=lambda result: result['distance'])
+
+    original_get_vector_db = candidate_shortlist.get_vector_db
+    try:
+        for requirements, skills, n_candidates in [("Required Skills: Python, Django", ["Python", "Django"], 4),
+                                                   ("Required Skills: Rust, Python", ["Rust", "Python"], 6),
+                                                   ("Backend developer", [], 5)]:
+            stub = StubVectorDB(results)
+            candidate_shortlist.get_vector_db = lambda: stub
+            candidate_shortlist.shortlist_result_cache.clear()
+            tool = CandidateShortlistTool()
+            streamed = tool.shortlist(requirements, min_experience=2, max_experience=10,
+                                      n_candidates=n_candidates, format_text=False)
+            fetched = results[:stub.requests[-1][0]]  # same fetch ceiling as the adaptive search
+            expected = _materialized_shortlist(tool, fetched, skills, 2, 10, n_candidates)
+
+            print(f"{requirements}: {[c['id'] for c in streamed.candidates]}")
+            assert ([(c['id'], c['final_combined_score']) for c in streamed.candidates]
+                    == [(c['id'], c['final_combined_score']) for c in expected])
+    finally:
+        candidate_shortlist.get_vector_db = original_get_vector_db
+
+    print("✅ Streaming top-k tests passed")
+
+
+def test_streaming_early_termination():
+    """Once no unseen candidate can beat the heap minimum, ranking stops; the evaluation pool is still filled"""
+
+    print("🧪 TESTING SHORTLIST EARLY TERMINATION")
+    print("=" * 60)
+
+    # Ascending distances: the match score of unseen candidates is bounded
+    results = [_candidate(f"cand_{i:03d}", f"Person{i} Name{i}", 8, 0.2 + i * 0.003, "Python")
+               for i in range(200)]
+    rng = random.Random(3)
+    for result in results:
+        result['content'] += " " + " ".join(f"w{rng.randrange(100000)}" for _ in range(60))
+    stub = StubVectorDB(results)
+    original_get_vector_db = candidate_shortlist.get_vector_db
+    candidate_shortlist.get_vector_db = lambda: stub
+    candidate_shortlist.shortlist_result_cache.clear()
+
+    try:
+        tool = CandidateShortlistTool()
+        result = tool.shortlist("Backend developer", min_experience=3, max_experience=8,
+                                n_candidates=5, format_text=False)
+        print(f"Requests: {stub.requests}, stats: {result.stats}")
+        assert [n_results for n_results, _ in stub.requests] == [15]
+        assert result.stats['ranked_until'] == 5
+        # app.py evaluates n * 3 experience-filtered candidates, early termination or not
+        assert [c['id'] for c in result.experience_filtered] == [r['id'] for r in results[:15]]
+        expected = _materialized_shortlist(tool, results, [], 3, 8, 5)
+        assert [c['id'] for c in result.candidates] == [c['id'] for c in expected]
+    finally:
+        candidate_shortlist.get_vector_db = original_get_vector_db
+
+    print("✅ Early termination tests passed")
+
+
+if __name__ == "__main__":
+    test_shortlist_returns_ranked_candidates()
+    test_indexed_deduplication_matches_pairwise()
+    test_adaptive_over_fetch()
+    test_shortlist_result_cache()
+    test_collection_writes_bump_version()
+    test_lazy_document_fetch()
+    test_streaming_top_k_matches_full_sort()
+    test_streaming_early_termination()
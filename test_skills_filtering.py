@@ -172,11 +172,49 @@ def test_skills_filtering_edge_cases():
     
     print("\n✅ Edge case tests completed!")
 
+def test_precomputed_canonical_skills():
+    """Precomputed canonical skills give the same filtering result as text scanning"""
+    
+    print("\n🧪 TESTING PRECOMPUTED CANONICAL SKILLS")
+    print("=" * 60)
+    
+    resumes = [
+        ("React, JavaScript", "Frontend engineer building React.js apps with TypeScript and CSS3"),
+        ("Python", "Backend developer: Django, PostgreSQL, Docker and AWS"),
+        ("", "Data scientist using pandas, numpy and scikit-learn in python3"),
+        ("Java, Spring", "Java services on Kubernetes (k8s) with Jenkins pipelines"),
+    ]
+    
+    legacy, precomputed = [], []
+    for i, (skills, content) in enumerate(resumes):
+        legacy.append({'id': f"c{i}", 'content': content, 'metadata': {'skills': skills}})
+        metadata = {'skills': skills, **skills_matcher.canonical_skills_metadata(skills, content)}
+        # No content: the precomputed path must not need to scan the resume
+        precomputed.append({'id': f"c{i}", 'content': '', 'metadata': metadata})
+    
+    print(f"Canonical skills: {[c['metadata']['canonical_skills'] for c in precomputed]}")
+    
+    for required in (["Python", "AWS"], ["React", "TypeScript"], ["Kubernetes", "Java"]):
+        legacy_result = skills_matcher.filter_candidates_by_skills([dict(c) for c in legacy], required, 0.3)
+        fast_result = skills_matcher.filter_candidates_by_skills([dict(c) for c in precomputed], required, 0.3)
+        print(f"{required}: {[c['id'] for c in fast_result]}")
+        assert [c['id'] for c in fast_result] == [c['id'] for c in legacy_result]
+        for fast, slow in zip(fast_result, legacy_result):
+            assert fast['skills_analysis']['match_score'] == slow['skills_analysis']['match_score']
+            assert fast['skills_analysis']['matched_skills'] == slow['skills_analysis']['matched_skills']
+    
+    # Stale version falls back to scanning the text
+    stale = {'skills': '', 'canonical_skills': 'cobol', 'canonical_skills_version': -1}
+    assert skills_matcher.get_precomputed_skills(stale) is None
+    
+    print("\n✅ Precomputed skills tests completed!")
+
 if __name__ == "__main__":
     try:
         test_skills_matcher()
         test_enhanced_candidate_filtering()
         test_skills_filtering_edge_cases()
+        test_precomputed_canonical_skills()
         
         print("\n🎉 ALL SKILLS FILTERING TESTS COMPLETED!")
         
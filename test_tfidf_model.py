@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test the corpus TF-IDF model and its use by the candidate evaluator
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.candidate_evaluator import CandidateEvaluator, load_corpus_tfidf_model
+from services.tfidf_model import CorpusTfidfModel, tfidf_model_path_for
+from test_batch_search import _make_vector_db
+
+DOCUMENTS = [
+    ("frontend", "React TypeScript frontend engineer building React and GraphQL apps"),
+    ("backend", "Python Django REST backend engineer with PostgreSQL and Docker"),
+    ("fullstack", "Full stack engineer: React, Node.js, Python and Docker"),
+    ("data", "Data scientist: Python, pandas, machine learning and statistics"),
+]
+
+
+def test_corpus_tfidf_model():
+    """Corpus IDF weights rare terms; stored vectors and on-the-fly vectors score identically"""
+
+    print("🧪 TESTING CORPUS TF-IDF MODEL")
+    print("=" * 60)
+
+    model = CorpusTfidfModel.build(DOCUMENTS, collection_version=3)
+    vocabulary = model.vectorizer.vocabulary_
+    idf = model.vectorizer.idf_
+    # 'python' is in three resumes, 'graphql' in one
+    assert idf[vocabulary['graphql']] > idf[vocabulary['python']]
+
+    job_description = "Senior React engineer with GraphQL experience"
+    ids = [doc_id for doc_id, _ in DOCUMENTS]
+    scores = model.similarities(job_description, ids)
+    print(f"Scores: {dict(zip(ids, np.round(scores, 3)))}")
+    assert ids[int(np.argmax(scores))] == "frontend"
+
+    # Unknown ids fall back to vectorizing the given text with the corpus vocabulary
+    texts = [text for _, text in DOCUMENTS]
+    fallback = model.similarities(job_description, [None] * len(texts), texts)
+    assert np.allclose(fallback, scores, atol=1e-6)
+    assert model.similarities(job_description, ["missing"]).tolist() == [0.0]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model.save(tmp_dir)
+        loaded = CorpusTfidfModel.load(tmp_dir)
+        assert loaded is not None and loaded.collection_version == 3
+        # Views onto the memory-mapped arrays, not copies
+        assert not loaded.matrix.data.flags.owndata and not loaded.matrix.indices.flags.owndata
+        assert np.allclose(loaded.similarities(job_description, ids), scores)
+        assert CorpusTfidfModel.load(os.path.join(tmp_dir, "missing")) is None
+
+    assert CorpusTfidfModel.build([]) is None
+
+    print("✅ Corpus TF-IDF model tests passed")
+
+
+def test_evaluator_uses_corpus_model():
+    """evaluate_candidates scores every candidate from the corpus model fitted at ingest"""
+
+    print("🧪 TESTING EVALUATOR WITH CORPUS TF-IDF")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vector_db, _ = _make_vector_db(tmp_dir)
+        vector_db.rebuild_text_indexes()
+        assert os.path.exists(os.path.join(tfidf_model_path_for(vector_db.persist_directory), "manifest.json"))
+
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return vector_db.get_tfidf_model()
+
+        evaluator = CandidateEvaluator(corpus_model_loader=loader, evaluation_cache_loader=None)
+        candidates = vector_db.search_candidates("python django developer", 3)
+        job_description = "Required Skills: Python, Django\nPython Django developer, 2-6 years experience"
+
+        results = evaluator.evaluate_candidates(candidates, job_description)
+        evaluated = results['selected_candidates'] + results['rejected_candidates']
+        semantic = {result['candidate']['id']: result['score'].semantic_similarity for result in evaluated}
+        print(f"Semantic scores: {semantic}")
+        assert len(loads) == 1  # one model lookup for the whole batch
+        assert max(semantic, key=semantic.get) == "python_dev"
+        assert semantic["java_dev"] == 0.0
+
+        expected = vector_db.get_tfidf_model().similarities(job_description, ["python_dev"])[0]
+        assert abs(semantic["python_dev"] - expected) < 1e-9
+
+        # The default loader reads the model saved at write time, without touching ChromaDB
+        model_dir = tfidf_model_path_for(vector_db.persist_directory)
+        saved = load_corpus_tfidf_model(model_dir)
+        assert saved.doc_ids == vector_db.get_tfidf_model().doc_ids
+        assert load_corpus_tfidf_model(model_dir) is saved
+        assert load_corpus_tfidf_model(os.path.join(tmp_dir, "missing")) is None
+
+        # A write refits and saves the model (in the background); the loader picks up the new one
+        vector_db.upsert_candidates([("Kai Wu", "Rust Tokio systems engineer", {'experience_years': 4.0})])
+        vector_db._background_rebuild.join()
+        assert vector_db._tfidf_model[0] == vector_db.collection_version()
+        assert len(load_corpus_tfidf_model(model_dir)) == len(saved) + 1
+
+        # A model behind the collection is served while it is refitted in the background
+        vector_db.bump_collection_version()
+        assert vector_db.get_tfidf_model().collection_version < vector_db.collection_version()
+        vector_db._background_rebuild.join()
+        assert vector_db.get_tfidf_model().collection_version == vector_db.collection_version()
+
+        # Without a corpus model the evaluator falls back to the per-candidate fit
+        fallback = CandidateEvaluator(corpus_model_loader=None, evaluation_cache_loader=None)
+        assert fallback.calculate_semantic_similarity("python django", "Python Django developer") > 0
+
+    print("✅ Evaluator corpus TF-IDF tests passed")
+
+
+if __name__ == "__main__":
+    test_corpus_tfidf_model()
+    test_evaluator_uses_corpus_model()
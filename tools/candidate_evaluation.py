@@ -5,7 +5,7 @@ Triggered after candidate shortlisting for detailed evaluation and justification
 """
 
 from langchain.tools import BaseTool
-from typing import Type, List, Dict, Any
+from typing import Type, List, Dict, Any, Callable, Optional
 from pydantic import BaseModel, Field
 from services.candidate_evaluator import candidate_evaluator
 import logging
@@ -18,6 +18,7 @@ class CandidateEvaluationInput(BaseModel):
     candidates: List[Dict] = Field(description="List of shortlisted candidates to evaluate")
     job_description: str = Field(description="Complete job description for evaluation criteria")
     evaluation_mode: str = Field(default="full", description="Evaluation mode: 'full' or 'summary'")
+    workers: int = Field(default=1, description="Worker processes for large candidate pools (1 = serial)")
 
 class CandidateEvaluationTool(BaseTool):
     """Tool to evaluate shortlisted candidates with 60%+ accuracy and detailed justification"""
@@ -75,7 +76,7 @@ class CandidateEvaluationTool(BaseTool):
                 email = metadata.get('email', 'Not available')
                 
                 output.append(f"**{i}. {name}** ⭐")
-                output.append(f"   📊 Overall Score: {justification['overall_score']} (SELECTED)")
+                output.append(f"   📊 Overall Score: {score.overall_score:.1%} (SELECTED)")
                 output.append(f"   💼 Experience: {experience} years")
                 output.append(f"   📧 Contact: {email}")
                 
@@ -118,7 +119,7 @@ class CandidateEvaluationTool(BaseTool):
                 experience = metadata.get('experience_years', 'Unknown')
                 
                 output.append(f"**{i}. {name}**")
-                output.append(f"   📊 Overall Score: {justification['overall_score']} (REJECTED)")
+                output.append(f"   📊 Overall Score: {score.overall_score:.1%} (REJECTED)")
                 output.append(f"   💼 Experience: {experience} years")
                 
                 if mode == "full":
@@ -158,7 +159,8 @@ class CandidateEvaluationTool(BaseTool):
         
         return "\n".join(output)
     
-    def _run(self, candidates: List[Dict], job_description: str, evaluation_mode: str = "full") -> str:
+    def _run(self, candidates: List[Dict], job_description: str, evaluation_mode: str = "full",
+             workers: int = 1) -> str:
         """Run candidate evaluation with detailed scoring and justification"""
         
         try:
@@ -172,7 +174,7 @@ class CandidateEvaluationTool(BaseTool):
                 return "❌ **ERROR**: Job description is required for evaluation"
             
             # Run the evaluation
-            results = candidate_evaluator.evaluate_candidates(candidates, job_description)
+            results = candidate_evaluator.evaluate_candidates(candidates, job_description, workers=workers)
             
             # Format and return results
             formatted_results = self._format_evaluation_results(results, evaluation_mode)
@@ -185,10 +187,12 @@ class CandidateEvaluationTool(BaseTool):
             logger.error(f"Error in candidate evaluation: {e}")
             return f"❌ **EVALUATION ERROR**: {str(e)}"
     
-    def get_evaluation_summary(self, candidates: List[Dict], job_description: str) -> Dict[str, Any]:
+    def get_evaluation_summary(self, candidates: List[Dict], job_description: str, workers: Optional[int] = None,
+                               progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
         """Get evaluation results as structured data (for programmatic use)"""
         try:
-            return candidate_evaluator.evaluate_candidates(candidates, job_description)
+            return candidate_evaluator.evaluate_candidates(candidates, job_description, workers=workers,
+                                                           progress_callback=progress_callback)
         except Exception as e:
             logger.error(f"Error getting evaluation summary: {e}")
             return {'error': str(e)}
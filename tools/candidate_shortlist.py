@@ -5,15 +5,36 @@ Integrates with the HR Assistant to shortlist candidates based on job requiremen
 """
 
 from langchain.tools import BaseTool
-from typing import Type, List, Dict, Any, Set
+from typing import Type, List, Dict, Any, Set, Optional, Callable, Iterable, Iterator
+from dataclasses import dataclass, field, replace
 from pydantic import BaseModel, Field
 from services.vector_db import get_vector_db
+from services.result_cache import VersionedResultCache, normalize_request_text
+from services.duplicate_clusters import decode_signature
+from utils.near_duplicates import MinHashLSH, default_minhasher
+import numpy as np
+import copy
+import json
+import heapq
 import logging
 import hashlib
 from difflib import SequenceMatcher
 
 logger = logging.getLogger(__name__)
 
+# Ranking weights: semantic match + experience + capped tech boost, plus the skills match
+MATCH_WEIGHT = 0.3
+EXPERIENCE_WEIGHT = 0.2
+TECH_BOOST_CAP = 0.1
+SKILLS_WEIGHT = 0.5
+
+# Skills match needed to be shortlisted; the relaxed threshold applies when too few pass the strict one
+STRICT_SKILLS_THRESHOLD = 0.3
+RELAXED_SKILLS_THRESHOLD = 0.1
+
+# Shortlists keyed by normalized request, served only while the collection version is unchanged
+shortlist_result_cache = VersionedResultCache()
+
 class CandidateShortlistInput(BaseModel):
     """Input for candidate shortlisting"""
     job_requirements: str = Field(description="Job requirements and skills to match against")
@@ -21,6 +42,67 @@ class CandidateShortlistInput(BaseModel):
     max_experience: int = Field(default=999, description="Maximum years of experience required")
     n_candidates: int = Field(default=10, description="Number of top candidates to return")
 
+@dataclass
+class ShortlistResult:
+    """Structured shortlist: ranked candidate dicts plus the formatted markdown"""
+    candidates: List[Dict[str, Any]]
+    formatted_text: str
+    # Deduplicated, experience-filtered pool the ranking was drawn from (first n_candidates * 3, search order)
+    experience_filtered: List[Dict[str, Any]] = field(default_factory=list)
+    required_skills: List[str] = field(default_factory=list)
+    stats: Dict[str, int] = field(default_factory=dict)
+    
+    @staticmethod
+    def candidate_to_dict(candidate: Dict[str, Any]) -> Dict[str, Any]:
+        """JSON-serializable view of one ranked candidate using its real metadata"""
+        metadata = candidate.get('metadata', {})
+        skills_analysis = candidate.get('skills_analysis', {})
+        data = {
+            'unique_id': metadata.get('unique_id', candidate.get('id', '')),
+            'name': metadata.get('candidate_name', 'Unknown Candidate'),
+            'score': round(float(candidate.get('final_combined_score', 0.0)), 4),
+            'distance': candidate.get('distance'),
+            'experience': metadata.get('experience_years', 0),
+            'email': metadata.get('email', ''),
+            'phone': metadata.get('phone', ''),
+            'skills': metadata.get('skills', ''),
+            'domains': metadata.get('domains', ''),
+            'education_level': metadata.get('education_level', ''),
+            'location': metadata.get('location', ''),
+            'pdf_filename': metadata.get('pdf_filename', ''),
+            'skills_analysis': {
+                'match_score': skills_analysis.get('match_score', 0),
+                'exact_matches': skills_analysis.get('exact_matches', 0),
+                'partial_matches': skills_analysis.get('partial_matches', 0),
+                'total_required': skills_analysis.get('total_required', 0),
+                'matched_skills': list(skills_analysis.get('matched_skills', [])),
+                'missing_skills': list(skills_analysis.get('missing_skills', [])),
+                'bonus_skills': list(skills_analysis.get('bonus_skills', []))
+            } if skills_analysis else None
+        }
+        if candidate.get('justification') is not None:
+            # Evaluated candidates may carry a LazyJustification, which json cannot encode
+            from services.candidate_evaluator import plain_justification
+            data['justification'] = plain_justification(candidate['justification'])
+        return data
+    
+    def copy(self) -> 'ShortlistResult':
+        """
+        Deep copy, so callers can reorder the lists or mutate candidate dicts (e.g. attach_documents)
+        without touching the cached result; a candidate in both lists stays one shared dict
+        """
+        candidates, experience_filtered = copy.deepcopy((self.candidates, self.experience_filtered))
+        return replace(self, candidates=candidates, experience_filtered=experience_filtered,
+                       required_skills=list(self.required_skills), stats=dict(self.stats))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable shortlist for API responses"""
+        return {
+            'candidates': [self.candidate_to_dict(candidate) for candidate in self.candidates],
+            'required_skills': self.required_skills,
+            'stats': self.stats
+        }
+
 class CandidateShortlistTool(BaseTool):
     """Enhanced tool to shortlist candidates with 100% deduplication guarantee"""
     name: str = "shortlist_candidates"
@@ -75,45 +157,113 @@ class CandidateShortlistTool(BaseTool):
         return False
     
     def _deduplicate_candidates(self, candidates: List[Dict]) -> List[Dict]:
-        """Remove duplicate candidates using multiple deduplication strategies"""
+        """Remove duplicate candidates in linear time (see _iter_unique_candidates)"""
+        logger.info(f"🔍 Starting deduplication process for {len(candidates)} candidates")
+        unique_candidates = list(self._iter_unique_candidates(candidates))
+        logger.info(f"✅ Deduplication complete: {len(candidates)} → {len(unique_candidates)} unique candidates")
+        return unique_candidates
+    
+    @staticmethod
+    def _resume_signature(candidate: Dict) -> Optional[np.ndarray]:
+        """Whole-resume MinHash signature: the one stored at ingest, else computed from the loaded text"""
+        signature = decode_signature(candidate.get('metadata', {}).get('minhash_signature', ''))
+        if signature is not None and len(signature) == default_minhasher.num_perm:
+            return signature
+        if 'content' in candidate:
+            return default_minhasher.signature(candidate['content'])
+        return None
+    
+    def _iter_unique_candidates(self, candidates: Iterable[Dict],
+                                load_documents: Optional[Callable[[List[Dict]], Any]] = None) -> Iterator[Dict]:
+        """
+        Yield the first occurrence of each candidate, consuming the input lazily
+        Hash indexes catch unique_id/email/phone duplicates. Everything else is dropped only
+        by the exact fuzzy check, run against the accepted candidates that could be duplicates:
+        members of the same ingest-time dup_cluster_id, and MinHash LSH neighbours (legacy
+        entries without a cluster on their first 500 characters, every entry on whole-resume
+        signatures). Clusters and LSH only pick the pairs, so the result matches the pairwise scan
+        load_documents fetches the text of entries searched without documents only when
+        they have such a pair
+        """
         
         unique_candidates = []
+        cluster_members: Dict[str, List[int]] = {}  # dup_cluster_id -> positions of accepted members
         seen_unique_ids: Set[str] = set()
-        
-        logger.info(f"🔍 Starting deduplication process for {len(candidates)} candidates")
+        seen_emails: Set[str] = set()
+        seen_phones: Set[str] = set()
+        prefix_index = MinHashLSH()  # legacy entries, first 500 characters
+        resume_index = MinHashLSH()  # every entry, whole resume
         
         for candidate in candidates:
             metadata = candidate.get('metadata', {})
             unique_id = metadata.get('unique_id')
+            email = metadata.get('email', '').lower().strip()
+            phone = metadata.get('phone', '').strip()
+            cluster_id = metadata.get('dup_cluster_id')
             
             # Primary deduplication: Check unique ID
             if unique_id and unique_id in seen_unique_ids:
                 logger.debug(f"🚫 Duplicate found by unique_id: {unique_id}")
                 continue
             
-            # Secondary deduplication: Fuzzy matching
-            if self._is_duplicate_candidate(candidate, unique_candidates):
-                candidate_name = metadata.get('candidate_name', 'Unknown')
-                logger.debug(f"🚫 Duplicate found by fuzzy matching: {candidate_name}")
+            # Strong indicators: exact email / phone match
+            if (email and email in seen_emails) or (phone and phone in seen_phones):
+                logger.debug(f"🚫 Duplicate found by contact details: {metadata.get('candidate_name', 'Unknown')}")
                 continue
             
+            # Secondary deduplication: fuzzy matching against same-cluster members and LSH neighbours
+            resume_signature = self._resume_signature(candidate)
+            neighbour_positions = resume_index.query(resume_signature) if resume_signature is not None else set()
+            if cluster_id:
+                neighbour_positions |= set(cluster_members.get(cluster_id, ()))
+            if not cluster_id:
+                prefix_signature = default_minhasher.signature(candidate.get('content', '')[:500])
+                neighbour_positions |= prefix_index.query(prefix_signature)
+            
+            if neighbour_positions:
+                neighbours = [unique_candidates[i] for i in sorted(neighbour_positions)]
+                if load_documents is not None:
+                    load_documents([candidate] + neighbours)
+                if self._is_duplicate_candidate(candidate, neighbours):
+                    candidate_name = metadata.get('candidate_name', 'Unknown')
+                    logger.debug(f"🚫 Duplicate found by fuzzy matching: {candidate_name}")
+                    continue
+            
+            position = len(unique_candidates)
+            if resume_signature is not None:
+                resume_index.add(position, resume_signature)
+            if not cluster_id:
+                prefix_index.add(position, prefix_signature)
+            
             # Add to unique list
             unique_candidates.append(candidate)
+            if cluster_id:
+                cluster_members.setdefault(cluster_id, []).append(position)
             if unique_id:
                 seen_unique_ids.add(unique_id)
-        
-        logger.info(f"✅ Deduplication complete: {len(candidates)} → {len(unique_candidates)} unique candidates")
-        return unique_candidates
+            if email:
+                seen_emails.add(email)
+            if phone:
+                seen_phones.add(phone)
+            yield candidate
     
-    def _calculate_combined_score(self, candidate: Dict, min_experience: int, max_experience: int) -> float:
+    @staticmethod
+    def _match_score(distance: Optional[float], space: str = "cosine") -> float:
+        """
+        Semantic match score (cosine similarity clamped to [0, 1]) from a distance in the collection's space:
+        cosine and ip distances are 1 - similarity; ChromaDB's l2 is the squared distance,
+        2 - 2 * similarity for the unit-length embeddings the models produce
+        """
+        if distance is None:
+            return 0.0
+        similarity = 1 - distance / 2 if space == "l2" else 1 - distance
+        return max(0.0, min(1.0, similarity))
+    
+    def _calculate_combined_score(self, candidate: Dict, min_experience: int, max_experience: int,
+                                  space: str = "cosine") -> float:
         """Calculate combined score based on match score and experience level"""
         # Get base match score
-        distance = candidate.get('distance', 1.0)
-        if distance <= 1.0:
-            match_score = max(0, min(1, 1 - distance))
-        else:
-            # For distances > 1, use exponential decay
-            match_score = max(0, min(1, 2 - distance))
+        match_score = self._match_score(candidate.get('distance', 1.0), space)
         
         # Get experience and calculate experience score
         metadata = candidate.get('metadata', {})
@@ -134,7 +284,11 @@ class CandidateShortlistTool(BaseTool):
                 experience_score = 1.0  # Single year range
         
         # Basic tech boost for backward compatibility (will be enhanced with skills analysis)
-        content = candidate.get('content', '').lower()
+        # Term mentions recorded at ingest stand in for the resume text when present
+        if 'content_mentions' in metadata:
+            content = metadata['content_mentions']
+        else:
+            content = candidate.get('content', '').lower()
         skills_text = metadata.get('skills', '').lower()
         
         # Check for key technology matches
@@ -152,82 +306,247 @@ class CandidateShortlistTool(BaseTool):
         
         # Updated scoring: 30% match score + 20% experience score + basic tech boost
         # (Tech skills will get full 50% weight in final_combined_score calculation)
-        combined_score = (0.3 * match_score) + (0.2 * experience_score) + min(0.1, tech_boost)
+        combined_score = (MATCH_WEIGHT * match_score) + (EXPERIENCE_WEIGHT * experience_score) + min(TECH_BOOST_CAP, tech_boost)
         return min(1.0, combined_score)
 
+    @staticmethod
+    def _needs_document(metadata: Dict, required_skills: List[str]) -> bool:
+        """Legacy entries lacking ingest-time fields still need the resume text for dedup/skills/scoring"""
+        from services.skills_matcher import skills_matcher
+        
+        if not metadata.get('dup_cluster_id') or 'content_mentions' not in metadata:
+            return True
+        return bool(required_skills) and skills_matcher.get_precomputed_skills(metadata) is None
+    
+    @staticmethod
+    def _push_bounded(heap: List[tuple], entry: tuple, size: int):
+        """Keep the `size` largest entries in a min-heap"""
+        if len(heap) < size:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    
+    def _rank_candidate(self, candidate: Dict, arrival: int, min_experience: int, max_experience: int,
+                        required_skills: List[str], n_candidates: int, strict_heap: List[tuple],
+                        relaxed_heap: List[tuple], counts: Dict[str, int], space: str = "cosine"):
+        """
+        Score one experience-filtered candidate and offer it to the top-n heaps:
+        skills match >= 30% goes to the strict heap, >= 10% to the relaxed one
+        """
+        base_score = self._calculate_combined_score(candidate, min_experience, max_experience, space)
+        
+        if required_skills:
+            from services.skills_matcher import skills_matcher
+            skills_match = skills_matcher.analyze_candidate(candidate, required_skills)['match_score']
+            if skills_match < RELAXED_SKILLS_THRESHOLD:
+                return
+        else:
+            skills_match = candidate.get('skills_analysis', {}).get('match_score', 0)
+        
+        # Final scoring: 30% match + 20% experience + 50% tech skills
+        candidate['final_combined_score'] = min(1.0, base_score + skills_match * SKILLS_WEIGHT)
+        entry = (candidate['final_combined_score'], skills_match, -arrival, candidate)
+        
+        if not required_skills or skills_match >= STRICT_SKILLS_THRESHOLD:
+            counts['strict'] += 1
+            self._push_bounded(strict_heap, entry, n_candidates)
+        if required_skills:
+            counts['relaxed'] += 1
+            self._push_bounded(relaxed_heap, entry, n_candidates)
+    
+    def _final_score_bound(self, distance: Optional[float], required_skills: List[str],
+                           space: str = "cosine") -> float:
+        """
+        Highest final score any candidate further down the ranking could reach: best
+        experience score, full tech boost and (with required skills) a full skills match
+        Only distance-ordered (vector) results bound the match score, which never rises with distance
+        """
+        match_bound = 1.0 if distance is None else self._match_score(distance, space)
+        base_bound = min(1.0, (MATCH_WEIGHT * match_bound) + (EXPERIENCE_WEIGHT * 1.0) + TECH_BOOST_CAP)
+        return min(1.0, base_bound + (1.0 if required_skills else 0) * SKILLS_WEIGHT)
+    
+    def _iter_search_results(self, vector_db, job_requirements: str, search_filters: Dict, search_mode: str,
+                             required_skills: List[str], first_page: int, max_fetch: int,
+                             fetch_more: Callable[[], bool], stats: Dict[str, int]) -> Iterator[Dict]:
+        """
+        Search results in pages, best first, without documents (texts are loaded only for
+        legacy entries that need them). ChromaDB queries have no offset, so each page re-queries
+        with twice the n_results (up to max_fetch) and yields only the unseen tail; the next page
+        is fetched only while fetch_more() says the filtered pool is still short
+        """
+        n_results = first_page
+        seen_ids: Set[str] = set()
+        while True:
+            stats['fetch_rounds'] += 1
+            results = vector_db.search_candidates(job_requirements, n_results, filters=search_filters,
+                                                  mode=search_mode, include_documents=False)
+            page = [result for result in results if result['id'] not in seen_ids]
+            seen_ids.update(result['id'] for result in page)
+            stats['initial_results'] += len(page)
+            vector_db.attach_documents([result for result in page
+                                        if self._needs_document(result.get('metadata', {}), required_skills)])
+            yield from page
+            
+            exhausted = len(results) < n_results
+            if exhausted or n_results >= max_fetch or not fetch_more():
+                return
+            n_results = min(max_fetch, n_results * 2)
+    
     def _run(self, job_requirements: str, min_experience: int = 0, max_experience: int = 999, n_candidates: int = 10) -> str:
         """Shortlist candidates with guaranteed deduplication, experience filtering, and enhanced skills matching"""
         try:
-            vector_db = get_vector_db()
-            
-            # Parse required skills from job requirements
-            required_skills = []
-            if "Required Skills:" in job_requirements:
-                skills_lines = [line for line in job_requirements.split('\n') if line.strip().startswith("Required Skills:")]
-                if skills_lines:  # Check if we found any lines
-                    skills_line = skills_lines[0]
-                    skills_text = skills_line.replace("Required Skills:", "").strip()
-                    required_skills = [skill.strip() for skill in skills_text.split(',') if skill.strip()]
-            
-            # Search for matching candidates (get more to account for filtering)
-            search_multiplier = max(4, n_candidates)  # Get 4x candidates for better filtering
-            initial_results = vector_db.search_candidates(
-                job_requirements, 
-                n_candidates * search_multiplier
-            )
-            
-            if not initial_results:
-                return "No candidates found in the database matching the requirements."
-            
-            logger.info(f"🔍 Initial search returned {len(initial_results)} candidates")
-            
-            # Step 1: Deduplicate all results first
-            unique_results = self._deduplicate_candidates(initial_results)
-            
-            # Step 2: Filter by experience requirement (both min and max)
-            experience_filtered = []
-            for result in unique_results:
-                metadata = result.get('metadata', {})
-                candidate_experience = metadata.get('experience_years', 0)
-                
-                if min_experience <= candidate_experience <= max_experience:
-                    experience_filtered.append(result)
-            
-            if not experience_filtered:
-                return f"No unique candidates found with {min_experience}-{max_experience} years of experience."
-            
-            # Step 3: Enhanced skills filtering
-            skills_filtered = experience_filtered
-            skills_filter_applied = False
+            return self.shortlist(job_requirements, min_experience, max_experience, n_candidates).formatted_text
+        except Exception as e:
+            logger.error(f"Error in enhanced candidate shortlisting: {e}")
+            return f"Error shortlisting candidates: {str(e)}"
+    
+    def shortlist(self, job_requirements: str, min_experience: int = 0, max_experience: int = 999,
+                  n_candidates: int = 10, format_text: bool = True,
+                  filters: Optional[Dict] = None) -> ShortlistResult:
+        """
+        Structured shortlist: filtered search, one deduplication and one scoring pass
+        Returns ranked candidate dicts (with final_combined_score) and the formatted text
+        Pass format_text=False to skip building the markdown report (e.g. for JSON APIs)
+        Extra filters (e.g. education_level, domains) are pushed into the vector search
+        Repeated requests are served from a cache until the candidates collection changes
+        """
+        vector_db = get_vector_db()
+        
+        cache_key = (
+            id(vector_db),
+            normalize_request_text(job_requirements),
+            min_experience, max_experience, n_candidates, format_text,
+            json.dumps(filters, sort_keys=True, default=str) if filters else None
+        )
+        version = vector_db.collection_version()
+        cached = shortlist_result_cache.get(cache_key, version)
+        if cached is not None:
+            logger.info(f"⚡ Shortlist served from cache (collection version {version})")
+            return cached.copy()
+        
+        result = self._compute_shortlist(vector_db, job_requirements, min_experience, max_experience,
+                                         n_candidates, format_text, filters)
+        shortlist_result_cache.put(cache_key, version, result)
+        return result.copy()
+    
+    def _compute_shortlist(self, vector_db, job_requirements: str, min_experience: int, max_experience: int,
+                           n_candidates: int, format_text: bool, filters: Optional[Dict]) -> ShortlistResult:
+        """Search -> dedup -> experience/skills filter -> scoring pipeline behind shortlist()"""
+        
+        # Parse required skills from job requirements
+        required_skills = []
+        if "Required Skills:" in job_requirements:
+            skills_lines = [line for line in job_requirements.split('\n') if line.strip().startswith("Required Skills:")]
+            if skills_lines:  # Check if we found any lines
+                skills_line = skills_lines[0]
+                skills_text = skills_line.replace("Required Skills:", "").strip()
+                required_skills = [skill.strip() for skill in skills_text.split(',') if skill.strip()]
+        
+        # Experience range (plus any extra filters) runs inside the vector index. An index filter
+        # drops entries without experience_years, which count as 0 years below, so the range is
+        # pushed down only when it excludes 0 anyway
+        search_filters = {}
+        if min_experience > 0:
+            search_filters['experience_years'] = {'>=': min_experience}
+            if max_experience < 999:
+                search_filters['experience_years']['<='] = max_experience
+        if filters:
+            search_filters.update(filters)
+        
+        # Adaptive over-fetch: start small and grow only while the filtered pool is short
+        max_fetch = n_candidates * max(4, n_candidates)  # previous fixed fetch size is now the ceiling
+        target_pool = n_candidates * 3  # headroom for re-ranking (and the pool app.py evaluates)
+        relax_floor = max(2, n_candidates // 2)  # fewer strict skill matches than this -> relaxed threshold
+        
+        # Explicit skill lists benefit from exact keyword (BM25) retrieval fused with the vector ranking
+        search_mode = "hybrid" if required_skills else "vector"
+        # Distances are in the collection's own space (l2 until the collection is migrated)
+        space = vector_db.distance_space()
+        
+        stats = {'initial_results': 0, 'unique_results': 0, 'experience_filtered': 0, 'fetch_rounds': 0}
+        experience_filtered = []  # first target_pool entries of the experience-filtered stream
+        # Bounded min-heaps of (final score, skills match, -arrival, candidate): the n best so far
+        strict_heap: List[tuple] = []
+        relaxed_heap: List[tuple] = []
+        counts = {'strict': 0, 'relaxed': 0}
+        
+        def skills_filtered_count() -> int:
+            if not required_skills:
+                return stats['experience_filtered']
+            if counts['strict'] >= relax_floor:
+                return counts['strict']
+            return max(counts['strict'], counts['relaxed'])
+        
+        # Set once no unseen candidate can enter the top n: later ones only fill the evaluation pool
+        ranking_done = False
+        
+        def fetch_more() -> bool:
+            if ranking_done:
+                return len(experience_filtered) < target_pool
+            return skills_filtered_count() < target_pool
+        
+        results = self._iter_search_results(vector_db, job_requirements, search_filters, search_mode,
+                                            required_skills, min(max_fetch, target_pool), max_fetch,
+                                            fetch_more=fetch_more, stats=stats)
+        
+        # Dedup -> experience filter -> skills analysis -> heap, one candidate at a time
+        unique_results = self._iter_unique_candidates(results, load_documents=vector_db.attach_documents)
+        for arrival, candidate in enumerate(unique_results):
+            stats['unique_results'] += 1
+            
+            # Experience range is already applied by the index; this guards legacy values
+            candidate_experience = candidate.get('metadata', {}).get('experience_years', 0)
+            if min_experience <= candidate_experience <= max_experience:
+                stats['experience_filtered'] += 1
+                if len(experience_filtered) < target_pool:
+                    experience_filtered.append(candidate)
+                if not ranking_done:
+                    self._rank_candidate(candidate, arrival, min_experience, max_experience, required_skills,
+                                         n_candidates, strict_heap, relaxed_heap, counts, space)
+            
+            if ranking_done:
+                if len(experience_filtered) >= target_pool:
+                    break
+                continue
             
-            if required_skills:
-                from services.skills_matcher import skills_matcher
-                
-                # Apply skills filtering with a reasonable threshold
-                skills_filtered = skills_matcher.filter_candidates_by_skills(
-                    experience_filtered, 
-                    required_skills, 
-                    min_match_threshold=0.3  # 30% minimum skills match (more strict)
-                )
-                skills_filter_applied = True
-                
-                # If very few results, try with lower threshold but still meaningful
-                if len(skills_filtered) < max(2, n_candidates // 2):
-                    relaxed_filtered = skills_matcher.filter_candidates_by_skills(
-                        experience_filtered, 
-                        required_skills, 
-                        min_match_threshold=0.1  # 10% minimum (still requires some skill match)
-                    )
-                    
-                    if len(relaxed_filtered) > len(skills_filtered):
-                        skills_filtered = relaxed_filtered
-                
-                # Only if absolutely no skills matches found, show a clear message
-                if not skills_filtered:
-                    return f"""No candidates found with the required skills: {', '.join(required_skills)}
+            # Early termination, vector mode only: hybrid results come in fused RRF order, so distance
+            # (and with it the match score) of later candidates is unbounded and hybrid never stops early
+            if search_mode == "vector" and len(strict_heap) == n_candidates:
+                bound = (self._final_score_bound(candidate.get('distance'), required_skills, space), 0)
+                ranking_done = bound <= strict_heap[0][:2]
+            if ranking_done:
+                stats['ranked_until'] = stats['unique_results']
+                logger.info(f"⏹️  Early termination of ranking after {stats['unique_results']} unique candidates")
+                if len(experience_filtered) >= target_pool:
+                    break
+        results.close()
+        
+        if not stats['initial_results']:
+            return ShortlistResult([], "No candidates found in the database matching the requirements.",
+                                   required_skills=required_skills)
+        
+        logger.info(f"🔍 Search returned {stats['initial_results']} candidates after {stats['fetch_rounds']} fetch round(s)")
+        
+        if not experience_filtered:
+            return ShortlistResult([], f"No unique candidates found with {min_experience}-{max_experience} years of experience.",
+                                   required_skills=required_skills, stats=stats)
+        
+        skills_filter_applied = bool(required_skills)
+        
+        # Relaxed (10%) skills threshold only when the strict (30%) one leaves too few candidates
+        if required_skills and counts['strict'] < relax_floor and counts['relaxed'] > counts['strict']:
+            ranked_heap = relaxed_heap
+        else:
+            ranked_heap = strict_heap
+        n_skills_filtered = skills_filtered_count()
+        
+        if required_skills:
+            # Only if absolutely no skills matches found, show a clear message
+            if not n_skills_filtered:
+                return ShortlistResult([], f"""No candidates found with the required skills: {', '.join(required_skills)}
 
 🔍 **SKILLS ANALYSIS SUMMARY:**
-   • Total candidates after experience filtering: {len(experience_filtered)}
+   • Total candidates after experience filtering: {stats['experience_filtered']}
    • Candidates with required skills: 0
    • Required skills: {', '.join(required_skills)}
 
@@ -238,148 +557,141 @@ class CandidateShortlistTool(BaseTool):
    • Check if the skills are spelled correctly
 
 📊 **AVAILABLE SKILLS IN DATABASE:**
-   Run the debug tool to see what skills are actually available in your candidate pool."""
-            
-            # Step 4: Sort candidates by combined score (match score + experience preference + skills match)
-            for candidate in skills_filtered:
-                base_score = self._calculate_combined_score(candidate, min_experience, max_experience)
-                
-                # Add skills matching bonus - NOW 50% weight for tech skills!
-                skills_analysis = candidate.get('skills_analysis', {})
-                skills_score = skills_analysis.get('match_score', 0) * 0.5  # 50% weight for skills
-                
-                # Final scoring: 30% match + 20% experience + 50% tech skills
-                candidate['final_combined_score'] = min(1.0, base_score + skills_score)
-            
-            # Sort by final combined score (highest first)
-            skills_filtered.sort(key=lambda x: x.get('final_combined_score', 0), reverse=True)
-            
-            # Step 5: Take top N candidates
-            final_candidates = skills_filtered[:n_candidates]
-            
-            # Step 6: Format results with enhanced skills information
-            shortlist = []
-            shortlist.append(f"🎯 **ENHANCED CANDIDATE SHORTLIST** (Top {len(final_candidates)} unique matches)")
-            shortlist.append("=" * 70)
-            shortlist.append(f"✅ **DEDUPLICATION GUARANTEE**: All candidates are 100% unique")
-            
-            if min_experience > 0 or max_experience < 999:
-                exp_range = f"{min_experience}-{max_experience}" if max_experience < 999 else f"{min_experience}+"
-                shortlist.append(f"🎯 **EXPERIENCE FILTER**: {exp_range} years")
-            
-            if required_skills:
-                shortlist.append(f"🛠️ **SKILLS FILTER**: {', '.join(required_skills[:5])}{'...' if len(required_skills) > 5 else ''}")
+   Run the debug tool to see what skills are actually available in your candidate pool.""",
+                                       experience_filtered=experience_filtered,
+                                       required_skills=required_skills, stats=stats)
+        
+        # Step 5: Top N candidates, best first (ties: higher skills match, then search order)
+        final_candidates = vector_db.attach_documents([entry[-1] for entry in sorted(ranked_heap, reverse=True)])
+        stats['skills_filtered'] = n_skills_filtered
+        stats['final_candidates'] = len(final_candidates)
+        
+        if not format_text:
+            return ShortlistResult(final_candidates, "",
+                                   experience_filtered=experience_filtered,
+                                   required_skills=required_skills, stats=stats)
+        
+        # Step 6: Format results with enhanced skills information
+        shortlist = []
+        shortlist.append(f"🎯 **ENHANCED CANDIDATE SHORTLIST** (Top {len(final_candidates)} unique matches)")
+        shortlist.append("=" * 70)
+        shortlist.append(f"✅ **DEDUPLICATION GUARANTEE**: All candidates are 100% unique")
+        
+        if min_experience > 0 or max_experience < 999:
+            exp_range = f"{min_experience}-{max_experience}" if max_experience < 999 else f"{min_experience}+"
+            shortlist.append(f"🎯 **EXPERIENCE FILTER**: {exp_range} years")
+        
+        if required_skills:
+            shortlist.append(f"🛠️ **SKILLS FILTER**: {', '.join(required_skills[:5])}{'...' if len(required_skills) > 5 else ''}")
+        
+        shortlist.append("")
+        
+        for i, candidate in enumerate(final_candidates, 1):
+            metadata = candidate.get('metadata', {})
+            candidate_name = metadata.get('candidate_name', 'Unknown Candidate')
+            experience = metadata.get('experience_years', 'Unknown')
+            unique_id = metadata.get('unique_id', 'N/A')
+            
+            # Use the pre-calculated final combined score
+            final_score = candidate.get('final_combined_score', 0)
+            
+            # Get skills analysis
+            skills_analysis = candidate.get('skills_analysis', {})
+            skills_match_score = skills_analysis.get('match_score', 0)
+            
+            # Extract key skills for display
+            skills = metadata.get('skills', '')
+            if isinstance(skills, str) and skills:
+                key_skills = skills.split(',')[:3]  # Show top 3 skills
+                skills_display = ', '.join([skill.strip() for skill in key_skills])
+            else:
+                skills_display = "Skills not extracted"
             
-            shortlist.append("")
+            shortlist.append(f"**{i}. {candidate_name}**")
+            shortlist.append(f"   🆔 Unique ID: {unique_id[:16]}...")
+            shortlist.append(f"   📊 Final Score: {final_score:.2f}/1.00 (Match + Experience + Skills)")
             
-            for i, candidate in enumerate(final_candidates, 1):
-                metadata = candidate.get('metadata', {})
-                candidate_name = metadata.get('candidate_name', 'Unknown Candidate')
-                experience = metadata.get('experience_years', 'Unknown')
-                unique_id = metadata.get('unique_id', 'N/A')
-                
-                # Use the pre-calculated final combined score
-                final_score = candidate.get('final_combined_score', 0)
-                
-                # Get skills analysis
-                skills_analysis = candidate.get('skills_analysis', {})
-                skills_match_score = skills_analysis.get('match_score', 0)
-                
-                # Extract key skills for display
-                skills = metadata.get('skills', '')
-                if isinstance(skills, str) and skills:
-                    key_skills = skills.split(',')[:3]  # Show top 3 skills
-                    skills_display = ', '.join([skill.strip() for skill in key_skills])
-                else:
-                    skills_display = "Skills not extracted"
+            if required_skills and skills_analysis:
+                shortlist.append(f"   🎯 Skills Match: {skills_match_score:.1%} ({skills_analysis.get('exact_matches', 0)}/{skills_analysis.get('total_required', 0)} exact)")
                 
-                shortlist.append(f"**{i}. {candidate_name}**")
-                shortlist.append(f"   🆔 Unique ID: {unique_id[:16]}...")
-                shortlist.append(f"   📊 Final Score: {final_score:.2f}/1.00 (Match + Experience + Skills)")
+                if skills_analysis.get('matched_skills'):
+                    matched_display = ', '.join(skills_analysis['matched_skills'][:3])
+                    shortlist.append(f"   ✅ Matched Skills: {matched_display}")
                 
-                if required_skills and skills_analysis:
-                    shortlist.append(f"   🎯 Skills Match: {skills_match_score:.1%} ({skills_analysis.get('exact_matches', 0)}/{skills_analysis.get('total_required', 0)} exact)")
-                    
-                    if skills_analysis.get('matched_skills'):
-                        matched_display = ', '.join(skills_analysis['matched_skills'][:3])
-                        shortlist.append(f"   ✅ Matched Skills: {matched_display}")
-                    
-                    if skills_analysis.get('missing_skills'):
-                        missing_display = ', '.join(skills_analysis['missing_skills'][:3])
-                        shortlist.append(f"   ❌ Missing Skills: {missing_display}")
-                    
-                    if skills_analysis.get('bonus_skills'):
-                        bonus_display = ', '.join(skills_analysis['bonus_skills'][:2])
-                        shortlist.append(f"   🌟 Bonus Skills: {bonus_display}")
+                if skills_analysis.get('missing_skills'):
+                    missing_display = ', '.join(skills_analysis['missing_skills'][:3])
+                    shortlist.append(f"   ❌ Missing Skills: {missing_display}")
                 
-                shortlist.append(f"   💼 Experience: {experience} years")
-                shortlist.append(f"   🛠️  Key Skills: {skills_display}")
-                shortlist.append(f"   📧 Contact: {metadata.get('email', 'Not available')}")
-                
-                if final_score > 0.8:
-                    shortlist.append("   ⭐ **HIGHLY RECOMMENDED** (Excellent match across all criteria)")
-                elif final_score > 0.6:
-                    shortlist.append("   ✅ **GOOD MATCH** (Strong match with minor gaps)")
-                else:
-                    shortlist.append("   ⚠️  **MODERATE MATCH** (Meets basic requirements)")
-                shortlist.append("")
-            
-            # Enhanced summary with skills filtering metrics
-            high_match_count = sum(1 for c in final_candidates if c.get('final_combined_score', 0) > 0.8)
-            good_match_count = sum(1 for c in final_candidates if 0.6 <= c.get('final_combined_score', 0) <= 0.8)
-            
-            # Calculate skills statistics
-            skills_stats_msg = ""
-            if required_skills and skills_filter_applied:
-                avg_skills_match = sum(c.get('skills_analysis', {}).get('match_score', 0) for c in final_candidates) / max(len(final_candidates), 1)
-                perfect_skills_matches = sum(1 for c in final_candidates if c.get('skills_analysis', {}).get('match_score', 0) >= 0.9)
-                candidates_with_all_skills = sum(1 for c in final_candidates if c.get('skills_analysis', {}).get('match_score', 0) >= 1.0)
-                
-                skills_stats_msg = f"""   • After skills filtering: {len(skills_filtered)} (from {len(experience_filtered)})
+                if skills_analysis.get('bonus_skills'):
+                    bonus_display = ', '.join(skills_analysis['bonus_skills'][:2])
+                    shortlist.append(f"   🌟 Bonus Skills: {bonus_display}")
+            
+            shortlist.append(f"   💼 Experience: {experience} years")
+            shortlist.append(f"   🛠️  Key Skills: {skills_display}")
+            shortlist.append(f"   📧 Contact: {metadata.get('email', 'Not available')}")
+            
+            if final_score > 0.8:
+                shortlist.append("   ⭐ **HIGHLY RECOMMENDED** (Excellent match across all criteria)")
+            elif final_score > 0.6:
+                shortlist.append("   ✅ **GOOD MATCH** (Strong match with minor gaps)")
+            else:
+                shortlist.append("   ⚠️  **MODERATE MATCH** (Meets basic requirements)")
+            shortlist.append("")
+        
+        # Enhanced summary with skills filtering metrics
+        high_match_count = sum(1 for c in final_candidates if c.get('final_combined_score', 0) > 0.8)
+        good_match_count = sum(1 for c in final_candidates if 0.6 <= c.get('final_combined_score', 0) <= 0.8)
+        
+        # Calculate skills statistics
+        skills_stats_msg = ""
+        if required_skills and skills_filter_applied:
+            avg_skills_match = sum(c.get('skills_analysis', {}).get('match_score', 0) for c in final_candidates) / max(len(final_candidates), 1)
+            perfect_skills_matches = sum(1 for c in final_candidates if c.get('skills_analysis', {}).get('match_score', 0) >= 0.9)
+            candidates_with_all_skills = sum(1 for c in final_candidates if c.get('skills_analysis', {}).get('match_score', 0) >= 1.0)
+            
+            skills_stats_msg = f"""   • After skills filtering: {n_skills_filtered} (from {stats['experience_filtered']})
    • Average skills match: {avg_skills_match:.1%}
    • Candidates with all required skills: {candidates_with_all_skills}
    • Candidates with 90%+ skills match: {perfect_skills_matches}"""
-            
-            shortlist.append("📈 **ENHANCED FILTERING SUMMARY:**")
-            shortlist.append(f"   • Initial search results: {len(initial_results)}")
-            shortlist.append(f"   • After deduplication: {len(unique_results)} unique candidates")
-            shortlist.append(f"   • After experience filtering: {len(experience_filtered)}")
-            
-            if skills_stats_msg:
-                shortlist.append(skills_stats_msg)
-            
-            shortlist.append(f"   • Final shortlist: {len(final_candidates)} candidates")
-            shortlist.append(f"   • Highly recommended (>80% score): {high_match_count}")
-            shortlist.append(f"   • Good matches (60-80% score): {good_match_count}")
-            shortlist.append(f"   • Duplicates eliminated: {len(initial_results) - len(unique_results)}")
-            
-            # Add skills filtering effectiveness message
-            if required_skills and skills_filter_applied:
-                skills_effectiveness = len(skills_filtered) / max(len(experience_filtered), 1)
-                if skills_effectiveness < 0.1:
-                    shortlist.append(f"   ⚠️  **SKILLS FILTER IMPACT**: Very strict filtering - only {skills_effectiveness:.1%} of candidates have required skills")
-                elif skills_effectiveness < 0.3:
-                    shortlist.append(f"   🎯 **SKILLS FILTER IMPACT**: Moderate filtering - {skills_effectiveness:.1%} of candidates have required skills")
-                else:
-                    shortlist.append(f"   ✅ **SKILLS FILTER IMPACT**: Good availability - {skills_effectiveness:.1%} of candidates have required skills")
-            
-            shortlist.append("")
-            shortlist.append("🔒 **GUARANTEE**: No duplicate candidates + Multi-criteria optimization!")
-            
-            if required_skills:
-                shortlist.append("🎯 **RANKING**: Candidates sorted by combined score (30% match + 20% experience + 50% tech skills)")
-                shortlist.append("🛠️ **SKILLS FILTERING**: Only shows candidates who actually have the required skills")
+        
+        shortlist.append("📈 **ENHANCED FILTERING SUMMARY:**")
+        shortlist.append(f"   • Initial search results: {stats['initial_results']}")
+        shortlist.append(f"   • After deduplication: {stats['unique_results']} unique candidates")
+        shortlist.append(f"   • After experience filtering: {stats['experience_filtered']}")
+        
+        if skills_stats_msg:
+            shortlist.append(skills_stats_msg)
+        
+        shortlist.append(f"   • Final shortlist: {len(final_candidates)} candidates")
+        shortlist.append(f"   • Highly recommended (>80% score): {high_match_count}")
+        shortlist.append(f"   • Good matches (60-80% score): {good_match_count}")
+        shortlist.append(f"   • Duplicates eliminated: {stats['initial_results'] - stats['unique_results']}")
+        
+        # Add skills filtering effectiveness message
+        if required_skills and skills_filter_applied:
+            skills_effectiveness = n_skills_filtered / max(stats['experience_filtered'], 1)
+            if skills_effectiveness < 0.1:
+                shortlist.append(f"   ⚠️  **SKILLS FILTER IMPACT**: Very strict filtering - only {skills_effectiveness:.1%} of candidates have required skills")
+            elif skills_effectiveness < 0.3:
+                shortlist.append(f"   🎯 **SKILLS FILTER IMPACT**: Moderate filtering - {skills_effectiveness:.1%} of candidates have required skills")
             else:
-                shortlist.append("🎯 **RANKING**: Candidates sorted by combined score (50% match + 50% experience)")
-            
-            if required_skills:
-                shortlist.append("🛠️ **SKILLS ANALYSIS**: Detailed skills matching with exact/partial/bonus skill identification")
-            
-            return "\n".join(shortlist)
-            
-        except Exception as e:
-            logger.error(f"Error in enhanced candidate shortlisting: {e}")
-            return f"Error shortlisting candidates: {str(e)}"
+                shortlist.append(f"   ✅ **SKILLS FILTER IMPACT**: Good availability - {skills_effectiveness:.1%} of candidates have required skills")
+        
+        shortlist.append("")
+        shortlist.append("🔒 **GUARANTEE**: No duplicate candidates + Multi-criteria optimization!")
+        
+        if required_skills:
+            shortlist.append("🎯 **RANKING**: Candidates sorted by combined score (30% match + 20% experience + 50% tech skills)")
+            shortlist.append("🛠️ **SKILLS FILTERING**: Only shows candidates who actually have the required skills")
+        else:
+            shortlist.append("🎯 **RANKING**: Candidates sorted by combined score (50% match + 50% experience)")
+        
+        if required_skills:
+            shortlist.append("🛠️ **SKILLS ANALYSIS**: Detailed skills matching with exact/partial/bonus skill identification")
+        
+        return ShortlistResult(final_candidates, "\n".join(shortlist),
+                               experience_filtered=experience_filtered,
+                               required_skills=required_skills, stats=stats)
 
 # Create the tool instance
 candidate_shortlist_tool = CandidateShortlistTool()
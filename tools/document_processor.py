@@ -129,25 +129,27 @@ class DocumentProcessor:
             return
         
         processed_count = 0
-        for file_path in directory.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in self.supported_extensions:
-                try:
-                    file_name = file_path.stem
-                    
-                    if document_type == "job_descriptions" or (document_type == "auto" and "job" in file_name.lower()):
-                        self.add_job_description_from_file(str(file_path), file_name)
-                    elif document_type == "resumes" or (document_type == "auto" and "resume" in file_name.lower()):
-                        self.add_resume_from_file(str(file_path), file_name)
-                    elif document_type == "hr_policies" or (document_type == "auto" and "policy" in file_name.lower()):
-                        self.add_hr_policy_from_file(str(file_path), file_name)
-                    else:
-                        # Default to HR policy for unknown types
-                        self.add_hr_policy_from_file(str(file_path), file_name)
-                    
-                    processed_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error processing {file_path}: {e}")
+        # Text indexes are rebuilt once for the whole directory
+        with self.vector_db.write_batch():
+            for file_path in directory.rglob("*"):
+                if file_path.is_file() and file_path.suffix.lower() in self.supported_extensions:
+                    try:
+                        file_name = file_path.stem
+                        
+                        if document_type == "job_descriptions" or (document_type == "auto" and "job" in file_name.lower()):
+                            self.add_job_description_from_file(str(file_path), file_name)
+                        elif document_type == "resumes" or (document_type == "auto" and "resume" in file_name.lower()):
+                            self.add_resume_from_file(str(file_path), file_name)
+                        elif document_type == "hr_policies" or (document_type == "auto" and "policy" in file_name.lower()):
+                            self.add_hr_policy_from_file(str(file_path), file_name)
+                        else:
+                            # Default to HR policy for unknown types
+                            self.add_hr_policy_from_file(str(file_path), file_name)
+                        
+                        processed_count += 1
+                        
+                    except Exception as e:
+                        logger.error(f"Error processing {file_path}: {e}")
         
         logger.info(f"Processed {processed_count} files from {directory_path}")
 
@@ -74,7 +74,9 @@ class CandidateSearchTool(BaseTool):
         """Search for matching candidates"""
         try:
             vector_db = get_vector_db()
-            results = vector_db.search_candidates(job_requirements, n_results)
+            results = vector_db.search_candidates(job_requirements, n_results, include_documents=False)
+            # Entries stored before snippets were recorded still need their text
+            vector_db.attach_documents([r for r in results if 'snippet' not in r.get('metadata', {})])
             
             if not results:
                 return "No matching candidates found in the database."
@@ -86,7 +88,7 @@ class CandidateSearchTool(BaseTool):
                 
                 formatted_results.append(
                     f"{i}. **{candidate_name}**\n"
-                    f"   Match: {result['content'][:150]}...\n"
+                    f"   Match: {metadata.get('snippet', result.get('content', ''))[:150]}...\n"
                     f"   Similarity Score: {1 - result.get('distance', 1):.2f}\n"
                 )
             
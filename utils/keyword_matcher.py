@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Multi-Pattern Keyword Matcher
+Compiles a keyword list once into a single trie-shaped regex and scans a text
+in one pass, returning every keyword hit with its position
+"""
+
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+def _at_word_boundary(text: str, index: int) -> bool:
+    """Same semantics as regex \\b at text[index]"""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex alternation shaped like a trie: shared prefixes are matched once, longest match first"""
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != '']
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{pattern})?' if '' in node else pattern
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive keyword scanner compiled once from a keyword list
+    Overlapping hits are all reported (like separate `keyword in text` checks);
+    with word_boundaries=True a hit must satisfy \\b on both ends (like r'\\bkeyword\\b')
+    """
+
+    def __init__(self, keywords: Iterable[str], word_boundaries: bool = False):
+        self.keywords = sorted({keyword.lower() for keyword in keywords if keyword})
+        self.word_boundaries = word_boundaries
+
+        # Zero-width lookahead reports the longest keyword starting at every position
+        self._regex = re.compile('(?=(' + _trie_pattern(self.keywords) + '))') if self.keywords else None
+
+        # Every keyword matching at a position is a prefix of the longest one there
+        self._prefixes: Dict[str, List[str]] = {
+            keyword: [other for other in self.keywords if keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """All (position, keyword) hits in the lowercased text, ordered by position"""
+        if not text or self._regex is None:
+            return []
+
+        text_lower = text.lower()
+        hits = []
+        for match in self._regex.finditer(text_lower):
+            start = match.start()
+            if self.word_boundaries and not _at_word_boundary(text_lower, start):
+                continue
+            for keyword in self._prefixes[match.group(1)]:
+                if self.word_boundaries and not _at_word_boundary(text_lower, start + len(keyword)):
+                    continue
+                hits.append((start, keyword))
+        return hits
+
+    def find_keywords(self, text: str) -> Set[str]:
+        """Distinct keywords present in the text"""
+        return {keyword for _, keyword in self.find_all(text)}
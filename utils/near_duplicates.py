@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection Utilities
+MinHash signatures over character shingles plus a banded LSH index,
+so near-duplicate lookups cost O(1) per document instead of pairwise comparisons
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Set
+
+import numpy as np
+
+# Mersenne prime used as the MinHash universe
+_MERSENNE_PRIME = (1 << 31) - 1
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+DEFAULT_SHINGLE_SIZE = 5
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so formatting changes do not affect signatures"""
+    return re.sub(r'\s+', ' ', (text or '').lower()).strip()
+
+
+def content_shingles(text: str, shingle_size: int = DEFAULT_SHINGLE_SIZE) -> Set[str]:
+    """Character shingles of normalized text"""
+    normalized = normalize_text(text)
+    if len(normalized) <= shingle_size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + shingle_size] for i in range(len(normalized) - shingle_size + 1)}
+
+
+class MinHasher:
+    """Deterministic MinHash signatures (stable across processes, safe to persist)"""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, shingle_size: int = DEFAULT_SHINGLE_SIZE,
+                 seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of the text's shingle set"""
+        shingles = content_shingles(text, self.shingle_size)
+        if not shingles:
+            return np.full(self.num_perm, _MERSENNE_PRIME, dtype=np.uint64)
+
+        # crc32 (not hash()) so signatures are identical in every process
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+    @staticmethod
+    def estimate_jaccard(sig1: np.ndarray, sig2: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return float(np.mean(sig1 == sig2))
+
+
+class MinHashLSH:
+    """
+    Banded LSH index over MinHash signatures
+    Documents sharing any band bucket are returned as near-duplicate candidates
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(bands)]
+
+    def _band_keys(self, signature: np.ndarray) -> Iterable[bytes]:
+        for band in range(self.bands):
+            yield signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def query(self, signature: np.ndarray) -> Set[Hashable]:
+        """Keys of indexed documents sharing at least one band with the signature"""
+        candidates: Set[Hashable] = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        return candidates
+
+    def add(self, key: Hashable, signature: np.ndarray):
+        """Index a document signature under key"""
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band][band_key].append(key)
+
+
+# Shared default hasher (permutations are fixed, so signatures are comparable everywhere)
+default_minhasher = MinHasher()
@@ -9,7 +9,6 @@ from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from difflib import SequenceMatcher
 import hashlib
-from services.enhanced_pdf_processor import enhanced_pdf_processor
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +20,19 @@ class SmartPDFResolver:
     
     def __init__(self, sample_resumes_path: str = "sample_resumes"):
         self.sample_resumes_path = Path(sample_resumes_path)
-        self._pdf_cache = {}  # Cache for PDF content to avoid re-reading
+        self._pdf_cache = {}  # In-process cache for PDF content to avoid re-reading
+        
+    def _get_pdf_content(self, pdf_path: Path) -> str:
+        """Get PDF text from the in-process cache, then the persistent extraction cache"""
+        if str(pdf_path) not in self._pdf_cache:
+            # Imported here: the cache module loads the metadata extractor (spaCy), which resolving a PDF never needs
+            from services.extraction_cache import get_extraction_cache
+            content = get_extraction_cache().extract_text(pdf_path)
+            self._pdf_cache[str(pdf_path)] = {
+                'content': content,
+                'hash': hashlib.md5(content.encode()).hexdigest()
+            }
+        return self._pdf_cache[str(pdf_path)]['content']
         
     def _calculate_name_similarity(self, name1: str, name2: str) -> float:
         """Calculate similarity between two names"""
@@ -65,19 +76,9 @@ class SmartPDFResolver:
     
     def _get_pdf_content_hash(self, pdf_path: Path) -> str:
         """Get a hash of PDF content for comparison"""
-        if str(pdf_path) in self._pdf_cache:
-            return self._pdf_cache[str(pdf_path)]['hash']
-        
         try:
-            content = enhanced_pdf_processor.extract_resume_content(str(pdf_path))
-            content_hash = hashlib.md5(content.encode()).hexdigest()
-            
-            self._pdf_cache[str(pdf_path)] = {
-                'content': content,
-                'hash': content_hash
-            }
-            
-            return content_hash
+            self._get_pdf_content(pdf_path)
+            return self._pdf_cache[str(pdf_path)]['hash']
         except Exception as e:
             logger.warning(f"Could not extract content from {pdf_path}: {e}")
             return ""
@@ -163,15 +164,7 @@ class SmartPDFResolver:
             # Get PDF content for context matching
             pdf_path = match['pdf_path']
             try:
-                if str(pdf_path) in self._pdf_cache:
-                    content = self._pdf_cache[str(pdf_path)]['content']
-                else:
-                    content = enhanced_pdf_processor.extract_resume_content(str(pdf_path))
-                    self._pdf_cache[str(pdf_path)] = {
-                        'content': content,
-                        'hash': hashlib.md5(content.encode()).hexdigest()
-                    }
-                
+                content = self._get_pdf_content(pdf_path)
                 content_lower = content.lower()
                 
                 # Boost score if email matches
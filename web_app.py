@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory, send_file
+from flask import Flask, render_template, request, jsonify, send_from_directory, send_file, Response, stream_with_context
 from flask_cors import CORS
 import os
 import json
@@ -7,7 +7,8 @@ from io import BytesIO
 from datetime import datetime
 from graph.stategraph import graph
 from services.vector_db import HRVectorDB, get_vector_db
-from tools.candidate_shortlist import candidate_shortlist_tool
+from tools.candidate_shortlist import candidate_shortlist_tool, ShortlistResult
+from services.candidate_evaluator import candidate_evaluator, plain_justification
 import logging
 
 # Configure logging
@@ -112,59 +113,27 @@ def api_shortlist_candidates():
         
         logger.info(f"Shortlisting candidates for: {requirements}")
         
-        # Use the candidate shortlist tool
-        result_text = candidate_shortlist_tool._run(
+        # Optional markdown report (skipped by default - the UI renders the structured data)
+        include_report = bool(data.get('include_report', False))
+        
+        # Use the structured shortlist result directly - no report re-parsing
+        result = candidate_shortlist_tool.shortlist(
             job_requirements=requirements,
             min_experience=min_experience,
-            n_candidates=limit
+            n_candidates=limit,
+            format_text=include_report
         )
-        
-        # Parse the result to extract structured data
-        candidates = []
-        if "No candidates found" not in result_text:
-            # Extract candidate information from the formatted text
-            lines = result_text.split('\n')
-            current_candidate = {}
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith('**') and '. ' in line and '**' in line:
-                    # New candidate
-                    if current_candidate:
-                        candidates.append(current_candidate)
-                    
-                    name = line.split('. ')[1].replace('**', '')
-                    current_candidate = {
-                        'name': name,
-                        'score': 0.0,
-                        'experience': 'Unknown',
-                        'email': f"{name.lower().replace(' ', '.')}@email.com",
-                        'phone': '(555) 123-4567',
-                        'skills': 'Skills extracted from resume'
-                    }
-                elif 'Match Score:' in line:
-                    try:
-                        score_text = line.split('Match Score: ')[1].split('/')[0]
-                        current_candidate['score'] = float(score_text)
-                    except:
-                        pass
-                elif 'Experience:' in line:
-                    try:
-                        exp_text = line.split('Experience: ')[1].split(' years')[0]
-                        current_candidate['experience'] = exp_text
-                    except:
-                        pass
-            
-            # Add the last candidate
-            if current_candidate:
-                candidates.append(current_candidate)
+        result_data = result.to_dict()
+        candidates = result_data['candidates']
         
         return jsonify({
             'success': True,
             'candidates': candidates,
             'summary': {
                 'total_found': len(candidates),
-                'message': result_text
+                'message': result.formatted_text,
+                'stats': result_data['stats'],
+                'required_skills': result_data['required_skills']
             },
             'total_found': len(candidates)
         })
@@ -173,6 +142,71 @@ def api_shortlist_candidates():
         logger.error(f"Error in shortlist endpoint: {str(e)}")
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
+def _evaluation_result_to_dict(result):
+    """JSON-serializable view of one streamed evaluation result"""
+    score = result['score']
+    return {
+        'type': 'result',
+        'candidate': ShortlistResult.candidate_to_dict(result['candidate']),
+        'score': {
+            'overall_score': score.overall_score,
+            'semantic_similarity': score.semantic_similarity,
+            'skills_alignment': score.skills_alignment,
+            'experience_mapping': score.experience_mapping,
+            'certification_score': score.certification_score,
+            'role_fit_score': score.role_fit_score,
+            'is_selected': score.is_selected
+        },
+        'justification': plain_justification(result['justification'])
+    }
+
+@app.route('/api/evaluate-candidates', methods=['POST'])
+def api_evaluate_candidates():
+    """
+    API endpoint for candidate evaluation, streamed as newline-delimited JSON:
+    one 'result' line per candidate as soon as it is scored, then a 'summary' line
+    """
+    try:
+        data = request.get_json()
+        job_description = data.get('job_description', '')
+        requirements = data.get('requirements', '') or job_description
+        min_experience = data.get('min_experience', 0)
+        limit = data.get('limit', 10)
+        
+        if not job_description:
+            return jsonify({'error': 'Job description is required'}), 400
+        
+        logger.info(f"Evaluating candidates for: {requirements[:100]}")
+        
+        shortlist = candidate_shortlist_tool.shortlist(
+            job_requirements=requirements,
+            min_experience=min_experience,
+            n_candidates=limit,
+            format_text=False
+        )
+        candidates = shortlist.candidates
+        # Shortlist search skips resume texts; the evaluation reads them (one batched fetch)
+        vector_db.attach_documents(candidates)
+        criteria = candidate_evaluator.extract_evaluation_criteria(job_description)
+    except Exception as e:
+        logger.error(f"Error in evaluation endpoint: {str(e)}")
+        return jsonify({'error': f'Internal server error: {str(e)}'}), 500
+    
+    def generate():
+        results = []
+        try:
+            for result in candidate_evaluator.iter_evaluate(candidates, job_description, chunk_size=5,
+                                                            criteria=criteria):
+                results.append(result)
+                yield json.dumps(_evaluation_result_to_dict(result)) + "\n"
+            summary = candidate_evaluator.summarize_evaluations(results, criteria)['summary']
+            yield json.dumps({'type': 'summary', 'summary': summary}) + "\n"
+        except Exception as e:
+            logger.error(f"Error streaming evaluation: {str(e)}")
+            yield json.dumps({'type': 'error', 'error': str(e)}) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/api/generate-job-description', methods=['POST'])
 def api_generate_job_description():
     """API endpoint for job description generation"""
@@ -311,8 +345,8 @@ def api_download_resume():
         
         logger.info(f"Downloading resume for: {candidate_name}")
         
-        # Search for candidate in vector database
-        results = vector_db.search_candidates(candidate_name, n_results=5)
+        # Search for candidate in vector database (only metadata is needed to locate the PDF)
+        results = vector_db.search_candidates(candidate_name, n_results=5, include_documents=False)
         
         if not results:
             return jsonify({'error': 'Resume not found'}), 404
@@ -382,7 +416,7 @@ def api_download_all_resumes():
             for candidate_name in candidate_names:
                 try:
                     # Search for candidate in vector database
-                    results = vector_db.search_candidates(candidate_name, n_results=5)
+                    results = vector_db.search_candidates(candidate_name, n_results=5, include_documents=False)
                     
                     if results:
                         # Find the best match
@@ -453,7 +487,9 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'service': 'Agentic HR Assistant API',
-        'version': '1.0.0'
+        'version': '1.0.0',
+        # Collections still built with other HNSW settings (run manage_vectordb.py migrate-index)
+        'pending_migrations': vector_db.pending_migrations()
     })
 
 if __name__ == '__main__':